@@ -0,0 +1,27 @@
+"""Wishlist version counter for ETag / conditional GET
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+Bumped in the same transaction as every item/reservation/contribution change, so
+GET /wishlists/public/{token} and GET /wishlists/{id} can answer If-None-Match with
+a single-row lookup instead of loading items, sums and reservations.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("wishlists", sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("wishlists", "version")
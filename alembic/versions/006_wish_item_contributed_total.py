@@ -0,0 +1,38 @@
+"""Denormalized running contribution total on wish_items
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+contributed_total is updated in the same transaction as each contribution insert (the item row
+is already locked FOR UPDATE), so the cap check, progress percent and public view read one
+column instead of SUM(amount) over every contribution. Backfilled from existing contributions.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "wish_items",
+        sa.Column("contributed_total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE wish_items AS wi
+        SET contributed_total = s.total
+        FROM (SELECT item_id, SUM(amount) AS total FROM contributions GROUP BY item_id) AS s
+        WHERE s.item_id = wi.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("wish_items", "contributed_total")
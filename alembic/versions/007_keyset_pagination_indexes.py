@@ -0,0 +1,36 @@
+"""Composite indexes for keyset pagination on (created_at, id)
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+GET /wishlists/ pages an owner's lists and GET /wishlists/{id} pages a wishlist's items by
+(created_at, id). With the parent column leading, each page is one index range scan whatever
+its depth. The single-column owner_id / wishlist_id indexes are prefixes of these and are dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_wishlists_owner_created_id", "wishlists", ["owner_id", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_wish_items_wishlist_created_id", "wish_items", ["wishlist_id", "created_at", "id"], unique=False
+    )
+    op.drop_index("ix_wishlists_owner_id", table_name="wishlists")
+    op.drop_index("ix_wish_items_wishlist_id", table_name="wish_items")
+
+
+def downgrade() -> None:
+    op.create_index("ix_wish_items_wishlist_id", "wish_items", ["wishlist_id"], unique=False)
+    op.create_index("ix_wishlists_owner_id", "wishlists", ["owner_id"], unique=False)
+    op.drop_index("ix_wish_items_wishlist_created_id", table_name="wish_items")
+    op.drop_index("ix_wishlists_owner_created_id", table_name="wishlists")
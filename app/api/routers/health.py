@@ -1,9 +1,10 @@
 """Healthcheck and readiness endpoints."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
 from app.core.config import get_settings
 from app.dependencies import get_db
 
@@ -22,7 +23,22 @@ async def health() -> dict[str, str]:
 
 
 @router.get("/health/ready")
-async def ready(session: AsyncSession = Depends(get_db)) -> dict[str, str]:
-    """Readiness: app and DB are reachable."""
+async def ready(request: Request, session: AsyncSession = Depends(get_db)) -> dict[str, str]:
+    """
+    Readiness: app and DB are reachable. websocket_pubsub reports the cross-worker subscriber
+    (connected / reconnecting / disabled); it does not fail readiness, since a Redis outage would
+    otherwise take every worker out of rotation while HTTP and same-worker updates still work.
+    """
     await session.execute(text("SELECT 1"))
-    return {"status": "ok", "database": "connected"}
+    subscriber = getattr(request.app.state, "ws_subscriber", None)
+    return {
+        "status": "ok",
+        "database": "connected",
+        "websocket_pubsub": subscriber.health() if subscriber is not None else "disabled",
+    }
+
+
+@router.get("/health/metrics")
+async def metrics_snapshot() -> dict:
+    """In-process metrics for this worker (caches, pools, limiters)."""
+    return metrics.snapshot()
@@ -2,6 +2,7 @@
 
 from uuid import UUID
 
+import httpx
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +12,7 @@ from app.dependencies import (
     get_contribution_service,
     get_current_user,
     get_db,
+    get_http_client,
     get_reservation_service,
     get_wish_item_service,
 )
@@ -26,15 +28,16 @@ from app.schemas.wish_item import (
     WishItemUpdate,
 )
 from app.services.contribution import ContributionService
-from app.services.product_parser import fetch_product_preview
+from app.services.product_parser import get_product_preview
 from app.services.reservation import ReservationService
 from app.services.wish_item import WishItemService
-from app.lib.idempotency import get_contribution_cached, set_contribution_cached
+from app.lib.idempotency import IdempotencyInProgress, contribution_idempotency, contribution_key
 from app.websocket.events import (
     run_emit_contribution_added,
     run_emit_item_updated,
     run_emit_reservation_cancelled,
     run_emit_reservation_created,
+    run_invalidate_wishlist,
 )
 
 router = APIRouter(prefix="/items", tags=["items"])
@@ -43,6 +46,8 @@ router = APIRouter(prefix="/items", tags=["items"])
 @router.post("/", response_model=WishItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_item(
     payload: WishItemCreate,
+    request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
 ) -> WishItemResponse:
@@ -54,6 +59,7 @@ async def create_item(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Wishlist not found or access denied",
         )
+    background_tasks.add_task(run_invalidate_wishlist, request.app, item.wishlist_id)
     return WishItemResponse.model_validate(item)
 
 
@@ -86,17 +92,20 @@ async def update_item(
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_item(
     item_id: UUID,
+    request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
 ) -> None:
     """Soft-delete a wish item (must own the wishlist)."""
     service = get_wish_item_service(session)
-    deleted = await service.soft_delete(item_id, current_user.id)
+    deleted, wishlist_id = await service.soft_delete(item_id, current_user.id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found or access denied",
         )
+    background_tasks.add_task(run_invalidate_wishlist, request.app, wishlist_id)
 
 
 @router.post(
@@ -105,14 +114,17 @@ async def delete_item(
     summary="Preview product metadata from URL",
     response_description="Extracted title, image, price plus preview_quality and missing_fields.",
 )
-async def product_preview(payload: ProductPreviewRequest) -> ProductPreview:
+async def product_preview(
+    payload: ProductPreviewRequest,
+    http_client: httpx.AsyncClient | None = Depends(get_http_client),
+) -> ProductPreview:
     """
     Fetch product URL and return structured preview (title, image, price).
     **preview_quality**: `full` (all three), `partial` (1–2), `minimal` (none or error).
     **missing_fields**: list of fields we could not extract (`title`, `image_url`, `price`).
     Timeout and errors return minimal preview with all missing_fields.
     """
-    return await fetch_product_preview(payload.product_url)
+    return await get_product_preview(payload.product_url, http_client)
 
 
 # ---- Reserve / Contribute (anonymous, session_id cookie). Owner never sees identities. ----
@@ -178,6 +190,7 @@ async def cancel_reservation(
     responses={
         201: {"description": "Contribution recorded (or idempotent replay with same Idempotency-Key)"},
         400: {"model": ErrorResponse, "description": "Invalid amount, item fully funded, or would exceed target"},
+        409: {"model": ErrorResponse, "description": "Same Idempotency-Key still being processed on another worker"},
     },
 )
 async def contribute_to_item(
@@ -191,13 +204,40 @@ async def contribute_to_item(
     """
     Contribute to an item (anonymous, session_id cookie).
     Send **Idempotency-Key** header (same key + session + item) to get previous result without double-charging.
+    Concurrent duplicates wait for the first request and get its result.
     """
     session_id = get_anonymous_session_id(request, response)
     idempotency_key = request.headers.get("Idempotency-Key", "").strip()
-    if idempotency_key:
-        cached = get_contribution_cached(idempotency_key, session_id, str(item_id))
-        if cached is not None:
-            return JSONResponse(status_code=201, content=cached)
+    if not idempotency_key:
+        return await _contribute(item_id, payload, request, background_tasks, session, session_id)
+    try:
+        claim = await contribution_idempotency.claim(
+            contribution_key(idempotency_key, session_id, str(item_id)),
+            getattr(request.app.state, "redis_pub", None),
+        )
+    except IdempotencyInProgress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress",
+        )
+    async with claim:
+        if claim.cached is not None:
+            return JSONResponse(status_code=201, content=claim.cached)
+        resp = await _contribute(item_id, payload, request, background_tasks, session, session_id)
+        # Commit before publishing the response: a replay must never describe a rolled-back charge.
+        await session.commit()
+        await claim.complete(resp.model_dump(mode="json"))
+    return resp
+
+
+async def _contribute(
+    item_id: UUID,
+    payload: ContributeRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession,
+    session_id: str,
+) -> ContributeResponse:
     contribution_service = get_contribution_service(session)
     contribution, contributed_total, target_price, progress_percent, wishlist_id, reject_reason = await contribution_service.contribute(
         item_id, session_id, payload.amount
@@ -221,13 +261,10 @@ async def contribute_to_item(
                 "progress_percent": progress_percent,
             },
         )
-    resp = ContributeResponse(
+    return ContributeResponse(
         item_id=item_id,
         contributed_total=contributed_total,
         target_price=target_price,
         progress_percent=progress_percent,
         amount_added=payload.amount,
     )
-    if idempotency_key:
-        set_contribution_cached(idempotency_key, session_id, str(item_id), resp.model_dump(mode="json"))
-    return resp
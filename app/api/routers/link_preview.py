@@ -1,13 +1,21 @@
-"""Link preview endpoint: Telegram-style preview via our parser (og:image, meta name=description, etc.)."""
+"""Link preview endpoints: Telegram-style preview via our parser (og:image, meta name=description, etc.)."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from urllib.parse import urlparse
 
-from fastapi import APIRouter, HTTPException, Query, status
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.schemas.wish_item import ProductPreview
-from app.services.product_parser import fetch_product_preview
+from app.core.config import get_settings
+from app.core.serialization import dumps
+from app.dependencies import get_http_client
+from app.schemas.wish_item import LinkPreviewBatchItem, LinkPreviewBatchRequest, ProductPreview
+from app.services.product_parser import get_product_preview
 
 router = APIRouter(tags=["link-preview"])
+_settings = get_settings()
 
 
 @router.get(
@@ -15,7 +23,10 @@ router = APIRouter(tags=["link-preview"])
     response_model=ProductPreview,
     summary="Get link preview (Telegram-style)",
 )
-async def link_preview(url: str = Query(..., description="URL to preview")):
+async def link_preview(
+    url: str = Query(..., description="URL to preview"),
+    http_client: httpx.AsyncClient | None = Depends(get_http_client),
+):
     """
     Fetch URL and return preview: all og:image (//→https, prefer full URL), meta name=description (incl. data-hid).
     UX: frontend calls when user pastes link; on change — call again; on remove — clear card.
@@ -29,4 +40,52 @@ async def link_preview(url: str = Query(..., description="URL to preview")):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid URL")
     except Exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid URL")
-    return await fetch_product_preview(url)
+    return await get_product_preview(url, http_client)
+
+
+async def _stream_batch(urls: list[str], http_client: httpx.AsyncClient | None) -> AsyncIterator[bytes]:
+    """
+    Fetch all urls concurrently (at most link_preview_batch_concurrency at a time) and yield one
+    NDJSON line per preview as soon as it is ready. Per-host limits are the process-wide ones
+    fetch_product_preview already applies. Invalid URLs yield a minimal preview like the single
+    endpoint's fetch failures (the batch is not rejected).
+    """
+    slots = asyncio.Semaphore(_settings.link_preview_batch_concurrency)
+
+    async def preview_one(index: int, url: str) -> LinkPreviewBatchItem:
+        async with slots:
+            preview = await get_product_preview(url, http_client)
+        return LinkPreviewBatchItem(index=index, url=url, preview=preview)
+
+    tasks = [asyncio.create_task(preview_one(i, url.strip())) for i, url in enumerate(urls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            item = await next_done
+            yield dumps(item.model_dump(mode="json")) + b"\n"
+    finally:
+        # Client went away (or we finished): drop what is still queued; shared fetches finish for the cache.
+        for task in tasks:
+            task.cancel()
+
+
+@router.post(
+    "/link-preview/batch",
+    response_class=StreamingResponse,
+    summary="Preview many links at once (NDJSON stream)",
+    response_description="application/x-ndjson: one LinkPreviewBatchItem per line, in completion order.",
+    responses={200: {"content": {"application/x-ndjson": {"schema": LinkPreviewBatchItem.model_json_schema()}}}},
+)
+async def link_preview_batch(
+    payload: LinkPreviewBatchRequest,
+    http_client: httpx.AsyncClient | None = Depends(get_http_client),
+) -> StreamingResponse:
+    """
+    Bulk add: fetch up to 50 URLs concurrently (bounded per batch and per host) and stream each preview
+    as it completes, so the first cards render before the slowest host answers.
+    Each line is `{"index": i, "url": ..., "preview": ProductPreview}`; index is the position in `urls`.
+    """
+    return StreamingResponse(
+        _stream_batch(payload.urls, http_client),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
@@ -2,10 +2,11 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user, get_db, get_wishlist_service
+from app.lib.pagination import DEFAULT_PAGE_SIZE, ITEMS_PAGE_SIZE, MAX_PAGE_SIZE
 from app.models.user import User
 from app.schemas.errors import ErrorResponse
 from app.schemas.wishlist import (
@@ -18,14 +19,29 @@ from app.schemas.wishlist import (
 router = APIRouter(prefix="/wishlists", tags=["wishlists"])
 
 
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 @router.get("/", response_model=list[WishlistResponse])
 async def list_wishlists(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
 ):
-    """List current user's wishlists."""
+    """
+    List current user's wishlists, newest first, one page at a time (keyset on created_at, id).
+    When more remain, the **X-Next-Cursor** response header holds the `cursor` for the next page.
+    """
     service = get_wishlist_service(session)
-    lists = await service.list_by_owner(current_user.id)
+    try:
+        lists, next_cursor = await service.list_by_owner(current_user.id, limit, cursor)
+    except ValueError:
+        raise _invalid_cursor()
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [WishlistResponse.model_validate(w) for w in lists]
 
 
@@ -41,32 +57,73 @@ async def create_wishlist(
     return WishlistResponse.model_validate(w)
 
 
+def _not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def _json_body(body: bytes, etag: str, cache_control: str) -> Response:
+    """Pre-encoded JSON; bypasses response_model re-validation (the model still documents the schema)."""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
 @router.get(
     "/public/{token}",
     response_model=WishlistPublicResponse,
-    responses={404: {"model": ErrorResponse, "description": "Wishlist not found or not public"}},
+    responses={
+        304: {"description": "Not modified (If-None-Match matches current ETag)"},
+        404: {"model": ErrorResponse, "description": "Wishlist not found or not public"},
+    },
 )
 async def get_public_wishlist(
     token: UUID,
+    request: Request,
     session: AsyncSession = Depends(get_db),
 ):
-    """Get wishlist by share token (no auth). Items include reserved and contribution progress. Rate-limited per IP."""
+    """
+    Get wishlist by share token (no auth). Items include reserved and contribution progress. Rate-limited per IP.
+    Returns a strong **ETag**; send it back as **If-None-Match** to get 304 without re-reading items.
+    """
     service = get_wishlist_service(session)
-    dto = await service.get_public_dto(token)
-    if not dto:
+    view = await service.get_public_view(token, request.headers.get("if-none-match"))
+    if not view:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
-    return dto
+    etag, body = view
+    if body is None:
+        return _not_modified(etag, "no-cache")
+    return _json_body(body, etag, "no-cache")
 
 
-@router.get("/{wishlist_id}", response_model=WishlistWithItemsResponse)
+@router.get(
+    "/{wishlist_id}",
+    response_model=WishlistWithItemsResponse,
+    responses={304: {"description": "Not modified (If-None-Match matches current ETag)"}},
+)
 async def get_wishlist(
     wishlist_id: UUID,
+    request: Request,
+    items_limit: int = Query(ITEMS_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Items per page"),
+    items_cursor: str | None = Query(None, description="items_next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
 ):
-    """Get one wishlist with items (owner only)."""
+    """
+    Get one wishlist with a page of its items, oldest first (owner only). Follow `items_next_cursor`
+    for the rest. Supports ETag / If-None-Match like the public view.
+    """
     service = get_wishlist_service(session)
-    dto = await service.get_with_items_for_owner(wishlist_id, current_user.id)
-    if not dto:
+    try:
+        view = await service.get_owner_view(
+            wishlist_id, current_user.id, request.headers.get("if-none-match"), items_limit, items_cursor
+        )
+    except ValueError:
+        raise _invalid_cursor()
+    if not view:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
-    return dto
\ No newline at end of file
+    etag, body = view
+    if body is None:
+        return _not_modified(etag, "private, no-cache")
+    return _json_body(body, etag, "private, no-cache")
\ No newline at end of file
@@ -1,27 +1,86 @@
-"""WebSocket: subscribe to wishlist room by wishlist_id."""
+"""WebSocket: subscribe to wishlist room by wishlist_id, starting from a snapshot or a resume point."""
 
+import logging
 from uuid import UUID
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
-from app.websocket.manager import ConnectionManager
+from app.core.database import async_session_factory
+from app.dependencies import get_wishlist_service
+from app.websocket.history import missed_frames, room_history, with_seq
+from app.websocket.manager import EVENT_RESYNC, EVENT_SNAPSHOT, ConnectionManager
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["websocket"])
 
+# Close code when the share token does not open this wishlist (RFC 6455 1008: policy violation)
+WS_CLOSE_FORBIDDEN = 1008
+
+
+def _state_frame(event: str, wishlist_id: UUID, seq: int, payload_json: str = "null") -> str:
+    return with_seq(seq, f'{{"event":"{event}","wishlist_id":"{wishlist_id}","payload":{payload_json}}}')
+
+
+async def _initial_frames(
+    websocket: WebSocket, wishlist_id: UUID, token: UUID | None, last_seq: int | None
+) -> list[str] | None:
+    """Missed frames if last_seq can be resumed from the buffer, else a snapshot (None: bad token)."""
+    redis_client = getattr(websocket.app.state, "redis_pub", None)
+    subscriber = getattr(websocket.app.state, "ws_subscriber", None)
+    if redis_client is not None and subscriber is not None:
+        # Frames reach this worker only once its SUBSCRIBE for the room is confirmed: read the seq
+        # after that, so every frame numbered above it is delivered to this socket.
+        await subscriber.wait_subscribed(wishlist_id)
+    try:
+        current, frames = await room_history.read(redis_client, wishlist_id)
+    except Exception as e:
+        logger.warning("WS history read failed: %s", e)
+        current, frames = 0, []
+    if last_seq is not None:
+        missed = missed_frames(current, frames, last_seq)
+        if missed is not None:
+            room_history.resumed += 1
+            return missed
+    # current is read before the view, so the snapshot reflects every frame up to it. Queued frames
+    # with seq <= current are skipped by the client; later ones carry absolute values or trigger a
+    # refetch, so applying one the view already reflects is harmless.
+    if token is None:
+        return [_state_frame(EVENT_RESYNC, wishlist_id, current)]
+    async with async_session_factory() as session:
+        body = await get_wishlist_service(session).get_public_snapshot(wishlist_id, token)
+    if body is None:
+        return None
+    room_history.snapshots += 1
+    return [_state_frame(EVENT_SNAPSHOT, wishlist_id, current, body.decode())]
+
 
 @router.websocket("/ws/{wishlist_id}")
 async def websocket_wishlist(
     websocket: WebSocket,
     wishlist_id: UUID,
+    token: UUID | None = Query(None, description="Share token: first frame is a snapshot of the public view"),
+    last_seq: int | None = Query(None, ge=0, description="Last seq applied: resume with just the missed frames"),
 ) -> None:
     """
     Connect to real-time updates for a wishlist.
     Clients subscribe to the room for this wishlist_id on connect.
-    Broadcasts: reservation_created, reservation_cancelled, contribution_added, item_updated.
+    Every frame carries a per-room "seq". The first frames are the ones missed since last_seq when
+    the server still buffers them; otherwise a "snapshot" (public view, needs token) or a "resync"
+    (no token: refetch). Later frames with seq <= the client's last applied seq are duplicates;
+    a gap (seq > last + 1) means frames were missed: reconnect with last_seq.
+    Broadcasts: reservation_created, reservation_cancelled, contribution_added, item_updated, batch.
     """
     manager: ConnectionManager = websocket.app.state.ws_manager
-    await manager.connect(websocket, wishlist_id)
+    # Join (queueing live frames, and subscribing the worker to the room's channel) before reading
+    # the room's seq, so nothing falls between the two (see _initial_frames).
+    connection = await manager.connect(websocket, wishlist_id, start=False)
     try:
+        initial = await _initial_frames(websocket, wishlist_id, token, last_seq)
+        if initial is None:
+            await websocket.close(code=WS_CLOSE_FORBIDDEN)
+            return
+        connection.start(initial)
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
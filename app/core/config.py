@@ -66,6 +66,51 @@ class Settings(BaseSettings):
     # Product URL fetch (auto-fill)
     product_fetch_timeout_seconds: float = Field(default=10.0, ge=1.0, le=60.0, description="Timeout for product page fetch")
     product_fetch_max_bytes: int = Field(default=512 * 1024, description="Max HTML bytes to read for parsing (512KB)")
+    product_fetch_max_connections: int = Field(
+        default=100, ge=1, description="Pooled outbound connections per worker for product/link previews"
+    )
+    product_fetch_max_connections_per_host: int = Field(
+        default=6, ge=1, description="Concurrent preview fetches per host (marketplaces throttle bursts)"
+    )
+    product_fetch_keepalive_seconds: float = Field(
+        default=30.0, ge=0, description="How long idle preview connections stay open for reuse"
+    )
+    link_preview_batch_concurrency: int = Field(
+        default=8, ge=1, description="Concurrent fetches per batch link-preview request (per-host cap still applies)"
+    )
+    product_parse_executor: Literal["process", "thread"] = Field(
+        default="process", description="Where fetched pages are parsed: process pool (parallel) or thread pool"
+    )
+    product_parse_workers: int = Field(
+        default=2, ge=0, description="Parse pool size per worker process. 0 parses on the event loop."
+    )
+    product_parse_inline_max_chars: int = Field(
+        default=16 * 1024, ge=0, description="Pages shorter than this are parsed inline (cheaper than a pool hop)"
+    )
+
+    # Preview cache (per worker, keyed on the normalized URL)
+    preview_cache_max_entries: int = Field(
+        default=2048, ge=0, description="Max cached product/link previews per worker. 0 disables the cache."
+    )
+    preview_cache_ttl_seconds: float = Field(
+        default=600.0, ge=0, description="How long a successful preview is reused. 0 = no TTL (size bound only)."
+    )
+    preview_cache_negative_ttl_seconds: float = Field(
+        default=30.0, ge=0, description="How long a failed (minimal) preview is reused. 0 = failures are not cached."
+    )
+
+    # Idempotency-Key store for POST /items/{id}/contribute (per worker, plus Redis when redis_url is set)
+    idempotency_cache_max_entries: int = Field(
+        default=10_000, ge=0, description="Max remembered contribution responses per worker"
+    )
+    idempotency_ttl_seconds: float = Field(
+        default=86_400, gt=0, description="How long a contribution response is replayed for the same key"
+    )
+    idempotency_wait_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        description="How long a duplicate waits for the first request on another worker before 409",
+    )
 
     # Anonymous session (reserve/contribute without auth)
     session_id_cookie_name: str = Field(default="session_id", description="Cookie name for anonymous viewer session")
@@ -75,18 +120,90 @@ class Settings(BaseSettings):
     # Redis (for WebSocket pub/sub across workers; if empty, single-worker mode)
     redis_url: str = Field(default="redis://localhost:6379/0", description="Redis URL for WS broadcast across workers")
 
+    # WebSocket fan-out (per connection outbound queue)
+    ws_send_queue_size: int = Field(default=64, ge=1, description="Frames queued per WebSocket before the slow-consumer policy applies")
+    ws_slow_consumer_policy: Literal["disconnect", "drop_oldest"] = Field(
+        default="disconnect",
+        description="Full queue: disconnect (client reconnects and resyncs) or drop the oldest queued frame",
+    )
+    ws_coalesce_window_ms: int = Field(
+        default=0,
+        ge=0,
+        le=1000,
+        description="Per-room window merging bursts of events into one frame (0 = send each event immediately)",
+    )
+    ws_history_size: int = Field(default=100, ge=1, description="Recent frames kept per room for resume after reconnect")
+    ws_history_max_rooms: int = Field(
+        default=10_000, ge=1, description="Rooms with in-process history when Redis is not configured (LRU)"
+    )
+    ws_history_ttl_seconds: int = Field(
+        default=86_400, ge=60, description="Idle time after which a room's Redis seq counter and history expire"
+    )
+
     # CORS (comma-separated origins, or * for allow all)
     cors_origins: str = Field(
         default="http://localhost:3000",
         description="Comma-separated CORS origins (e.g. http://localhost:3000,https://app.example.com)",
     )
 
-    # Public endpoint rate limit (per-IP, per minute; 0 = disabled)
+    # Per-IP rate limits, per route policy (per minute; 0 = disabled)
     rate_limit_public_per_minute: int = Field(
         default=60,
         ge=0,
         description="Max requests per IP per minute for GET /wishlists/public/{token}. 0 disables.",
     )
+    rate_limit_link_preview_per_minute: int = Field(
+        default=60,
+        ge=0,
+        description=(
+            "Max previews per IP per minute for /link-preview and /items/preview; a batch counts each of its"
+            " URLs (so below 50 a full batch is always rejected). 0 disables."
+        ),
+    )
+    rate_limit_max_keys: int = Field(
+        default=100_000, ge=1, description="Max client IPs tracked per rate-limit policy (least recent evicted)"
+    )
+    rate_limit_backend: Literal["local", "redis"] = Field(
+        default="redis",
+        description="redis: one shared counter across workers (needs redis_url); falls back to local on Redis errors",
+    )
+    rate_limit_redis_timeout_seconds: float = Field(
+        default=0.05, gt=0, description="Max wait for the Redis rate-limit check before using the local limiter"
+    )
+
+    # Public wishlist view cache (encoded JSON) (per share token, invalidated on every wishlist mutation)
+    public_wishlist_cache_max_entries: int = Field(
+        default=1024, ge=0, description="Max cached public wishlists per worker. 0 disables the cache."
+    )
+    public_wishlist_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Upper bound on cache staleness when cross-worker invalidation (Redis) is unavailable. 0 = no TTL.",
+    )
+
+    # Password hashing pool (bcrypt off the event loop)
+    password_hash_workers: int = Field(
+        default=2, ge=1, description="Threads hashing/verifying passwords per worker process."
+    )
+    password_hash_max_pending: int = Field(
+        default=32,
+        ge=1,
+        description="Max queued + running hash calls per worker; beyond this, register/login get 503 at once.",
+    )
+
+    # Principal cache for get_current_user (per worker, plus a Redis tier when redis_url is set)
+    principal_cache_max_entries: int = Field(
+        default=10_000, ge=0, description="Max cached principals per worker. 0 disables the cache."
+    )
+    principal_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Principal TTL in both tiers; bounds how long a disabled user may stay authenticated "
+        "on a worker that missed the invalidation. 0 disables the cache.",
+    )
+    principal_cache_redis_timeout_seconds: float = Field(
+        default=0.05, gt=0, description="Max wait for the principal cache's Redis tier before querying the DB"
+    )
 
 
 @lru_cache
@@ -0,0 +1,82 @@
+"""In-process metrics registry: components register a stats callable, /api/health/metrics snapshots them."""
+
+import bisect
+import logging
+from collections.abc import Callable, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_sources: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register(name: str, stats: Callable[[], dict[str, Any]]) -> None:
+    """Register (or replace) a named stats source. Callable must be cheap and never block."""
+    _sources[name] = stats
+
+
+def snapshot() -> dict[str, Any]:
+    """Collect all registered stats; a failing source is reported as an error, not raised."""
+    out: dict[str, Any] = {}
+    for name, stats in _sources.items():
+        try:
+            out[name] = stats()
+        except Exception as e:
+            logger.warning("metrics_source_failed", extra={"source": name, "error": str(e)})
+            out[name] = {"error": str(e)}
+    return out
+
+
+# Latency buckets in seconds (upper bounds), from sub-millisecond to seconds.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus-style upper bounds). observe() is O(log buckets) with no
+    allocation; call it from the event loop thread only. Quantiles are bucket upper bounds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)  # last slot: above the largest bound
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (max if above all buckets)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank and n:
+                return self._bounds[i] if i < len(self._bounds) else self.max
+        return self.max
+
+    def stats(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, n in zip(self._bounds, self._counts):
+            cumulative += n
+            buckets[f"le_{bound:g}"] = cumulative
+        buckets["le_inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
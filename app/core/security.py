@@ -1,13 +1,18 @@
 """Security: bcrypt password hashing and JWT (access + refresh) with secure defaults."""
 
+import asyncio
 import hashlib
 import secrets
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core import metrics
 from app.core.config import get_settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
@@ -28,6 +33,96 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """The password hash pool is at its pending limit; shed the request (503) instead of queueing."""
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt off the event loop on a small dedicated thread pool (bcrypt releases the GIL),
+    so a login never stalls WebSockets or public reads on the worker. At most max_pending calls
+    may be queued or running; beyond that, callers get PasswordHasherBusy immediately. A call
+    whose caller is cancelled (client gone) still counts until its job leaves the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self._workers = workers
+        self._max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self.pending = 0
+        self.rejected = 0
+        self.queue_wait = metrics.Histogram()
+        self.hash_time = metrics.Histogram()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self._max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="pwhash")
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        def job() -> tuple[T, float, float]:
+            started = time.perf_counter()
+            return fn(*args), started, time.perf_counter()
+
+        future = self._executor.submit(job)
+        self.pending += 1
+        # Released when the job finishes (or is cancelled before it starts), not when the caller stops waiting.
+        future.add_done_callback(lambda _: self._release(loop))
+        result, started, finished = await asyncio.wrap_future(future)
+        # Observed on the loop thread (Histogram is not thread-safe)
+        self.queue_wait.observe(started - submitted)
+        self.hash_time.observe(finished - started)
+        return result
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Done-callback (any thread): decrement pending on the loop thread."""
+        try:
+            loop.call_soon_threadsafe(self._decrement)
+        except RuntimeError:  # loop already closed (shutdown)
+            pass
+
+    def _decrement(self) -> None:
+        self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self._workers,
+            "max_pending": self._max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait.stats(),
+            "hash_time_seconds": self.hash_time.stats(),
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    workers=_settings.password_hash_workers,
+    max_pending=_settings.password_hash_max_pending,
+)
+metrics.register("password_hash_pool", password_hash_pool.stats)
+
+
+async def hash_password_async(plain_password: str) -> str:
+    """hash_password on the bounded hash pool. Raises PasswordHasherBusy when it is full."""
+    return await password_hash_pool.run(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded hash pool. Raises PasswordHasherBusy when it is full."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(subject: str | Any) -> str:
     """Create JWT access token (short-lived). Subject must be user id string."""
     expire = datetime.now(UTC) + timedelta(minutes=_settings.access_token_expire_minutes)
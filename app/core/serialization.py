@@ -0,0 +1,38 @@
+"""
+Fast JSON encoding for hot read paths: trusted dicts straight to bytes.
+Uses orjson when installed, stdlib json otherwise (same JSON, slower). Output matches what
+the Pydantic response models would produce, so OpenAPI schemas stay accurate.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson/json do not encode natively in our payloads (orjson handles UUID/date itself)."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, datetime):
+        # Match Pydantic: UTC rendered as "Z"
+        s = obj.isoformat()
+        return s[:-6] + "Z" if s.endswith("+00:00") else s
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
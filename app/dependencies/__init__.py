@@ -12,6 +12,7 @@ from app.dependencies.database import (
     get_reservation_service,
     get_contribution_service,
 )
+from app.dependencies.http import get_http_client
 from app.dependencies.session import get_anonymous_session_id
 
 __all__ = [
@@ -26,4 +27,5 @@ __all__ = [
     "get_wishlist_service",
     "get_current_user",
     "get_anonymous_session_id",
+    "get_http_client",
 ]
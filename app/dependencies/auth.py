@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
 from app.core.security import decode_access_token
 from app.dependencies.database import get_db
+from app.lib.principal_cache import principal_cache
 from app.models.user import User
 from app.repositories.user import UserRepository
 
@@ -19,8 +20,8 @@ async def get_current_user(
     session: AsyncSession = Depends(get_db),
 ) -> User:
     """
-    Resolve JWT from httpOnly cookie or Authorization Bearer, decode, load user.
-    Raises 401 if missing or invalid.
+    Resolve JWT from httpOnly cookie or Authorization Bearer, decode, load user
+    (from the principal cache when fresh, else one users query). Raises 401 if missing or invalid.
     """
     token: str | None = request.cookies.get(_settings.access_token_cookie_name)
     if not token and request.headers.get("authorization"):
@@ -46,7 +47,9 @@ async def get_current_user(
             detail="Invalid token",
         )
     repo = UserRepository(session)
-    user = await repo.get_by_id(user_id)
+    user = await principal_cache.get_or_load(
+        user_id, repo.get_principal, getattr(request.app.state, "redis_pub", None)
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,9 @@
+"""Shared outbound HTTP client (created in lifespan)."""
+
+import httpx
+from fastapi import Request
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient | None:
+    """app.state.http_client, or None outside lifespan (callers then fall back to a one-off client)."""
+    return getattr(request.app.state, "http_client", None)
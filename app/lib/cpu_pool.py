@@ -0,0 +1,114 @@
+"""
+Bounded executor for CPU-bound pure functions (HTML parsing) so they do not stall the event loop.
+
+kind="process" gives real parallelism (pure-Python parsing holds the GIL); kind="thread" only
+keeps the loop responsive between bytecode slices but avoids pickling. Small inputs are cheaper
+to run inline than to ship to a worker, so callers pass inline=True below their own threshold.
+Metrics split the time into work (inside fn) and wait (queue + transfer + scheduling).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Literal, TypeVar
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PoolKind = Literal["process", "thread"]
+
+
+def _timed(fn: Callable[..., T], *args: Any) -> tuple[T, float]:
+    """Runs in the worker: result plus time spent inside fn (measured there, so no cross-process clocks)."""
+    started = time.perf_counter()
+    return fn(*args), time.perf_counter() - started
+
+
+class CpuPool:
+    """
+    At most `workers` calls run at once and at most 2 * workers are submitted; further callers wait
+    on the loop (counted in wait time) instead of piling inputs into the executor queue.
+    workers=0 runs everything inline. fn and args must be picklable for kind="process".
+    """
+
+    def __init__(self, name: str, kind: PoolKind, workers: int) -> None:
+        self._name = name
+        self._kind = kind
+        self._workers = workers
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self.pending = 0
+        self.inline_runs = 0
+        self.pool_runs = 0
+        self.broken = 0
+        self.wait_time = metrics.Histogram()
+        self.work_time = metrics.Histogram()
+
+    @property
+    def enabled(self) -> bool:
+        return self._workers > 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._kind == "process":
+                # spawn: forking a process that runs an event loop and DB/Redis connections is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix=self._name)
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any, inline: bool = False) -> T:
+        if inline or not self.enabled:
+            result, elapsed = _timed(fn, *args)
+            self.inline_runs += 1
+            self.work_time.observe(elapsed)
+            return result
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(2 * self._workers)
+        submitted = time.perf_counter()
+        self.pending += 1
+        try:
+            async with self._slots:
+                try:
+                    result, elapsed = await asyncio.get_running_loop().run_in_executor(
+                        self._get_executor(), _timed, fn, *args
+                    )
+                except BrokenProcessPool:
+                    # A worker died (OOM kill etc.): start a fresh pool next time, finish this one inline.
+                    logger.warning("cpu_pool_broken", extra={"pool": self._name})
+                    self.broken += 1
+                    self.shutdown()
+                    result, elapsed = _timed(fn, *args)
+        finally:
+            self.pending -= 1
+        # Observed on the loop thread (Histogram is not thread-safe)
+        self.pool_runs += 1
+        self.work_time.observe(elapsed)
+        self.wait_time.observe(max(0.0, time.perf_counter() - submitted - elapsed))
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "kind": self._kind if self.enabled else "inline",
+            "workers": self._workers,
+            "pending": self.pending,
+            "inline_runs": self.inline_runs,
+            "pool_runs": self.pool_runs,
+            "broken": self.broken,
+            "wait_seconds": self.wait_time.stats(),
+            "work_seconds": self.work_time.stats(),
+        }
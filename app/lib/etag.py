@@ -0,0 +1,21 @@
+"""Strong ETag helpers for conditional GET (If-None-Match -> 304)."""
+
+
+def make_etag(*parts: object) -> str:
+    """Quoted strong ETag from version parts, e.g. make_etag("p", id.hex, 3) -> '"p-<hex>-3"'."""
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if If-None-Match header lists etag (or is "*"). Weak validators compare by opaque tag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
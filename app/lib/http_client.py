@@ -0,0 +1,90 @@
+"""
+Application-lifetime outbound HTTP client for product/link previews.
+
+One pooled httpx.AsyncClient per worker (created in lifespan, closed on shutdown) so repeated
+previews from the same marketplace reuse keep-alive connections instead of paying a TCP + TLS
+handshake each time. HTTP/2 is negotiated when the optional `h2` package is installed.
+httpx caps connections only globally, so HostLimiter adds a per-host cap on top.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+
+from app.core import metrics
+from app.core.config import get_settings
+
+_settings = get_settings()
+
+# Browser-like headers: several marketplaces serve bots a stripped page without og: tags.
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
+}
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def create_http_client(timeout: float) -> httpx.AsyncClient:
+    """Pooled client with keep-alive; call aclose() on shutdown."""
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=httpx.Timeout(timeout),
+        headers=DEFAULT_HEADERS,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=_settings.product_fetch_max_connections,
+            max_keepalive_connections=_settings.product_fetch_max_connections,
+            keepalive_expiry=_settings.product_fetch_keepalive_seconds,
+        ),
+    )
+
+
+class HostLimiter:
+    """
+    At most per_host concurrent requests per host (marketplaces throttle bursts from one IP).
+    Semaphores exist only while a host has requests in flight, so memory is bounded by concurrency.
+    """
+
+    def __init__(self, per_host: int) -> None:
+        self._per_host = per_host
+        # host -> (semaphore, users holding or waiting)
+        self._hosts: dict[str, tuple[asyncio.Semaphore, int]] = {}
+        self.waits = 0
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        sem, users = self._hosts.get(host) or (asyncio.Semaphore(self._per_host), 0)
+        self._hosts[host] = (sem, users + 1)
+        try:
+            if sem.locked():
+                self.waits += 1
+            async with sem:
+                yield
+        finally:
+            sem, users = self._hosts[host]
+            if users <= 1:
+                del self._hosts[host]
+            else:
+                self._hosts[host] = (sem, users - 1)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "per_host": self._per_host,
+            "active_hosts": len(self._hosts),
+            "waits": self.waits,
+            "http2": HTTP2_AVAILABLE,
+        }
+
+
+host_limiter = HostLimiter(_settings.product_fetch_max_connections_per_host)
+metrics.register("preview_http", host_limiter.stats)
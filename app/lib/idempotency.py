@@ -1,39 +1,191 @@
-"""In-memory idempotency cache for contribution endpoint. Key: (idempotency_key, session_id, item_id)."""
+"""
+Idempotency store for the contribution endpoint. Key: (idempotency_key, session_id, item_id).
 
+Completed responses live in a bounded TTLCache (O(1) get/set/evict) and, when Redis is available,
+in Redis under idem:contribute:<session>:<item>:<sha256(key)>, so a retry that lands on another
+worker is replayed instead of charged twice.
+
+Only one request per key runs the operation. Within a worker, duplicates await the first one's
+future. Across workers, the first claims the key with SET NX (a "pending:<token>" marker) and the
+others poll until the response appears (or give up with IdempotencyInProgress -> 409).
+If the operation fails, the claim is released and the next duplicate runs it itself.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
 import time
+import uuid
 from typing import Any
 
-# key -> (response_body_dict, timestamp)
-_contribution_cache: dict[tuple[str, str, str], tuple[dict[str, Any], float]] = {}
-_TTL_SECONDS = 86400  # 24 hours
-_MAX_ENTRIES = 10_000
-
-
-def _prune_if_needed() -> None:
-    if len(_contribution_cache) <= _MAX_ENTRIES:
-        return
-    now = time.time()
-    to_del = [k for k, (_, ts) in _contribution_cache.items() if now - ts > _TTL_SECONDS]
-    for k in to_del[: _MAX_ENTRIES // 2]:  # evict half of expired
-        _contribution_cache.pop(k, None)
-    if len(_contribution_cache) > _MAX_ENTRIES:
-        oldest = min(_contribution_cache.items(), key=lambda x: x[1][1])
-        _contribution_cache.pop(oldest[0], None)
-
-
-def get_contribution_cached(idempotency_key: str, session_id: str, item_id: str) -> dict[str, Any] | None:
-    key = (idempotency_key.strip()[:128], session_id, str(item_id))
-    entry = _contribution_cache.get(key)
-    if not entry:
-        return None
-    body, ts = entry
-    if time.time() - ts > _TTL_SECONDS:
-        _contribution_cache.pop(key, None)
-        return None
-    return body
-
-
-def set_contribution_cached(idempotency_key: str, session_id: str, item_id: str, body: dict[str, Any]) -> None:
-    _prune_if_needed()
-    key = (idempotency_key.strip()[:128], session_id, str(item_id))
-    _contribution_cache[key] = (body, time.time())
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.serialization import dumps
+from app.lib.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+_settings = get_settings()
+
+Key = tuple[str, str, str]
+
+_PENDING_PREFIX = "pending:"
+_POLL_SECONDS = 0.05
+# Lifetime of a pending marker: far longer than a contribute transaction, so a crashed owner
+# blocks the key for at most this long.
+_PENDING_TTL_SECONDS = 30
+# Delete the marker only if it is still ours (the claim may have expired and been re-taken).
+_RELEASE_LUA = "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end return 0"
+
+
+class IdempotencyInProgress(Exception):
+    """Another worker holds the key and did not finish within idempotency_wait_seconds."""
+
+
+def contribution_key(idempotency_key: str, session_id: str, item_id: str) -> Key:
+    return (idempotency_key.strip()[:128], session_id, str(item_id))
+
+
+def _redis_key(key: Key) -> str:
+    idempotency_key, session_id, item_id = key
+    return f"idem:contribute:{session_id}:{item_id}:{hashlib.sha256(idempotency_key.encode()).hexdigest()}"
+
+
+class Claim:
+    """
+    Result of IdempotencyStore.claim. If cached is set, replay it. Otherwise the caller owns the key:
+    run the operation, then complete(body), or release() on failure (done by `async with`).
+    """
+
+    def __init__(self, store: "IdempotencyStore", key: Key, cached: dict[str, Any] | None, redis_client: Any) -> None:
+        self._store = store
+        self._key = key
+        self._redis = redis_client
+        self._token = f"{_PENDING_PREFIX}{uuid.uuid4().hex}"
+        self._done = cached is not None
+        self.cached = cached
+
+    async def complete(self, body: dict[str, Any]) -> None:
+        """Store the response everywhere and wake local duplicates. Call after the DB commit."""
+        self._done = True
+        await self._store._complete(self._key, body, self._redis)
+
+    async def release(self) -> None:
+        if not self._done:
+            self._done = True
+            await self._store._release(self._key, self._token, self._redis)
+
+    async def __aenter__(self) -> "Claim":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.release()
+
+
+class IdempotencyStore:
+    """Completed responses (TTLCache + optional Redis) and single-flight ownership of keys."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, wait_seconds: float) -> None:
+        self._responses: TTLCache[Key, dict[str, Any]] = TTLCache(max_entries, ttl_seconds)
+        self._ttl = ttl_seconds
+        self._wait = wait_seconds
+        # key -> future resolved with the response body, or None if the owner failed
+        self._inflight: dict[Key, asyncio.Future[dict[str, Any] | None]] = {}
+        self.replays = 0
+        self.waited = 0
+        self.remote_waits = 0
+
+    async def claim(self, key: Key, redis_client: Any = None) -> Claim:
+        """Cached response for key, or ownership of it (see Claim). Duplicates wait for the owner."""
+        while True:
+            body = self._responses.get(key)
+            if body is not None:
+                self.replays += 1
+                return Claim(self, key, body, redis_client)
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.waited += 1
+            body = await asyncio.shield(pending)
+            if body is not None:
+                self.replays += 1
+                return Claim(self, key, body, redis_client)
+            # owner failed: try to claim it ourselves
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        claim = Claim(self, key, None, redis_client)
+        if redis_client is not None:
+            try:
+                body = await self._claim_shared(redis_client, key, claim._token)
+            except BaseException:
+                # In progress elsewhere, or we were cancelled: never leave local duplicates waiting.
+                self._resolve(key, None)
+                raise
+            if body is not None:
+                self._responses.set(key, body)
+                self._resolve(key, body)
+                self.replays += 1
+                claim._done = True
+                claim.cached = body
+        return claim
+
+    async def _claim_shared(self, redis_client: Any, key: Key, token: str) -> dict[str, Any] | None:
+        """SET NX our pending marker; if taken, poll for the other worker's response. Redis errors -> local only."""
+        rkey = _redis_key(key)
+        deadline = time.monotonic() + self._wait
+        try:
+            while True:
+                if await redis_client.set(rkey, token, nx=True, ex=_PENDING_TTL_SECONDS):
+                    return None
+                value = await redis_client.get(rkey)
+                if value is not None and not value.startswith(_PENDING_PREFIX):
+                    return json.loads(value)
+                if time.monotonic() >= deadline:
+                    raise IdempotencyInProgress()
+                self.remote_waits += 1
+                await asyncio.sleep(_POLL_SECONDS)
+        except IdempotencyInProgress:
+            raise
+        except Exception as e:
+            logger.warning("Idempotency Redis claim error, continuing without it: %s", e)
+            return None
+
+    async def _complete(self, key: Key, body: dict[str, Any], redis_client: Any) -> None:
+        self._responses.set(key, body)
+        self._resolve(key, body)
+        if redis_client is not None:
+            try:
+                await redis_client.set(_redis_key(key), dumps(body).decode(), ex=max(1, int(self._ttl)))
+            except Exception as e:
+                logger.warning("Idempotency Redis store error: %s", e)
+
+    async def _release(self, key: Key, token: str, redis_client: Any) -> None:
+        self._resolve(key, None)
+        if redis_client is not None:
+            try:
+                await redis_client.eval(_RELEASE_LUA, 1, _redis_key(key), token)
+            except Exception as e:
+                logger.warning("Idempotency Redis release error: %s", e)
+
+    def _resolve(self, key: Key, body: dict[str, Any] | None) -> None:
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(body)
+
+    def clear(self) -> None:
+        self._responses.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self._responses.stats() | {
+            "in_flight": len(self._inflight),
+            "replays": self.replays,
+            "waited_local": self.waited,
+            "waited_remote_polls": self.remote_waits,
+        }
+
+
+contribution_idempotency = IdempotencyStore(
+    max_entries=_settings.idempotency_cache_max_entries,
+    ttl_seconds=_settings.idempotency_ttl_seconds,
+    wait_seconds=_settings.idempotency_wait_seconds,
+)
+metrics.register("idempotency", contribution_idempotency.stats)
@@ -0,0 +1,46 @@
+"""
+Keyset (cursor) pagination on (created_at, id).
+
+A cursor is the opaque, URL-safe encoding of the last row's (created_at, id). The next page is
+"rows after this key" in the listing order, which an index on (<parent>, created_at, id) serves
+as one range scan: page N costs the same as page 1, unlike OFFSET.
+"""
+
+import base64
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+from uuid import UUID
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+ITEMS_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """(created_at, id) from encode_cursor output. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created, _, row_id = raw.partition("|")
+        key = datetime.fromisoformat(created), UUID(hex=row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if key[0].tzinfo is None:
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def split_page(rows: Sequence[T], limit: int) -> tuple[list[T], str | None]:
+    """rows fetched with LIMIT limit + 1 -> (page, next cursor or None if this is the last page)."""
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    last: Any = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
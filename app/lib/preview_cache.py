@@ -0,0 +1,110 @@
+"""
+Product/link preview cache: normalized URL -> ProductPreview, per worker.
+
+People paste the same marketplace links over and over, often with different tracking tails
+(?utm_source=..., ?from=...). Keys are normalized (scheme/host lowercased, default port and
+fragment dropped, tracking params stripped, remaining params sorted), so those collapse to one
+entry. Failed previews (quality "minimal": timeout, 4xx/5xx, empty page) are cached too, for a
+much shorter TTL, so a dead link is not re-fetched on every keystroke.
+
+Concurrent misses for the same key share one in-flight fetch (singleflight). The fetch runs as
+its own task: a caller that disconnects does not cancel it for the others.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.lib.ttl_cache import TTLCache
+from app.schemas.wish_item import ProductPreview
+
+_settings = get_settings()
+
+# Query params that never change the page content (analytics / referral markers).
+_TRACKING_PARAMS = frozenset(
+    {"fbclid", "gclid", "yclid", "dclid", "msclkid", "_openstat", "from", "ref", "referrer", "spm", "clid"}
+)
+_TRACKING_PREFIXES = ("utm_",)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Cache key for url. Not a fetchable URL guarantee: unparseable input is returned stripped."""
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return url
+    if not host:
+        return url
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+class PreviewCache:
+    """Bounded LRU+TTL cache of previews with negative caching and singleflight."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float) -> None:
+        self._entries: TTLCache[str, ProductPreview] = TTLCache(max_entries, ttl_seconds)
+        self._negative_ttl = negative_ttl_seconds
+        self._inflight: dict[str, asyncio.Task[ProductPreview]] = {}
+        self.coalesced = 0
+        self.negative_stores = 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_fetch(self, url: str, fetch: Callable[[], Awaitable[ProductPreview]]) -> ProductPreview:
+        """Cached preview for url, else the result of fetch() (shared by concurrent callers, then cached)."""
+        key = normalize_url(url)
+        cached = self._entries.get(key)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[ProductPreview]]) -> ProductPreview:
+        preview = await fetch()
+        if preview.preview_quality == "minimal":
+            if self._negative_ttl > 0:
+                self._entries.set(key, preview, ttl_seconds=self._negative_ttl)
+                self.negative_stores += 1
+        else:
+            self._entries.set(key, preview)
+        return preview
+
+    def _forget(self, key: str, task: "asyncio.Task[ProductPreview]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, Any]:
+        return self._entries.stats() | {
+            "in_flight": len(self._inflight),
+            "coalesced": self.coalesced,
+            "negative_stores": self.negative_stores,
+        }
+
+
+preview_cache = PreviewCache(
+    max_entries=_settings.preview_cache_max_entries,
+    ttl_seconds=_settings.preview_cache_ttl_seconds,
+    negative_ttl_seconds=_settings.preview_cache_negative_ttl_seconds,
+)
+metrics.register("preview_cache", preview_cache.stats)
@@ -0,0 +1,198 @@
+"""
+Short-TTL principal cache for get_current_user: user_id -> the AUTH_PRINCIPAL columns of an active user.
+
+Tier 1 is a bounded in-process TTLCache; tier 2 (optional) is Redis, shared by all workers, so a
+user that is hot anywhere rarely costs a users query. Only active users are cached: a disabled or
+unknown user always falls through to the DB and gets a 401 from there.
+
+Staleness: whatever changes a user's principal columns (is_active, email) must call
+publish_principal_invalidation after it commits; that drops the entry here, deletes the Redis key
+and tells other workers (PRINCIPAL_INVALIDATE_CHANNEL, handled by the Redis subscriber). Without
+Redis, other workers may serve the old principal for at most ttl_seconds.
+A read that raced an invalidation is never cached (same stamp rule as the public wishlist cache).
+
+The Redis tier sits on every tier-1 miss, so each call is bounded by redis_timeout_seconds and an
+error or timeout pauses the tier for a few seconds (lookups go straight to the DB meanwhile), like
+the Redis rate limiter.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.lib.ttl_cache import TTLCache
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+_settings = get_settings()
+
+# Redis channel for principal invalidation across workers (payload: user_id string)
+PRINCIPAL_INVALIDATE_CHANNEL = "auth:principal_invalidate"
+_REDIS_KEY = "principal:{}"
+
+
+def _principal(user_id: UUID, email: str, created_at: datetime) -> User:
+    """Transient User with the AUTH_PRINCIPAL columns (never added to a session)."""
+    return User(id=user_id, email=email, is_active=True, created_at=created_at)
+
+
+class PrincipalCache:
+    """user_id -> (email, created_at, cached_at monotonic) for active users."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        redis_timeout_seconds: float = 0.05,
+        retry_after_failure_seconds: float = 5.0,
+    ) -> None:
+        self._entries: TTLCache[UUID, tuple[str, datetime, float]] = TTLCache(max_entries, ttl_seconds)
+        self._ttl = ttl_seconds
+        self._redis_timeout = redis_timeout_seconds
+        self._redis_pause = retry_after_failure_seconds
+        self._redis_down_until = 0.0
+        # Bumped on every invalidation; a load that started before a bump is not cached.
+        self._clock = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.max_served_age = 0.0
+        self.redis_failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.max_entries > 0 and self._ttl > 0
+
+    def get(self, user_id: UUID) -> User | None:
+        """Cached active principal or None (does not count a miss; see get_or_load)."""
+        entry = self._entries.get(user_id, count=False)
+        if entry is None:
+            return None
+        email, created_at, cached_at = entry
+        self.hits += 1
+        self.max_served_age = max(self.max_served_age, time.monotonic() - cached_at)
+        return _principal(user_id, email, created_at)
+
+    def put(self, user: User, read_stamp: int) -> None:
+        if not self.enabled or not user.is_active or self._clock != read_stamp:
+            return
+        self._entries.set(user.id, (user.email, user.created_at, time.monotonic()))
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._clock += 1
+        self._entries.pop(user_id)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        user_id: UUID,
+        load: Callable[[UUID], Awaitable[User | None]],
+        redis_client: "redis.asyncio.Redis | None" = None,
+    ) -> User | None:
+        """Tier 1, then Redis, then load(user_id) (the DB). Redis failures fall through to the DB."""
+        user = self.get(user_id)
+        if user is not None:
+            return user
+        self.misses += 1
+        read_stamp = self._clock
+        if redis_client is not None and self.enabled and self._shared_available():
+            user = await self._get_shared(redis_client, user_id)
+            if user is not None:
+                self.shared_hits += 1
+                self.put(user, read_stamp)
+                return user
+        user = await load(user_id)
+        if user is not None and user.is_active:
+            self.put(user, read_stamp)
+            if (
+                redis_client is not None
+                and self.enabled
+                and self._clock == read_stamp
+                and self._shared_available()
+            ):
+                await self._put_shared(redis_client, user)
+        return user
+
+    def _shared_available(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _shared_failed(self, op: str, e: BaseException) -> None:
+        self.redis_failures += 1
+        self._redis_down_until = time.monotonic() + self._redis_pause
+        logger.warning("Principal cache Redis %s error, using the DB only for %ss: %r", op, self._redis_pause, e)
+
+    async def _get_shared(self, redis_client: Any, user_id: UUID) -> User | None:
+        try:
+            raw = await asyncio.wait_for(redis_client.get(_REDIS_KEY.format(user_id)), self._redis_timeout)
+        except Exception as e:
+            self._shared_failed("get", e)
+            return None
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+            return _principal(user_id, data["email"], datetime.fromisoformat(data["created_at"]))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Principal cache Redis entry unreadable: %s", e)
+            return None
+
+    async def _put_shared(self, redis_client: Any, user: User) -> None:
+        value = json.dumps({"email": user.email, "created_at": user.created_at.isoformat()})
+        try:
+            await asyncio.wait_for(
+                redis_client.set(_REDIS_KEY.format(user.id), value, ex=max(1, int(self._ttl))), self._redis_timeout
+            )
+        except Exception as e:
+            self._shared_failed("set", e)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._entries.max_entries,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self._entries.evictions,
+            # Upper bound on how long a disabled user can keep authenticating on a worker
+            # that missed the invalidation (no Redis); max_served_age_seconds is observed.
+            "staleness_window_seconds": self._ttl,
+            "max_served_age_seconds": round(self.max_served_age, 3),
+            "redis_failures": self.redis_failures,
+            "redis_degraded": not self._shared_available(),
+        }
+
+
+async def publish_principal_invalidation(redis_client: "redis.asyncio.Redis | None", user_id: UUID) -> None:
+    """
+    Drop user_id from this worker, the shared Redis tier and (via pub/sub) the other workers.
+    Call after a change to the user's principal columns is committed. Failures are logged; never raise.
+    """
+    principal_cache.invalidate(user_id)
+    if redis_client:
+        try:
+            await redis_client.delete(_REDIS_KEY.format(user_id))
+            await redis_client.publish(PRINCIPAL_INVALIDATE_CHANNEL, str(user_id))
+        except Exception as e:
+            logger.warning("Principal invalidation publish error: %s", e)
+
+
+principal_cache = PrincipalCache(
+    max_entries=_settings.principal_cache_max_entries,
+    ttl_seconds=_settings.principal_cache_ttl_seconds,
+    redis_timeout_seconds=_settings.principal_cache_redis_timeout_seconds,
+)
+metrics.register("principal_cache", principal_cache.stats)
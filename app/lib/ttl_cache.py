@@ -0,0 +1,83 @@
+"""Bounded LRU cache with per-entry TTL. O(1) get/set/evict via OrderedDict; hit/miss counters."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    LRU ordered dict: most recently used at the end, oldest popped first when full.
+    Expired entries are dropped lazily on access and from the LRU end on insert.
+    ttl_seconds <= 0 means entries never expire (size bound only).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0) -> None:
+        self._max_entries = max(0, max_entries)
+        self._ttl = ttl_seconds
+        # key -> (value, expires_at monotonic; 0 = never)
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    def get(self, key: K, default: V | None = None, *, count: bool = True) -> V | None:
+        """Return value and mark as recently used; None (or default) if missing or expired."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            if count:
+                self.misses += 1
+            return default
+        value, expires_at = entry  # type: ignore[misc]
+        if expires_at and expires_at <= time.monotonic():
+            del self._data[key]
+            if count:
+                self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        if count:
+            self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        """Insert or replace; evicts expired then least recently used entries while over capacity."""
+        if self._max_entries == 0:
+            return
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl > 0 else 0.0
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        """Remove key; returns its value (even if expired) or None."""
+        entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,111 @@
+"""
+Versioned read-through cache for the encoded public wishlist JSON, keyed by share token.
+
+Every mutation of a wishlist (item create/update/delete, reserve, cancel, contribute) bumps that
+wishlist's version *after* commit. A cached entry remembers the clock value from before its DB
+read; it is served only while no bump for its wishlist happened since, so a read racing a write
+can never pin stale data. Other workers learn about bumps via Redis (see redis_broadcast);
+the TTL bounds staleness when Redis is not configured.
+"""
+
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.lib.ttl_cache import TTLCache
+
+_settings = get_settings()
+
+
+class PublicWishlistCache:
+    """
+    share_token -> (wishlist_id, read stamp, day, JSON body, ETag); wishlist_id -> last bump stamp.
+    day is the date ordinal the body was rendered for (it has date-dependent fields and ETag):
+    an entry from another day is a miss, whatever the TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._entries: TTLCache[UUID, tuple[UUID, int, int, bytes, str]] = TTLCache(
+            max_entries, ttl_seconds
+        )
+        # Bounded too: versions for evicted wishlists fall back to _floor, which only grows,
+        # so entries read before an evicted bump are treated as stale (one extra miss, never stale data).
+        self._versions: OrderedDict[UUID, int] = OrderedDict()
+        self._max_versions = max(1, max_entries) * 4
+        self._floor = 0
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.max_entries > 0
+
+    def stamp(self) -> int:
+        """Clock value to pass to put(); take it before reading from the DB."""
+        return self._clock
+
+    def _version(self, wishlist_id: UUID) -> int:
+        return self._versions.get(wishlist_id, self._floor)
+
+    def get(self, token: UUID, day: int = 0) -> tuple[bytes, str] | None:
+        """(JSON body, ETag) if cached for day and not invalidated since it was read; else None."""
+        entry = self.get_entry(token, day)
+        return entry[1:] if entry is not None else None
+
+    def get_entry(self, token: UUID, day: int = 0) -> tuple[UUID, bytes, str] | None:
+        """get() plus the wishlist_id the token belongs to."""
+        entry = self._entries.get(token, count=False)
+        if entry is None:
+            self.misses += 1
+            return None
+        wishlist_id, read_stamp, entry_day, body, etag = entry
+        if self._version(wishlist_id) > read_stamp or entry_day != day:
+            self._entries.pop(token)
+            self.misses += 1
+            self.stale += 1
+            return None
+        self.hits += 1
+        return wishlist_id, body, etag
+
+    def put(self, token: UUID, wishlist_id: UUID, body: bytes, etag: str, read_stamp: int, day: int = 0) -> None:
+        if not self.enabled or self._version(wishlist_id) > read_stamp:
+            return
+        self._entries.set(token, (wishlist_id, read_stamp, day, body, etag))
+
+    def invalidate(self, wishlist_id: UUID) -> None:
+        """Bump the wishlist version; cached bodies read before now become stale."""
+        self._clock += 1
+        self._versions[wishlist_id] = self._clock
+        self._versions.move_to_end(wishlist_id)
+        while len(self._versions) > self._max_versions:
+            _, evicted = self._versions.popitem(last=False)
+            self._floor = max(self._floor, evicted)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._entries.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "stale": self.stale,
+            "evictions": self._entries.evictions,
+        }
+
+
+public_wishlist_cache = PublicWishlistCache(
+    max_entries=_settings.public_wishlist_cache_max_entries,
+    ttl_seconds=_settings.public_wishlist_cache_ttl_seconds,
+)
+metrics.register("public_wishlist_cache", public_wishlist_cache.stats)
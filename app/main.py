@@ -1,6 +1,5 @@
 """FastAPI application entrypoint."""
 
-import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -12,10 +11,14 @@ from fastapi.responses import JSONResponse
 from app.api.routers import auth, health, items, link_preview, users, wishlists, ws
 from app.core.config import get_settings
 from app.core.database import close_db
-from app.middleware.rate_limit import PublicWishlistRateLimitMiddleware
+from app.core.security import PasswordHasherBusy, password_hash_pool
+from app.lib.http_client import create_http_client
+from app.middleware.rate_limit import RateLimitMiddleware
 from app.schemas.errors import ErrorResponse, error_code_from_status
+from app.services.product_parser import FETCH_TIMEOUT, parse_pool
+from app.websocket.coalesce import create_coalescer
 from app.websocket.manager import ConnectionManager
-from app.websocket.redis_broadcast import run_subscriber
+from app.websocket.redis_broadcast import publish_message, run_subscriber
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -23,32 +26,39 @@ settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup/shutdown: DB, Redis pub/sub, WebSocket manager."""
+    """Startup/shutdown: DB, Redis pub/sub, WebSocket manager, pooled preview HTTP client."""
     app.state.ws_manager = ConnectionManager()
+    app.state.http_client = create_http_client(FETCH_TIMEOUT)
     app.state.redis_pub = None
-    subscriber_task = None
+    app.state.ws_subscriber = None
     try:
         if settings.redis_url:
             try:
                 from redis.asyncio import Redis
 
                 app.state.redis_pub = Redis.from_url(settings.redis_url, decode_responses=True)
-                subscriber_task = await run_subscriber(app.state.ws_manager, settings.redis_url)
-                app.state.ws_subscriber_task = subscriber_task
+                app.state.ws_subscriber = run_subscriber(app.state.ws_manager, settings.redis_url)
                 logger.info("WebSocket Redis pub/sub enabled")
             except Exception as e:
                 logger.warning("Redis connect failed, WS single-worker only: %s", e)
     except Exception as e:
         logger.warning("WebSocket setup: %s", e)
+    app.state.ws_coalescer = create_coalescer(
+        settings.ws_coalesce_window_ms,
+        lambda wishlist_id, message: publish_message(
+            app.state.redis_pub, app.state.ws_manager, wishlist_id, message, app.state.ws_subscriber
+        ),
+    )
     yield
-    if subscriber_task and not subscriber_task.done():
-        subscriber_task.cancel()
-        try:
-            await subscriber_task
-        except asyncio.CancelledError:
-            pass
+    if app.state.ws_coalescer is not None:
+        await app.state.ws_coalescer.aclose()
+    if app.state.ws_subscriber is not None:
+        await app.state.ws_subscriber.aclose()
     if getattr(app.state, "redis_pub", None) is not None:
         await app.state.redis_pub.aclose()
+    await app.state.http_client.aclose()
+    password_hash_pool.shutdown()
+    parse_pool.shutdown()
     await close_db()
 
 
@@ -58,7 +68,7 @@ app = FastAPI(
 
 **Error responses** all use the same schema: `{ "detail": "...", "error_code": "..." }`.
 
-**Error codes:** `validation_error` (422), `invalid_request` (400), `unauthorized` (401), `forbidden` (403), `not_found` (404), `conflict` (409), `rate_limited` (429), `internal_error` (500).
+**Error codes:** `validation_error` (422), `invalid_request` (400), `unauthorized` (401), `forbidden` (403), `not_found` (404), `conflict` (409), `rate_limited` (429), `internal_error` (500), `overloaded` (503).
 """,
     version="0.1.0",
     lifespan=lifespan,
@@ -94,6 +104,16 @@ async def http_exception_handler(_request: Request, exc: HTTPException) -> JSONR
     )
 
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(_request: Request, _exc: PasswordHasherBusy) -> JSONResponse:
+    """Hash pool full: shed quickly so clients back off instead of piling onto the queue."""
+    return JSONResponse(
+        status_code=503,
+        content=ErrorResponse(detail="Server busy, try again shortly", error_code="overloaded").model_dump(),
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(_request: Request, exc: Exception) -> JSONResponse:
     """Catch-all for unhandled exceptions."""
@@ -112,8 +132,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
-app.add_middleware(PublicWishlistRateLimitMiddleware)
+app.add_middleware(RateLimitMiddleware)
 
 app.include_router(health.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
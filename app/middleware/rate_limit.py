@@ -1,52 +1,336 @@
-"""Per-IP rate limit for public wishlist endpoint."""
+"""
+Per-IP rate limits with per-route budgets, as a pure ASGI middleware.
 
+Sliding-window counter: each key keeps (window index, count in this window, count in the previous
+one) and the estimate is previous * (unelapsed fraction of the window) + current. Constant state
+and O(1) work per request, unlike a list of timestamps per IP. Entries are kept in LRU order, so
+the sweep that drops idle keys only walks the expired front of the dict; the number of tracked
+keys is hard-capped (least recently seen keys are evicted first).
+
+Pure ASGI: WebSocket upgrades and routes without a policy pass straight through, with none of the
+per-request task/stream overhead of BaseHTTPMiddleware.
+
+A request normally costs one unit. A policy with a cost function charges what the request body asks
+for instead (a link-preview batch costs one unit per URL, since each is an outbound fetch); the
+body is then read here and replayed to the app. Policies with the same name share one budget.
+
+With several workers, a per-process counter lets N times the limit through. When Redis is
+configured (app.state.redis_pub from lifespan) and rate_limit_backend is "redis", the same
+sliding-window check-and-increment runs as one Lua script on the Redis server: one EVALSHA round
+trip per limited request, shared by all workers and surviving restarts. If Redis errors or is
+slow, the local limiter takes over and Redis is retried after a short pause.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core import metrics
 from app.core.config import get_settings
+from app.schemas.wish_item import LINK_PREVIEW_BATCH_MAX_URLS
+
+try:
+    from redis.exceptions import NoScriptError
+except ImportError:  # pragma: no cover - redis is optional for single-worker setups
+    NoScriptError = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """limit requests per window_seconds per client IP for paths starting with any of prefixes."""
+
+    name: str
+    prefixes: tuple[str, ...]
+    limit: int  # 0 disables the policy
+    window_seconds: float = 60.0
+    methods: frozenset[str] | None = None  # None = every method
+    cost: Callable[[bytes], int] | None = None  # units charged for a request body; None = 1, body not read
+
+    def matches(self, method: str, path: str) -> bool:
+        return path.startswith(self.prefixes) and (self.methods is None or method in self.methods)
+
+
+def link_preview_batch_cost(body: bytes) -> int:
+    """One unit per URL of a link-preview batch; 1 for a body the endpoint will reject unfetched."""
+    try:
+        urls = json.loads(body).get("urls")
+    except (ValueError, AttributeError):
+        return 1
+    if isinstance(urls, list) and 1 <= len(urls) <= LINK_PREVIEW_BATCH_MAX_URLS:
+        return len(urls)
+    return 1
+
+
+def default_policies() -> list[RateLimitPolicy]:
+    """Budgets from settings: cheap cached public reads vs outbound-fetching previews."""
+    settings = get_settings()
+    return [
+        RateLimitPolicy("public_wishlist", ("/api/wishlists/public/",), settings.rate_limit_public_per_minute),
+        RateLimitPolicy(
+            "link_preview",
+            ("/api/link-preview/batch",),
+            settings.rate_limit_link_preview_per_minute,
+            methods=frozenset({"POST"}),
+            cost=link_preview_batch_cost,
+        ),
+        RateLimitPolicy(
+            "link_preview",
+            ("/api/link-preview", "/api/items/preview"),
+            settings.rate_limit_link_preview_per_minute,
+        ),
+    ]
+
+
+def _retry_after(window: float, offset: float, limit: int, current: int, previous: int, cost: int = 1) -> float:
+    """Seconds until previous * (1 - offset / window) + current + cost <= limit, for a rejected request."""
+    if current + cost > limit or previous == 0:
+        return window - offset  # this window alone is full: wait for the next one
+    return max(0.0, window * (1 - (limit - cost - current) / previous) - offset)
+
+
+class SlidingWindowLimiter:
+    """key -> [window index, current count, previous count]; see module docstring."""
 
-# In-memory: ip -> list of request timestamps in the last minute
-_store: dict[str, list[float]] = defaultdict(list)
-_cleanup_after = 120  # drop entries older than 2 minutes
+    def __init__(self, window_seconds: float, max_keys: int) -> None:
+        self._window = window_seconds
+        self._max_keys = max(1, max_keys)
+        self._entries: OrderedDict[str, list[int]] = OrderedDict()
+        self._next_sweep = 0.0
+        self.rejected = 0
+        self.evictions = 0
+        self.swept = 0
 
+    def __len__(self) -> int:
+        return len(self._entries)
 
-def _get_client_ip(request: Request) -> str:
-    forwarded = request.headers.get("x-forwarded-for")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    if request.client:
-        return request.client.host
-    return "unknown"
+    def hit(self, key: str, limit: int, now: float | None = None, cost: int = 1) -> float:
+        """Count cost units for key. Returns 0 if allowed, else seconds until a retry may succeed."""
+        now = time.monotonic() if now is None else now
+        index, offset = divmod(now, self._window)
+        index = int(index)
+        if now >= self._next_sweep:
+            self._sweep(index)
+            self._next_sweep = now + self._window
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._entries) >= self._max_keys:
+                self._sweep(index)
+                if len(self._entries) >= self._max_keys:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            entry = self._entries[key] = [index, 0, 0]
+        else:
+            self._entries.move_to_end(key)
+            if entry[0] != index:
+                entry[2] = entry[1] if entry[0] == index - 1 else 0
+                entry[1] = 0
+                entry[0] = index
+        current, previous = entry[1], entry[2]
+        if previous * (1 - offset / self._window) + current + cost <= limit:
+            entry[1] += cost
+            return 0.0
+        self.rejected += 1
+        return _retry_after(self._window, offset, limit, current, previous, cost)
 
+    def _sweep(self, index: int) -> None:
+        """Drop keys idle for two windows (their estimate is 0). LRU order: stop at the first live key."""
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry[0] >= index - 1:
+                break
+            del self._entries[key]
+            self.swept += 1
 
-def _prune(ip: str) -> None:
-    now = time.monotonic()
-    cutoff = now - 60
-    _store[ip] = [t for t in _store[ip] if t > cutoff]
-    if not _store[ip]:
-        del _store[ip]
+    def stats(self) -> dict[str, Any]:
+        return {
+            "keys": len(self._entries),
+            "max_keys": self._max_keys,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+            "swept": self.swept,
+        }
 
 
-class PublicWishlistRateLimitMiddleware(BaseHTTPMiddleware):
-    """Limit requests to GET /api/wishlists/public/* per IP per minute."""
+# KEYS: current window, previous window. ARGV: limit, weight of the previous window, TTL ms, cost.
+# Returns {allowed (1/0), current count, previous count}; increments only when allowed.
+_SLIDING_WINDOW_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local cost = tonumber(ARGV[4])
+if previous * tonumber(ARGV[2]) + current + cost > tonumber(ARGV[1]) then
+  return {0, current, previous}
+end
+current = redis.call('INCRBY', KEYS[1], cost)
+if current == cost then
+  redis.call('PEXPIRE', KEYS[1], ARGV[3])
+end
+return {1, current, previous}
+"""
 
-    async def dispatch(self, request: Request, call_next):
-        if not request.url.path.startswith("/api/wishlists/public/"):
-            return await call_next(request)
+
+class RedisSlidingWindow:
+    """
+    The SlidingWindowLimiter algorithm with counters in Redis, keyed rl:{policy:ip}:<window index>
+    (hash tag keeps both windows on one cluster slot). Windows are aligned to wall-clock time so
+    all workers agree. hit() returns None when Redis cannot answer; the caller falls back.
+    """
+
+    def __init__(self, timeout_seconds: float, retry_after_failure_seconds: float = 5.0) -> None:
+        self._timeout = timeout_seconds
+        self._pause = retry_after_failure_seconds
+        self._sha = hashlib.sha1(_SLIDING_WINDOW_LUA.encode()).hexdigest()
+        self._down_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.latency = metrics.Histogram()
+
+    async def hit(self, redis_client: Any, policy: RateLimitPolicy, client_key: str, cost: int = 1) -> float | None:
+        if time.monotonic() < self._down_until:
+            return None
+        now = time.time()
+        index, offset = divmod(now, policy.window_seconds)
+        prefix = f"rl:{{{policy.name}:{client_key}}}:"
+        keys = (prefix + str(int(index)), prefix + str(int(index) - 1))
+        args = (policy.limit, 1 - offset / policy.window_seconds, int(policy.window_seconds * 2000), cost)
+        started = time.perf_counter()
+        self.calls += 1
+        try:
+            allowed, current, previous = await asyncio.wait_for(self._eval(redis_client, keys, args), self._timeout)
+        except Exception as e:
+            self.failures += 1
+            self._down_until = time.monotonic() + self._pause
+            logger.warning("Rate limit Redis error, using local limiter for %ss: %s", self._pause, e)
+            return None
+        finally:
+            self.latency.observe(time.perf_counter() - started)
+        if allowed:
+            return 0.0
+        return _retry_after(policy.window_seconds, offset, policy.limit, int(current), int(previous), cost)
+
+    async def _eval(self, redis_client: Any, keys: tuple[str, str], args: tuple[Any, ...]) -> list[Any]:
+        try:
+            return await redis_client.evalsha(self._sha, len(keys), *keys, *args)
+        except Exception as e:
+            if NoScriptError is None or not isinstance(e, NoScriptError):
+                raise
+            # First use on this Redis (or after SCRIPT FLUSH / failover): load once, then EVALSHA again.
+            await redis_client.script_load(_SLIDING_WINDOW_LUA)
+            return await redis_client.evalsha(self._sha, len(keys), *keys, *args)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "degraded": time.monotonic() < self._down_until,
+            "latency_seconds": self.latency.stats(),
+        }
+
+
+def _client_ip(scope: Scope) -> str:
+    for name, value in scope.get("headers") or ():
+        if name == b"x-forwarded-for":
+            return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _read_body(receive: Receive) -> tuple[bytes, Receive]:
+    """The whole request body, and a receive that replays it to the app."""
+    chunks: list[bytes] = []
+    message: Message = {"type": "http.request", "more_body": True}
+    while message["type"] == "http.request" and message.get("more_body", False):
+        message = await receive()
+        chunks.append(message.get("body", b""))
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        if message["type"] != "http.request":
+            return message  # client disconnected while we read
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return body, replay
+
+
+class RateLimitMiddleware:
+    """First matching policy wins; requests matching no policy are not counted."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: Sequence[RateLimitPolicy] | None = None,
+        max_keys: int | None = None,
+        backend: str | None = None,
+    ) -> None:
+        self.app = app
         settings = get_settings()
-        if settings.rate_limit_public_per_minute <= 0:
-            return await call_next(request)
-        ip = _get_client_ip(request)
-        now = time.monotonic()
-        _prune(ip)
-        if len(_store[ip]) >= settings.rate_limit_public_per_minute:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Too many requests", "error_code": "rate_limited"},
-            )
-        _store[ip].append(now)
-        return await call_next(request)
+        if policies is None:
+            policies = default_policies()
+        if max_keys is None:
+            max_keys = settings.rate_limit_max_keys
+        if backend is None:
+            backend = settings.rate_limit_backend
+        limiters: dict[str, SlidingWindowLimiter] = {}
+        self._policies = [
+            (p, limiters.setdefault(p.name, SlidingWindowLimiter(p.window_seconds, max_keys)))
+            for p in policies
+            if p.limit > 0
+        ]
+        self._redis = RedisSlidingWindow(settings.rate_limit_redis_timeout_seconds) if backend == "redis" else None
+        metrics.register("rate_limit", self.stats)
+
+    async def _hit(self, scope: Scope, policy: RateLimitPolicy, local: SlidingWindowLimiter, cost: int) -> float:
+        client_key = _client_ip(scope)
+        if self._redis is not None:
+            app = scope.get("app")
+            redis_client = getattr(app.state, "redis_pub", None) if app is not None else None
+            if redis_client is not None:
+                retry_after = await self._redis.hit(redis_client, policy, client_key, cost)
+                if retry_after is not None:
+                    return retry_after
+        return local.hit(client_key, policy.limit, cost=cost)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._policies:
+            await self.app(scope, receive, send)
+            return
+        method, path = scope["method"], scope["path"]
+        for policy, limiter in self._policies:
+            if policy.matches(method, path):
+                cost = 1
+                if policy.cost is not None:
+                    body, receive = await _read_body(receive)
+                    cost = policy.cost(body)
+                retry_after = await self._hit(scope, policy, limiter, cost)
+                if retry_after:
+                    response = JSONResponse(
+                        status_code=429,
+                        content={"detail": "Too many requests", "error_code": "rate_limited"},
+                        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                    )
+                    await response(scope, receive, send)
+                    return
+                break
+        await self.app(scope, receive, send)
+
+    def stats(self) -> dict[str, Any]:
+        out: dict[str, Any] = {policy.name: {"limit": policy.limit} | limiter.stats() for policy, limiter in self._policies}
+        if self._redis is not None:
+            out["redis"] = self._redis.stats()
+        return out
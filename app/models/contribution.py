@@ -29,7 +29,7 @@ class Contribution(BaseModel):
     anonymous_session_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
 
-    item: Mapped["WishItem"] = relationship("WishItem", back_populates="contributions")
+    item: Mapped["WishItem"] = relationship("WishItem", back_populates="contributions", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"Contribution(id={self.id!r}, item_id={self.item_id!r}, amount={self.amount})"
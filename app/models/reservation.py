@@ -29,7 +29,7 @@ class Reservation(BaseModel):
     anonymous_session_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     cancelled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    item: Mapped["WishItem"] = relationship("WishItem", back_populates="reservations")
+    item: Mapped["WishItem"] = relationship("WishItem", back_populates="reservations", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return (
@@ -19,7 +19,8 @@ class User(BaseModel):
         "Wishlist",
         back_populates="owner",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from decimal import Decimal
 
-from sqlalchemy import Boolean, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,12 +19,13 @@ class WishItem(BaseModel):
     """
 
     __tablename__ = "wish_items"
+    # Keyset pagination of a wishlist's items (also serves plain wishlist_id lookups)
+    __table_args__ = (Index("ix_wish_items_wishlist_created_id", "wishlist_id", "created_at", "id"),)
 
     wishlist_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("wishlists.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -35,21 +36,30 @@ class WishItem(BaseModel):
         nullable=False,
         default=Decimal("0"),
     )
+    # Running SUM(contributions.amount); maintained in the contribution transaction (see ContributionService).
+    contributed_total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        nullable=False,
+        default=Decimal("0"),
+        server_default="0",
+    )
     allow_group_contribution: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
 
-    wishlist: Mapped["Wishlist"] = relationship("Wishlist", back_populates="items")
+    wishlist: Mapped["Wishlist"] = relationship("Wishlist", back_populates="items", lazy="raise_on_sql")
     reservations: Mapped[list["Reservation"]] = relationship(
         "Reservation",
         back_populates="item",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     contributions: Mapped[list["Contribution"]] = relationship(
         "Contribution",
         back_populates="item",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from datetime import date
 
-from sqlalchemy import Boolean, Date, ForeignKey, String, Text
+from sqlalchemy import Boolean, Date, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -16,12 +16,13 @@ class Wishlist(BaseModel):
     """Wishlist: title, description, event date, public flag, share token."""
 
     __tablename__ = "wishlists"
+    # Keyset pagination of the owner's lists (also serves plain owner_id lookups)
+    __table_args__ = (Index("ix_wishlists_owner_created_id", "owner_id", "created_at", "id"),)
 
     owner_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -34,13 +35,16 @@ class Wishlist(BaseModel):
         default=uuid.uuid4,
         nullable=False,
     )
+    # Bumped on every item/reservation/contribution change; source of the ETag for conditional GET.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
-    owner: Mapped["User"] = relationship("User", back_populates="wishlists")
+    owner: Mapped["User"] = relationship("User", back_populates="wishlists", lazy="raise_on_sql")
     items: Mapped[list["WishItem"]] = relationship(
         "WishItem",
         back_populates="wishlist",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -7,6 +7,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.contribution import Contribution
+from app.models.wish_item import WishItem
 
 
 class ContributionRepository:
@@ -44,4 +45,18 @@ class ContributionRepository:
         for iid in item_ids:
             if iid not in out:
                 out[iid] = Decimal("0")
-        return out
\ No newline at end of file
+        return out
+
+    async def get_total_drift(self) -> list[tuple[UUID, UUID, Decimal, Decimal]]:
+        """
+        (item_id, wishlist_id, stored contributed_total, actual SUM) for items whose running total
+        disagrees with rows.
+        """
+        actual = func.coalesce(func.sum(Contribution.amount), 0)
+        result = await self._session.execute(
+            select(WishItem.id, WishItem.wishlist_id, WishItem.contributed_total, actual)
+            .outerjoin(Contribution, Contribution.item_id == WishItem.id)
+            .group_by(WishItem.id, WishItem.wishlist_id, WishItem.contributed_total)
+            .having(WishItem.contributed_total != actual)
+        )
+        return [(row[0], row[1], Decimal(str(row[2])), Decimal(str(row[3]))) for row in result.all()]
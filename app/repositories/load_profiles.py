@@ -0,0 +1,19 @@
+"""
+Named loader profiles. Every relationship is lazy="raise_on_sql", so nothing beyond the selected
+columns is loaded unless a repository method opts in with one of these profiles; touching an
+unloaded relationship raises instead of issuing a hidden query.
+"""
+
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.models.user import User
+
+# get_current_user: existence + is_active + fields for /auth/me. No password hash, no wishlists.
+AUTH_PRINCIPAL: tuple[ORMOption, ...] = (
+    load_only(User.id, User.email, User.is_active, User.created_at, raiseload=True),
+)
+
+# Owner list / ownership checks need no profile: columns only is the default.
+# Owner edit view has no profile either: items are read as a keyset page (WishlistRepository.list_items_page).
+# Public view has no ORM profile: WishlistRepository.get_public_view_rows aggregates in SQL.
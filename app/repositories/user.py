@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.repositories.load_profiles import AUTH_PRINCIPAL
 
 
 class UserRepository:
@@ -19,6 +20,13 @@ class UserRepository:
         result = await self._session.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_principal(self, user_id: UUID) -> User | None:
+        """Fetch user for request authentication (AUTH_PRINCIPAL profile: no hash, no relationships)."""
+        result = await self._session.execute(
+            select(User).where(User.id == user_id).options(*AUTH_PRINCIPAL)
+        )
+        return result.scalar_one_or_none()
+
     async def get_by_email(self, email: str) -> User | None:
         """Fetch user by email."""
         result = await self._session.execute(select(User).where(User.email == email))
@@ -1,5 +1,6 @@
 """WishItem repository: persistence and soft delete."""
 
+from decimal import Decimal
 from uuid import UUID
 
 from sqlalchemy import select, update
@@ -110,6 +111,14 @@ class WishItemRepository:
             await self._session.refresh(item)
         return item
 
+    async def add_contributed(self, item_id: UUID, amount: Decimal) -> None:
+        """Increase contributed_total in the current transaction (caller holds the row lock)."""
+        await self._session.execute(
+            update(WishItem)
+            .where(WishItem.id == item_id)
+            .values(contributed_total=WishItem.contributed_total + amount)
+        )
+
     async def soft_delete(self, item_id: UUID) -> bool:
         """Mark item as deleted. Returns True if a row was updated."""
         result = await self._session.execute(
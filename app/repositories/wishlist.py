@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-from datetime import date
+from collections.abc import Sequence
+from datetime import date, datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, and_, exists, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.models.reservation import Reservation
+from app.models.wish_item import WishItem
 from app.models.wishlist import Wishlist
 
 
@@ -30,27 +32,97 @@ class WishlistRepository:
         )
         return result.scalar_one_or_none()
 
-    async def list_by_owner(self, owner_id: UUID) -> list[Wishlist]:
-        """List wishlists owned by user."""
+    async def list_by_owner(
+        self, owner_id: UUID, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[Wishlist]:
+        """
+        Up to limit wishlists owned by user, newest first, strictly after the (created_at, id) key.
+        Keyset range scan on ix_wishlists_owner_created_id; pass limit + 1 to detect a next page.
+        """
+        q = select(Wishlist).where(Wishlist.owner_id == owner_id)
+        if after is not None:
+            q = q.where(tuple_(Wishlist.created_at, Wishlist.id) < tuple_(*after))
         result = await self._session.execute(
-            select(Wishlist).where(Wishlist.owner_id == owner_id).order_by(Wishlist.created_at.desc())
+            q.order_by(Wishlist.created_at.desc(), Wishlist.id.desc()).limit(limit)
         )
         return list(result.scalars().all())
 
+    async def list_items_page(
+        self, wishlist_id: UUID, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[WishItem]:
+        """
+        Up to limit items of a wishlist (including soft-deleted, for the owner view), oldest first,
+        strictly after the (created_at, id) key. Keyset range scan on ix_wish_items_wishlist_created_id.
+        """
+        q = select(WishItem).where(WishItem.wishlist_id == wishlist_id)
+        if after is not None:
+            q = q.where(tuple_(WishItem.created_at, WishItem.id) > tuple_(*after))
+        result = await self._session.execute(q.order_by(WishItem.created_at, WishItem.id).limit(limit))
+        return list(result.scalars().all())
+
     async def get_by_share_token(self, token: UUID) -> Wishlist | None:
         """Fetch wishlist by share_token (for public link)."""
         result = await self._session.execute(select(Wishlist).where(Wishlist.share_token == token))
         return result.scalar_one_or_none()
 
-    async def get_by_share_token_with_items(self, token: UUID) -> Wishlist | None:
-        """Fetch wishlist by share_token with items eagerly loaded (O(1) query group for public DTO)."""
+    async def get_public_version(self, token: UUID) -> tuple[UUID, int, bool] | None:
+        """(id, version, is_public) by share_token; header columns only, no items (for ETag)."""
         result = await self._session.execute(
-            select(Wishlist)
-            .where(Wishlist.share_token == token)
-            .options(selectinload(Wishlist.items))
+            select(Wishlist.id, Wishlist.version, Wishlist.is_public).where(Wishlist.share_token == token)
+        )
+        row = result.one_or_none()
+        return (row[0], row[1], row[2]) if row else None
+
+    async def get_version_for_owner(self, wishlist_id: UUID, owner_id: UUID) -> int | None:
+        """Current version if wishlist exists and is owned by owner_id (for ETag)."""
+        result = await self._session.execute(
+            select(Wishlist.version).where(Wishlist.id == wishlist_id, Wishlist.owner_id == owner_id)
         )
         return result.scalar_one_or_none()
 
+    async def bump_version(self, wishlist_id: UUID) -> None:
+        """Increment version in the current transaction (call on every item/reservation/contribution change)."""
+        await self._session.execute(
+            update(Wishlist).where(Wishlist.id == wishlist_id).values(version=Wishlist.version + 1)
+        )
+
+    async def get_public_view_rows(self, token: UUID) -> Sequence[Row]:
+        """
+        Public view in one round-trip: wishlist header LEFT JOIN visible items, each with its
+        running contributed_total and active-reservation flag (EXISTS) computed in Postgres.
+        One row per visible item (or a single row with NULL item columns for an empty list);
+        no contribution or reservation rows are transferred. Empty result if token is unknown.
+        """
+        reserved = (
+            exists()
+            .where(Reservation.item_id == WishItem.id, Reservation.cancelled_at.is_(None))
+            .label("reserved")
+        )
+        result = await self._session.execute(
+            select(
+                Wishlist.id.label("wishlist_id"),
+                Wishlist.share_token,
+                Wishlist.title.label("wishlist_title"),
+                Wishlist.description.label("wishlist_description"),
+                Wishlist.event_date,
+                Wishlist.is_public,
+                WishItem.id.label("item_id"),
+                WishItem.title.label("item_title"),
+                WishItem.description.label("item_description"),
+                WishItem.product_url,
+                WishItem.image_url,
+                WishItem.target_price,
+                WishItem.allow_group_contribution,
+                WishItem.contributed_total,
+                reserved,
+            )
+            .select_from(Wishlist)
+            .outerjoin(WishItem, and_(WishItem.wishlist_id == Wishlist.id, WishItem.is_deleted.is_(False)))
+            .where(Wishlist.share_token == token)
+            .order_by(WishItem.created_at, WishItem.id)
+        )
+        return result.all()
+
     async def create(
         self,
         owner_id: UUID,
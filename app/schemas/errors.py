@@ -12,6 +12,7 @@ ERROR_CODES = {
     "conflict": "State conflict, e.g. already reserved (409).",
     "rate_limited": "Too many requests (429).",
     "internal_error": "Server error (500).",
+    "overloaded": "Temporarily overloaded; retry after Retry-After seconds (503).",
 }
 
 
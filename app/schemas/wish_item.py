@@ -1,7 +1,7 @@
 """Pydantic schemas for WishItem and product preview."""
 
 from decimal import Decimal
-from typing import Literal
+from typing import Annotated, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -59,3 +59,23 @@ class ProductPreview(BaseModel):
     product_url: str | None = None
     preview_quality: Literal["full", "partial", "minimal"] = "minimal"
     missing_fields: list[str] = Field(default_factory=list, description="Fields we could not extract (title, image_url, description, price)")
+
+
+# Upper bound on URLs per batch preview request (one paste of a shopping list, not a crawler)
+LINK_PREVIEW_BATCH_MAX_URLS = 50
+
+
+class LinkPreviewBatchRequest(BaseModel):
+    """Input for batch link preview."""
+
+    urls: list[Annotated[str, Field(max_length=2048)]] = Field(
+        ..., min_length=1, max_length=LINK_PREVIEW_BATCH_MAX_URLS
+    )
+
+
+class LinkPreviewBatchItem(BaseModel):
+    """One NDJSON line of the batch response; lines arrive in completion order, index maps back to urls."""
+
+    index: int
+    url: str
+    preview: ProductPreview
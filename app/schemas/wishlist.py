@@ -67,9 +67,12 @@ class WishlistItemResponse(BaseModel):
 
 
 class WishlistWithItemsResponse(WishlistResponse):
-    """Wishlist with items for owner edit view."""
+    """Wishlist with one page of items for owner edit view (oldest first)."""
 
     items: list[WishlistItemResponse] = []
+    items_next_cursor: str | None = Field(
+        None, description="Pass as items_cursor to get the next page of items; null on the last page."
+    )
 
 
 class WishlistPublicResponse(WishlistBase):
@@ -10,8 +10,9 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_refresh_token,
+    hash_password_async,
     hash_refresh_token,
-    verify_password,
+    verify_password_async,
 )
 from app.models.user import User
 from app.repositories.refresh_token import RefreshTokenRepository
@@ -30,12 +31,10 @@ class AuthService:
         self._refresh_repo = RefreshTokenRepository(session)
 
     async def register(self, payload: RegisterRequest) -> User:
-        """Create a new user. Caller must check email_taken before."""
-        from app.core.security import hash_password
-
+        """Create a new user. Caller must check email_taken before. Raises PasswordHasherBusy if overloaded."""
         user = await self._user_repo.create(
             email=payload.email,
-            hashed_password=hash_password(payload.password),
+            hashed_password=await hash_password_async(payload.password),
         )
         return user
 
@@ -44,11 +43,11 @@ class AuthService:
         return await self._user_repo.exists_by_email(email)
 
     async def authenticate_user(self, payload: LoginRequest) -> User | None:
-        """Verify email/password and return user or None."""
+        """Verify email/password and return user or None. Raises PasswordHasherBusy if overloaded."""
         user = await self._user_repo.get_by_email(payload.email)
         if not user or not user.is_active:
             return None
-        if not verify_password(payload.password, user.hashed_password):
+        if not await verify_password_async(payload.password, user.hashed_password):
             return None
         return user
 
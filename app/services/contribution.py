@@ -12,6 +12,7 @@ from app.models.contribution import Contribution
 from app.models.wish_item import WishItem
 from app.repositories.contribution import ContributionRepository
 from app.repositories.wish_item import WishItemRepository
+from app.repositories.wishlist import WishlistRepository
 
 _settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ class ContributionService:
         self._session = session
         self._item_repo = WishItemRepository(session)
         self._contribution_repo = ContributionRepository(session)
+        self._wishlist_repo = WishlistRepository(session)
 
     def _progress_percent_float(self, contributed: Decimal, target: Decimal) -> float:
         return float(money_progress_percent(contributed, target))
@@ -31,7 +33,8 @@ class ContributionService:
     ) -> tuple[Contribution | None, Decimal, Decimal, float, UUID | None, str | None]:
         """
         Add contribution if item exists, not deleted, allow_group_contribution, and
-        amount > 0, sum + amount <= target_price. Uses SELECT FOR UPDATE on item for concurrent safety.
+        amount > 0, contributed_total + amount <= target_price. Uses SELECT FOR UPDATE on item for
+        concurrent safety; the running total is read from and updated on that locked row.
         Returns (contribution, contributed_total, target_price, progress_percent, wishlist_id, reject_reason).
         reject_reason is "fully_funded" when item is already at or over target; None on success.
         """
@@ -45,13 +48,15 @@ class ContributionService:
         if _settings.min_contribution_amount is not None:
             if amount < Decimal(str(_settings.min_contribution_amount)):
                 return None, Decimal("0"), target, 0.0, None, None
-        current = await self._contribution_repo.get_sum_by_item(item_id)
+        current = item.contributed_total
         if current >= target:
             logger.info("contribution_rejected", extra={"reason": "already_fully_funded", "item_id": str(item_id)})
             return None, current, target, self._progress_percent_float(current, target), None, "fully_funded"
         if current + amount > target:
             return None, current, target, self._progress_percent_float(current, target), None, None
         c = await self._contribution_repo.create(item_id, anonymous_session_id, amount)
+        await self._item_repo.add_contributed(item_id, amount)
+        await self._wishlist_repo.bump_version(wishlist_id)
         new_total = current + amount
         logger.info(
             "contribution_added",
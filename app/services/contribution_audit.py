@@ -0,0 +1,107 @@
+"""
+Consistency check for the denormalized wish_items.contributed_total.
+
+Recomputes SUM(contributions.amount) per item and reports drift; with fix=True rewrites the
+running total from the rows (locking each item as ContributionService does) and bumps the version
+of each affected wishlist, so old ETags stop matching. After the commit, the CLI invalidates the
+cached public views on every worker (via Redis).
+Usage: python -m app.services.contribution_audit [--fix]
+"""
+
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.wish_item import WishItem
+from app.repositories.contribution import ContributionRepository
+from app.repositories.wish_item import WishItemRepository
+from app.repositories.wishlist import WishlistRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TotalDrift:
+    item_id: UUID
+    wishlist_id: UUID
+    stored: Decimal
+    actual: Decimal
+
+
+async def check_contribution_totals(session: AsyncSession, fix: bool = False) -> list[TotalDrift]:
+    """
+    Return items whose contributed_total != SUM(amount). When fix=True the caller commits, then
+    calls publish_invalidation for each drifted wishlist_id.
+    """
+    drift = [TotalDrift(*row) for row in await ContributionRepository(session).get_total_drift()]
+    for d in drift:
+        logger.warning(
+            "contributed_total_drift",
+            extra={"item_id": str(d.item_id), "stored": str(d.stored), "actual": str(d.actual)},
+        )
+    if fix and drift:
+        item_repo = WishItemRepository(session)
+        contribution_repo = ContributionRepository(session)
+        for d in drift:
+            # Re-read under the row lock so a concurrent contribution is not overwritten.
+            await item_repo.get_by_id_for_update(d.item_id, include_deleted=True)
+            actual = await contribution_repo.get_sum_by_item(d.item_id)
+            await session.execute(
+                update(WishItem).where(WishItem.id == d.item_id).values(contributed_total=actual)
+            )
+        wishlist_repo = WishlistRepository(session)
+        for wishlist_id in {d.wishlist_id for d in drift}:
+            await wishlist_repo.bump_version(wishlist_id)
+    return drift
+
+
+async def _invalidate_public_views(wishlist_ids: set[UUID]) -> None:
+    """
+    Drop the fixed wishlists from every worker's public view cache. Workers are only reachable
+    through Redis; without it their cached bodies expire after public_wishlist_cache_ttl_seconds.
+    """
+    from app.core.config import get_settings
+    from app.websocket.redis_broadcast import publish_invalidation
+
+    redis_url = get_settings().redis_url
+    if not redis_url:
+        return
+    try:
+        from redis.asyncio import Redis
+    except ImportError:
+        logger.warning("redis not installed; cached public views expire by TTL")
+        return
+    redis_client = Redis.from_url(redis_url, decode_responses=True)
+    try:
+        for wishlist_id in wishlist_ids:
+            await publish_invalidation(redis_client, wishlist_id)
+    finally:
+        await redis_client.aclose()
+
+
+async def _main(fix: bool) -> int:
+    from app.core.database import async_session_factory, close_db
+
+    try:
+        async with async_session_factory() as session:
+            drift = await check_contribution_totals(session, fix=fix)
+            if fix:
+                await session.commit()
+    finally:
+        await close_db()
+    if fix and drift:
+        await _invalidate_public_views({d.wishlist_id for d in drift})
+    for d in drift:
+        print(f"{d.item_id}: stored={d.stored} actual={d.actual}")
+    print(f"{len(drift)} item(s) with drift" + (" fixed" if fix and drift else ""))
+    return 1 if drift and not fix else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main("--fix" in sys.argv[1:])))
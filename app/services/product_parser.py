@@ -1,12 +1,17 @@
 """
 Product URL parser: fetch HTML with httpx (async), parse og:title, og:image, meta price, title fallback.
+The page is streamed and decoded incrementally; reading stops once the head is in (or at MAX_BYTES).
+Parsing runs on parse_pool (process/thread pool) so a burst of previews does not stall the loop.
 Timeout and error handling; does not block event loop.
 Only http/https URLs are allowed (SSRF and scheme validation).
 """
 
+import codecs
 import logging
 import re
+from dataclasses import dataclass, field
 from decimal import Decimal
+from html import unescape
 from typing import Any
 from urllib.parse import urlparse
 
@@ -14,7 +19,11 @@ import httpx
 
 logger = logging.getLogger(__name__)
 
+from app.core import metrics
 from app.core.config import get_settings
+from app.lib.cpu_pool import CpuPool
+from app.lib.http_client import create_http_client, host_limiter
+from app.lib.preview_cache import preview_cache
 from app.schemas.wish_item import ProductPreview
 
 _settings = get_settings()
@@ -22,92 +31,111 @@ _settings = get_settings()
 # Limit bytes read so we don't load huge pages into memory
 MAX_BYTES = _settings.product_fetch_max_bytes
 TIMEOUT = _settings.product_fetch_timeout_seconds
-
-# Patterns for meta tags (content in single or double quotes)
-_OG_TITLE = re.compile(
-    r'<meta[^>]+property=(["\'])og:title\1[^>]+content=(["\'])(.+?)\2',
-    re.IGNORECASE | re.DOTALL,
-)
-_OG_IMAGE = re.compile(
-    r'<meta[^>]+property=(["\'])og:image\1[^>]+content=(["\'])(.+?)\2',
-    re.IGNORECASE | re.DOTALL,
-)
-# content before property (some sites order differently)
-_OG_TITLE_ALT = re.compile(
-    r'<meta[^>]+content=(["\'])(.+?)\1[^>]+property=(["\'])og:title\3',
-    re.IGNORECASE | re.DOTALL,
-)
-_OG_IMAGE_ALT = re.compile(
-    r'<meta[^>]+content=(["\'])(.+?)\1[^>]+property=(["\'])og:image\3',
-    re.IGNORECASE | re.DOTALL,
-)
-_OG_DESCRIPTION = re.compile(
-    r'<meta[^>]+property=(["\'])og:description\1[^>]+content=(["\'])(.+?)\2',
-    re.IGNORECASE | re.DOTALL,
-)
-_OG_DESCRIPTION_ALT = re.compile(
-    r'<meta[^>]+content=(["\'])(.+?)\1[^>]+property=(["\'])og:description\3',
-    re.IGNORECASE | re.DOTALL,
-)
-# meta name="description" — разные порядки атрибутов, допускаем data-hid и др.
-_META_NAME_DESCRIPTION = re.compile(
-    r'<meta[^>]*\bname\s*=\s*(["\'])description\1[^>]*\bcontent\s*=\s*\1([^\1]*?)\1',
-    re.IGNORECASE | re.DOTALL,
-)
-_META_NAME_DESCRIPTION_ALT = re.compile(
-    r'<meta[^>]*\bcontent\s*=\s*(["\'])(.+?)\1[^>]*\bname\s*=\s*(["\'])description\3',
-    re.IGNORECASE | re.DOTALL,
-)
-# Все og:image (несколько тегов на странице — WB, Ozon и т.д.)
-_OG_IMAGE_ALL = re.compile(
-    r'<meta[^>]*\bproperty\s*=\s*(["\'])og:image\1[^>]*\bcontent\s*=\s*(["\'])(.+?)\2',
-    re.IGNORECASE | re.DOTALL,
-)
-_OG_IMAGE_ALL_ALT = re.compile(
-    r'<meta[^>]*\bcontent\s*=\s*(["\'])(.+?)\1[^>]*\bproperty\s*=\s*(["\'])og:image\3',
-    re.IGNORECASE | re.DOTALL,
-)
-# Запасной вариант: тег содержит og:image и content= в любом порядке (WB, Ozon и др.)
-_OG_IMAGE_LOOSE_A = re.compile(
-    r'<meta[^>]*\bog:image\b[^>]*\bcontent\s*=\s*(["\'])(.+?)\1',
-    re.IGNORECASE | re.DOTALL,
-)
-_OG_IMAGE_LOOSE_B = re.compile(
-    r'<meta[^>]*\bcontent\s*=\s*(["\'])(.+?)\1[^>]*\bog:image\b',
-    re.IGNORECASE | re.DOTALL,
-)
-_TITLE_TAG = re.compile(r"<title[^>]*>\s*(.+?)\s*</title>", re.IGNORECASE | re.DOTALL)
-# Price: og:price, product:price:amount, itemprop="price", or name="price"
-_PRICE_PATTERNS = [
-    re.compile(
-        r'<meta[^>]+property=(["\'])og:price:amount\1[^>]+content=(["\'])(.+?)\2',
-        re.IGNORECASE | re.DOTALL,
-    ),
-    re.compile(
-        r'<meta[^>]+content=(["\'])(.+?)\1[^>]+property=(["\'])og:price:amount\3',
-        re.IGNORECASE | re.DOTALL,
-    ),
-    re.compile(
-        r'<meta[^>]+property=(["\'])og:price\1[^>]+content=(["\'])(.+?)\2',
-        re.IGNORECASE | re.DOTALL,
-    ),
-    re.compile(
-        r'<meta[^>]+content=(["\'])(.+?)\1[^>]+property=(["\'])og:price\3',
-        re.IGNORECASE | re.DOTALL,
-    ),
-    re.compile(
-        r'itemprop=(["\'])price\1[^>]+content=(["\'])(.+?)\2',
-        re.IGNORECASE | re.DOTALL,
-    ),
-    re.compile(
-        r'content=(["\'])(.+?)\1[^>]+itemprop=(["\'])price\3',
-        re.IGNORECASE | re.DOTALL,
-    ),
-    re.compile(
-        r'<meta[^>]+name=(["\'])price\1[^>]+content=(["\'])(.+?)\2',
-        re.IGNORECASE | re.DOTALL,
-    ),
-]
+FETCH_TIMEOUT = min(TIMEOUT, 6.0)  # не ждём дольше 6 сек
+# Shorter pages are parsed on the loop: the pool hop (pickling, IPC) would cost more than the parse.
+PARSE_INLINE_MAX_CHARS = _settings.product_parse_inline_max_chars
+
+parse_pool = CpuPool("preview_parse", _settings.product_parse_executor, _settings.product_parse_workers)
+metrics.register("preview_parse_pool", parse_pool.stats)
+
+# Single-pass tokenizer. Every regex below is anchored with .match() at a known position and uses
+# only negated character classes (no nested quantifiers, no .+? under DOTALL), so the whole scan
+# is linear in document size with no backtracking.
+_TAG_NAME = re.compile(r"<([a-zA-Z][a-zA-Z0-9:_-]*)")
+_ATTR = re.compile(r"""[\s/]*([^\s=>/"']+)(?:\s*=\s*(?:"([^"]*)"?|'([^']*)'?|([^\s>]*)))?""")
+# Raw-text elements: their content is skipped, so "<meta" inside a script is not a tag.
+# End tags are searched case-insensitively in the original text: lowercasing a copy would shift
+# indices (e.g. "İ".lower() is two code points).
+_RAW_TEXT_END = {"script": re.compile(r"</script", re.IGNORECASE), "style": re.compile(r"</style", re.IGNORECASE)}
+_TITLE_END = re.compile(r"</title", re.IGNORECASE)
+_ITEMPROP = re.compile(r"itemprop", re.IGNORECASE)
+_PRICE_PROPERTIES = ("og:price:amount", "product:price:amount", "og:price")
+_IMAGE_PROPERTIES = frozenset({"og:image", "og:image:url", "og:image:secure_url"})
+
+
+@dataclass
+class _HtmlIndex:
+    """What the field extractors need from a page, collected in one pass."""
+
+    metas: list[dict[str, str]] = field(default_factory=list)  # attributes per <meta>, document order
+    title: str | None = None  # first <title> text (raw, unescaped later)
+    metas_before_title: int = 0  # metas seen before <title> (description prefers those after it)
+    itemprops: dict[str, str] = field(default_factory=dict)  # itemprop -> first non-empty content
+
+
+def _parse_attrs(html: str, pos: int) -> tuple[dict[str, str], int]:
+    """Attributes of the tag whose name ends at pos -> (lowercased name -> unescaped value, index after '>')."""
+    attrs: dict[str, str] = {}
+    n = len(html)
+    while pos < n:
+        m = _ATTR.match(html, pos)
+        if m is None or m.end() == pos:
+            break
+        name = m.group(1).lower()
+        value = m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4)
+        if name not in attrs:
+            attrs[name] = unescape(value) if value else ""
+        pos = m.end()
+    end = html.find(">", pos)
+    return attrs, (n if end == -1 else end + 1)
+
+
+def _add_itemprop(index: _HtmlIndex, attrs: dict[str, str]) -> None:
+    prop, content = attrs.get("itemprop", "").strip().lower(), attrs.get("content", "").strip()
+    if prop and content:
+        index.itemprops.setdefault(prop, content)
+
+
+def _index_html(html: str) -> _HtmlIndex:
+    index = _HtmlIndex()
+    n = len(html)
+    pos = html.find("<")
+    while 0 <= pos < n:
+        if html.startswith("<!--", pos):
+            end = html.find("-->", pos + 4)
+            pos = html.find("<", end + 3) if end != -1 else -1
+            continue
+        m = _TAG_NAME.match(html, pos)
+        if m is None:
+            pos = html.find("<", pos + 1)
+            continue
+        tag = m.group(1).lower()
+        if tag == "meta":
+            attrs, pos = _parse_attrs(html, m.end())
+            index.metas.append(attrs)
+            _add_itemprop(index, attrs)
+        elif tag == "title":
+            _, start = _parse_attrs(html, m.end())
+            end_match = _TITLE_END.search(html, start)
+            end = end_match.start() if end_match else n
+            if index.title is None:
+                index.title = html[start:end]
+                index.metas_before_title = len(index.metas)
+            pos = end
+        elif tag in _RAW_TEXT_END:
+            _, start = _parse_attrs(html, m.end())
+            end_match = _RAW_TEXT_END[tag].search(html, start)
+            pos = end_match.start() if end_match else n
+        else:
+            end = html.find(">", m.end())
+            if end == -1:
+                break
+            # Microdata (itemprop="price" content="...") can sit on any element
+            if _ITEMPROP.search(html, m.end(), end):
+                _add_itemprop(index, _parse_attrs(html, m.end())[0])
+            pos = end + 1
+        pos = html.find("<", pos)
+    return index
+
+
+def _meta_content(index: _HtmlIndex, key: str, value: str) -> str | None:
+    """Content of the first <meta key="value"> with a non-empty content, truncated to 2048."""
+    for attrs in index.metas:
+        if attrs.get(key, "").strip().lower() == value:
+            content = attrs.get("content", "").strip()
+            if content:
+                return content[:2048]
+    return None
 
 
 def _normalize_image_url(raw: str) -> str:
@@ -120,62 +148,16 @@ def _normalize_image_url(raw: str) -> str:
     return s[:2048]
 
 
-def _extract_content_from_meta_tag(tag: str) -> str | None:
-    """Из атрибута content= в произвольном теге meta извлечь значение (кавычки любые)."""
-    m = re.search(r'\bcontent\s*=\s*"([^"]*)"', tag, re.IGNORECASE)
-    if m:
-        return m.group(1).strip()
-    m = re.search(r"\bcontent\s*=\s*'([^']*)'", tag, re.IGNORECASE)
-    if m:
-        return m.group(1).strip()
-    return None
-
-
-def _extract_all_og_images_fallback(html: str) -> list[str]:
-    """Грубый проход: все <meta ... >, в которых есть og:image — вытащить content= (Ozon, WB и др.)."""
-    urls: list[str] = []
-    # Разбиваем по <meta и берём кусок до следующего >
-    parts = re.split(r"<meta\s", html, flags=re.IGNORECASE)
-    for i, part in enumerate(parts):
-        if i == 0:
-            continue
-        end = part.find(">")
-        if end == -1:
-            continue
-        tag = part[:end]
-        if "og:image" not in tag.lower():
-            continue
-        raw = _extract_content_from_meta_tag(tag)
-        if raw:
-            u = _normalize_image_url(raw)
-            if u and u not in urls:
-                urls.append(u)
-    return urls
-
-
-def _extract_all_og_images(html: str) -> list[str]:
+def _extract_all_og_images(index: _HtmlIndex) -> list[str]:
     """Все og:image из страницы (несколько тегов — WB, Ozon). Возвращаем нормализованные URL."""
     urls: list[str] = []
-    seen: set[str] = set()
-    for pattern, content_group in (
-        (_OG_IMAGE_ALL, 3),
-        (_OG_IMAGE_ALL_ALT, 2),
-        (_OG_IMAGE_LOOSE_A, 2),
-        (_OG_IMAGE_LOOSE_B, 2),
-    ):
-        for m in pattern.finditer(html):
-            if m.lastindex >= content_group:
-                raw = (m.group(content_group) or "").strip()
-                if raw:
-                    u = _normalize_image_url(raw)
-                    if u and u not in seen:
-                        seen.add(u)
-                        urls.append(u)
-    if not urls:
-        for u in _extract_all_og_images_fallback(html):
-            if u not in seen:
-                seen.add(u)
-                urls.append(u)
+    for attrs in index.metas:
+        key = (attrs.get("property") or attrs.get("name") or "").strip().lower()
+        if key not in _IMAGE_PROPERTIES:
+            continue
+        u = _normalize_image_url(attrs.get("content", ""))
+        if u and u not in urls:
+            urls.append(u)
     return urls
 
 
@@ -189,102 +171,60 @@ def _best_image(urls: list[str]) -> str | None:
     return urls[0]
 
 
-def _extract_og(html: str, pattern: re.Pattern, alt_pattern: re.Pattern) -> str | None:
-    """Extract content from og meta; main pattern has content in group 3, alt in group 2."""
-    m = pattern.search(html)
-    if m and m.lastindex >= 3:
-        raw = (m.group(3) or "").strip()
-        return raw[:2048] if raw else None
-    m = alt_pattern.search(html)
-    if m and m.lastindex >= 2:
-        raw = (m.group(2) or "").strip()
-        return raw[:2048] if raw else None
-    return None
+def _extract_title(index: _HtmlIndex) -> str | None:
+    """og:title, else the <title> text."""
+    og = _meta_content(index, "property", "og:title")
+    if og:
+        return og
+    raw = (index.title or "").strip()
+    return unescape(raw)[:500] if raw else None
 
 
-def _extract_title_tag(html: str) -> str | None:
-    m = _TITLE_TAG.search(html)
-    if not m:
+def _parse_price(raw: str) -> Decimal | None:
+    cleaned = re.sub(r"[^\d.,]", "", raw.replace(",", "."))
+    if not cleaned:
         return None
-    raw = m.group(1).strip()
-    if not raw:
+    try:
+        return Decimal(cleaned)
+    except Exception:
         return None
-    from html import unescape
 
-    return unescape(raw)[:500]
-
-
-def _extract_price(html: str) -> Decimal | None:
-    for p in _PRICE_PATTERNS:
-        m = p.search(html)
-        if m:
-            raw = (m.group(3) or m.group(2) or "").strip()
-            if not raw:
-                continue
-            cleaned = re.sub(r"[^\d.,]", "", raw.replace(",", "."))
-            if not cleaned:
-                continue
-            try:
-                return Decimal(cleaned)
-            except Exception:
-                continue
-    return None
 
-
-def _extract_meta_name_description_fallback(html: str) -> str | None:
-    """Грубый проход: <meta> с name=description — вытащить content= (Ozon, WB)."""
-    parts = re.split(r"<meta\s", html, flags=re.IGNORECASE)
-    for i, part in enumerate(parts):
-        if i == 0:
-            continue
-        end = part.find(">")
-        if end == -1:
-            continue
-        tag = part[:end]
-        # name="description" или name='description' или data-hid и т.д.
-        if "description" not in tag.lower():
-            continue
-        # проверяем, что это именно name=description (а не og:description и т.д.)
-        if not re.search(r"\bname\s*=\s*([\"'])description\1", tag, re.IGNORECASE):
-            continue
-        raw = _extract_content_from_meta_tag(tag)
+def _extract_price(index: _HtmlIndex) -> Decimal | None:
+    """og:price:amount / product:price:amount / og:price, then itemprop=price, then <meta name=price>."""
+    candidates = [_meta_content(index, "property", p) for p in _PRICE_PROPERTIES]
+    candidates.append(index.itemprops.get("price"))
+    candidates.append(_meta_content(index, "name", "price"))
+    for raw in candidates:
         if raw:
-            return raw[:10000]
+            price = _parse_price(raw)
+            if price is not None:
+                return price
     return None
 
 
-def _extract_meta_name_description(html: str) -> str | None:
+def _extract_meta_name_description(index: _HtmlIndex) -> str | None:
     """<meta name="description" content="..."> (в т.ч. data-hid). Сначала после <title, иначе в любом месте."""
-    after_title = html
-    idx = html.lower().find("<title")
-    if idx != -1:
-        after_title = html[idx + len("<title") :]
-    for haystack in (after_title, html):
-        m = _META_NAME_DESCRIPTION.search(haystack)
-        if m and m.lastindex >= 2:
-            raw = (m.group(2) or "").strip()
-            if raw:
-                return raw[:10000]
-        m = _META_NAME_DESCRIPTION_ALT.search(haystack)
-        if m and m.lastindex >= 2:
-            raw = (m.group(2) or "").strip()
-            if raw:
-                return raw[:10000]
-    return _extract_meta_name_description_fallback(html)
+    after_title = index.metas[index.metas_before_title :]
+    for metas in (after_title, index.metas):
+        for attrs in metas:
+            if attrs.get("name", "").strip().lower() != "description":
+                continue
+            content = attrs.get("content", "").strip()
+            if content:
+                return content[:10000]
+    return None
 
 
 def _parse_html(html: str, product_url: str) -> ProductPreview:
     """Parse first MAX_BYTES of HTML into ProductPreview with preview_quality and missing_fields."""
-    title = _extract_og(html, _OG_TITLE, _OG_TITLE_ALT) or _extract_title_tag(html)
+    index = _index_html(html)
+    title = _extract_title(index)
     # Image: все og:image, // → https, предпочитаем полный https URL (товар, не лого)
-    all_images = _extract_all_og_images(html)
-    image_url = _best_image(all_images) if all_images else None
-    if not image_url:
-        raw = _extract_og(html, _OG_IMAGE, _OG_IMAGE_ALT)
-        image_url = _normalize_image_url(raw) if raw else None
-    # Description: ONLY <meta name="description"> and only after </title>
-    description = _extract_meta_name_description(html)
-    price = _extract_price(html)
+    image_url = _best_image(_extract_all_og_images(index))
+    # Description: ONLY <meta name="description">, preferably after <title>
+    description = _extract_meta_name_description(index)
+    price = _extract_price(index)
     has_title = bool(title)
     has_image = bool(image_url)
     has_description = bool(description)
@@ -315,9 +255,120 @@ def _parse_html(html: str, product_url: str) -> ProductPreview:
     )
 
 
-async def fetch_product_preview(product_url: str) -> ProductPreview:
+# Charset from <meta charset=...> or <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(rb"""<meta[^>]{0,200}?charset\s*=\s*["']?\s*([a-zA-Z0-9_\-]{1,40})""", re.IGNORECASE)
+# Browsers prescan the first 1024 bytes for the meta charset; so do we.
+_SNIFF_BYTES = 1024
+_HEAD_END = re.compile(r"</head", re.IGNORECASE)
+_HEAD_END_LEN = len("</head")
+# Without a price in the head, keep reading this much of the body for itemprop="price" microdata
+# (it sits in the product card near the top), instead of the whole MAX_BYTES page.
+_BODY_PEEK_CHARS = 64 * 1024
+
+
+def _lookup_charset(name: str | None) -> str | None:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+class _HeadCollector:
+    """
+    Incremental decoder for a streamed HTML response. Charset: Content-Type header, else BOM,
+    else <meta charset> in the first 1024 bytes, else UTF-8. feed() returns True once enough is read:
+    </head> seen and the price extractor finds a price in the head, _BODY_PEEK_CHARS read past
+    </head> (body microdata may carry the price), or the byte budget spent.
+    """
+
+    def __init__(self, header_charset: str | None, max_bytes: int) -> None:
+        self._charset = _lookup_charset(header_charset)
+        self._max_bytes = max_bytes
+        self._pending = b""  # bytes held back until the charset is known
+        self._decoder: codecs.IncrementalDecoder | None = None
+        self._parts: list[str] = []
+        self._length = 0
+        self._tail = ""  # last few chars, so a </head> split across chunks is still found
+        self._head_end: int | None = None  # offset of </head> in the decoded text
+        self._head_has_price = False
+        self.bytes_read = 0
+
+    def _start_decoder(self) -> None:
+        charset = self._charset
+        if charset is None:
+            if self._pending.startswith(codecs.BOM_UTF8):
+                charset = "utf-8-sig"
+            elif self._pending.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                charset = "utf-16"
+            else:
+                m = _META_CHARSET.search(self._pending[:_SNIFF_BYTES])
+                charset = _lookup_charset(m.group(1).decode("ascii")) if m else None
+        self._decoder = codecs.getincrementaldecoder(charset or "utf-8")(errors="replace")
+        pending, self._pending = self._pending, b""
+        self._append(self._decoder.decode(pending))
+
+    def _append(self, text: str) -> None:
+        if not text:
+            return
+        self._parts.append(text)
+        self._length += len(text)
+        if self._head_end is not None:
+            return
+        window = self._tail + text
+        m = _HEAD_END.search(window)
+        if m is not None:
+            self._head_end = self._length - len(window) + m.start()
+            head = "".join(self._parts)[: self._head_end]
+            self._head_has_price = _extract_price(_index_html(head)) is not None
+        self._tail = window[-(_HEAD_END_LEN - 1) :]
+
+    def _done(self) -> bool:
+        if self.bytes_read >= self._max_bytes:
+            return True
+        if self._head_end is None:
+            return False
+        return self._head_has_price or self._length - self._head_end >= _BODY_PEEK_CHARS
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk; True when the caller can stop reading."""
+        chunk = chunk[: self._max_bytes - self.bytes_read]
+        self.bytes_read += len(chunk)
+        if self._decoder is None:
+            self._pending += chunk
+            if len(self._pending) >= _SNIFF_BYTES or self.bytes_read >= self._max_bytes:
+                self._start_decoder()
+        else:
+            self._append(self._decoder.decode(chunk))
+        return self._done()
+
+    def text(self) -> str:
+        if self._decoder is None:
+            self._start_decoder()
+        self._append(self._decoder.decode(b"", final=True))
+        return "".join(self._parts)
+
+
+async def _fetch_text(client: httpx.AsyncClient, url: str) -> str:
+    """
+    Stream the page and stop as soon as enough of it is read (see _HeadCollector) or MAX_BYTES is;
+    closing the stream early drops the rest of the body instead of downloading it.
+    """
+    async with client.stream("GET", url, timeout=FETCH_TIMEOUT) as response:
+        response.raise_for_status()
+        collector = _HeadCollector(response.charset_encoding, MAX_BYTES)
+        async for chunk in response.aiter_bytes():
+            if collector.feed(chunk):
+                break
+    return collector.text()
+
+
+async def fetch_product_preview(product_url: str, client: httpx.AsyncClient | None = None) -> ProductPreview:
     """
     Fetch URL with httpx (async, timeout), parse og/title/price, return ProductPreview.
+    Pass the shared app client (app.state.http_client) to reuse pooled keep-alive connections;
+    without one, a one-off client is created and closed.
     On any error (timeout, non-2xx, decode, etc.) returns an empty ProductPreview (no exception).
     Does not block event loop.
     """
@@ -331,24 +382,29 @@ async def fetch_product_preview(product_url: str) -> ProductPreview:
             return empty
     except Exception:
         return empty
-    timeout = min(TIMEOUT, 6.0)  # не ждём дольше 6 сек
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=httpx.Timeout(timeout),
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
-            },
-        ) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            content = response.content
-            if len(content) > MAX_BYTES:
-                content = content[:MAX_BYTES]
-            text = content.decode("utf-8", errors="replace")
-            return _parse_html(text, url)
+        async with host_limiter.slot(parsed.hostname or parsed.netloc):
+            if client is not None:
+                text = await _fetch_text(client, url)
+            else:
+                async with create_http_client(FETCH_TIMEOUT) as own_client:
+                    text = await _fetch_text(own_client, url)
+        return await parse_pool.run(_parse_html, text, url, inline=len(text) < PARSE_INLINE_MAX_CHARS)
     except Exception as e:
         logger.info("product_parser_failed", extra={"url": url[:500], "error": str(e)})
         return ProductPreview(preview_quality="minimal", missing_fields=["title", "image_url", "description", "price"])
+
+
+async def get_product_preview(product_url: str, client: httpx.AsyncClient | None = None) -> ProductPreview:
+    """
+    fetch_product_preview behind the per-worker preview cache: URLs that differ only in tracking
+    params share an entry, failures are cached briefly, concurrent requests share one fetch.
+    product_url in a parsed result is always the caller's URL.
+    """
+    url = (product_url or "").strip()
+    if not url:
+        return await fetch_product_preview(url, client)
+    preview = await preview_cache.get_or_fetch(url, lambda: fetch_product_preview(url, client))
+    if preview.product_url is None or preview.product_url == url[:2048]:
+        return preview
+    return preview.model_copy(update={"product_url": url[:2048]})
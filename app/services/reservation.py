@@ -15,6 +15,7 @@ from app.models.reservation import Reservation
 from app.models.wish_item import WishItem
 from app.repositories.reservation import ReservationRepository
 from app.repositories.wish_item import WishItemRepository
+from app.repositories.wishlist import WishlistRepository
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,7 @@ class ReservationService:
         self._session = session
         self._item_repo = WishItemRepository(session)
         self._reservation_repo = ReservationRepository(session)
+        self._wishlist_repo = WishlistRepository(session)
 
     async def reserve(
         self, item_id: UUID, anonymous_session_id: str
@@ -50,6 +52,7 @@ class ReservationService:
             return existing, wishlist_id
         try:
             r = await self._reservation_repo.create(item_id, anonymous_session_id)
+            await self._wishlist_repo.bump_version(wishlist_id)
             logger.info(
                 "reservation_created",
                 extra={"item_id": str(item_id), "wishlist_id": str(wishlist_id), "reservation_id": str(r.id)},
@@ -69,5 +72,7 @@ class ReservationService:
         wishlist_id = item.wishlist_id if item else None
         ok = await self._reservation_repo.cancel(r.id, anonymous_session_id)
         if ok:
+            if wishlist_id:
+                await self._wishlist_repo.bump_version(wishlist_id)
             logger.info("reservation_cancelled", extra={"item_id": str(item_id), "wishlist_id": str(wishlist_id)})
         return ok, wishlist_id
\ No newline at end of file
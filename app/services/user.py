@@ -4,7 +4,7 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.repositories.user import UserRepository
 from app.schemas.user import UserCreate
 from app.models.user import User
@@ -26,8 +26,8 @@ class UserService:
         return await self._repo.get_by_email(email)
 
     async def register(self, payload: UserCreate) -> User:
-        """Register a new user. Caller must handle duplicate email."""
-        hashed = hash_password(payload.password)
+        """Register a new user. Caller must handle duplicate email. Raises PasswordHasherBusy if overloaded."""
+        hashed = await hash_password_async(payload.password)
         return await self._repo.create(email=payload.email, hashed_password=hashed)
 
     async def email_taken(self, email: str) -> bool:
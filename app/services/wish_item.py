@@ -23,7 +23,7 @@ class WishItemService:
         wishlist = await self._wishlist_repo.get_by_id_and_owner(payload.wishlist_id, owner_id)
         if not wishlist:
             return None
-        return await self._item_repo.create(
+        item = await self._item_repo.create(
             wishlist_id=payload.wishlist_id,
             title=payload.title,
             description=payload.description,
@@ -32,6 +32,8 @@ class WishItemService:
             target_price=payload.target_price,
             allow_group_contribution=payload.allow_group_contribution,
         )
+        await self._wishlist_repo.bump_version(payload.wishlist_id)
+        return item
 
     async def get_by_id_for_owner(self, item_id: UUID, owner_id: UUID) -> WishItem | None:
         """Get item by id if it belongs to a wishlist owned by owner (includes soft-deleted)."""
@@ -42,7 +44,7 @@ class WishItemService:
         item = await self._item_repo.get_by_id_for_owner(item_id, owner_id)
         if not item:
             return None
-        return await self._item_repo.update(
+        updated = await self._item_repo.update(
             item_id,
             title=payload.title,
             description=payload.description,
@@ -51,10 +53,17 @@ class WishItemService:
             target_price=payload.target_price,
             allow_group_contribution=payload.allow_group_contribution,
         )
+        if updated:
+            await self._wishlist_repo.bump_version(updated.wishlist_id)
+        return updated
 
-    async def soft_delete(self, item_id: UUID, owner_id: UUID) -> bool:
-        """Soft-delete item if user owns its wishlist. Returns True if deleted."""
+    async def soft_delete(self, item_id: UUID, owner_id: UUID) -> tuple[bool, UUID | None]:
+        """Soft-delete item if user owns its wishlist. Returns (True, wishlist_id) or (False, None)."""
         item = await self._item_repo.get_by_id_for_owner(item_id, owner_id)
         if not item:
-            return False
-        return await self._item_repo.soft_delete(item_id)
+            return False, None
+        wishlist_id = item.wishlist_id
+        if not await self._item_repo.soft_delete(item_id):
+            return False, None
+        await self._wishlist_repo.bump_version(wishlist_id)
+        return True, wishlist_id
@@ -1,20 +1,23 @@
 """Wishlist service: list, get, get by share token, create. Single place for public/owner DTOs."""
 
-from datetime import date
+from collections.abc import Sequence
+from datetime import date, datetime
 from decimal import Decimal
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.money import progress_percent
+from app.core.serialization import dumps
+from app.lib.etag import etag_matches, make_etag
+from app.lib.pagination import DEFAULT_PAGE_SIZE, ITEMS_PAGE_SIZE, decode_cursor, split_page
+from app.lib.wishlist_cache import public_wishlist_cache
+from app.models.wish_item import WishItem
 from app.models.wishlist import Wishlist
-from app.repositories.contribution import ContributionRepository
-from app.repositories.reservation import ReservationRepository
 from app.repositories.wishlist import WishlistRepository
 from app.schemas.wishlist import (
     WishlistCreate,
-    WishlistItemPublic,
-    WishlistItemResponse,
     WishlistPublicResponse,
     WishlistWithItemsResponse,
 )
@@ -24,11 +27,17 @@ class WishlistService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
         self._repo = WishlistRepository(session)
-        self._reservation_repo = ReservationRepository(session)
-        self._contribution_repo = ContributionRepository(session)
 
-    async def list_by_owner(self, owner_id: UUID) -> list[Wishlist]:
-        return await self._repo.list_by_owner(owner_id)
+    async def list_by_owner(
+        self, owner_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+    ) -> tuple[list[Wishlist], str | None]:
+        """
+        One page of the owner's wishlists (newest first) and the cursor of the next page, if any.
+        Raises ValueError if cursor is malformed.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows = await self._repo.list_by_owner(owner_id, limit + 1, after)
+        return split_page(rows, limit)
 
     async def get_by_id_for_owner(self, wishlist_id: UUID, owner_id: UUID) -> Wishlist | None:
         return await self._repo.get_by_id_and_owner(wishlist_id, owner_id)
@@ -45,88 +54,172 @@ class WishlistService:
             is_public=payload.is_public,
         )
 
+    async def get_public_view(
+        self, token: UUID, if_none_match: str | None = None
+    ) -> tuple[str, bytes | None] | None:
+        """
+        (etag, JSON body) for the public view; body is None when if_none_match already matches (304).
+        Returns None if not found or not public. Served from the versioned per-token cache when fresh;
+        otherwise the ETag comes from a header-only version lookup before any item is read.
+        """
+        view = await self._public_view(token, if_none_match)
+        return view[1:] if view else None
+
+    async def _public_view(
+        self, token: UUID, if_none_match: str | None
+    ) -> tuple[UUID, str, bytes | None] | None:
+        """get_public_view plus the wishlist_id the token opens."""
+        today = date.today()
+        cached = public_wishlist_cache.get_entry(token, today.toordinal())
+        if cached is not None:
+            wishlist_id, body, etag = cached
+            return wishlist_id, etag, (None if etag_matches(if_none_match, etag) else body)
+        read_stamp = public_wishlist_cache.stamp()
+        header = await self._repo.get_public_version(token)
+        if not header or not header[2]:
+            return None
+        wishlist_id, version, _ = header
+        etag = make_etag("p", wishlist_id.hex, version, today.toordinal())
+        if etag_matches(if_none_match, etag):
+            return wishlist_id, etag, None
+        payload = await self._build_public_payload(token, today)
+        if payload is None:
+            return None
+        body = dumps(payload)
+        public_wishlist_cache.put(token, payload["id"], body, etag, read_stamp, today.toordinal())
+        return wishlist_id, etag, body
+
     async def get_public_dto(self, token: UUID) -> WishlistPublicResponse | None:
-        """Build public wishlist DTO (no owner identity). O(1) query group: wishlist+items, sums, active reservations."""
-        w = await self._repo.get_by_share_token_with_items(token)
-        if not w or not w.is_public:
+        """Public wishlist DTO (no owner identity), or None if not found or not public."""
+        view = await self.get_public_view(token)
+        if not view or view[1] is None:
             return None
-        visible_items = [i for i in w.items if not i.is_deleted]
-        if not visible_items:
-            event_passed = w.event_date is not None and w.event_date < date.today()
-            return WishlistPublicResponse(
-                id=w.id,
-                share_token=w.share_token,
-                title=w.title,
-                description=w.description,
-                event_date=w.event_date,
-                is_public=w.is_public,
-                event_date_passed=event_passed,
-                items=[],
-            )
-        item_ids = [i.id for i in visible_items]
-        sums_map = await self._contribution_repo.get_sums_by_item_ids(item_ids)
-        active_ids = await self._reservation_repo.get_active_reservation_item_ids(item_ids)
-        items_out: list[WishlistItemPublic] = []
-        for item in visible_items:
-            total: Decimal = sums_map.get(item.id, Decimal("0"))
-            target: Decimal = item.target_price
-            pct_decimal = progress_percent(total, target)
-            items_out.append(
-                WishlistItemPublic(
-                    id=item.id,
-                    title=item.title,
-                    description=item.description,
-                    product_url=item.product_url,
-                    image_url=item.image_url,
-                    target_price=str(item.target_price),
-                    allow_group_contribution=item.allow_group_contribution,
-                    reserved=item.id in active_ids,
-                    contributed_total=str(total),
-                    contribution_progress_percent=float(pct_decimal),
-                )
-            )
-        event_passed = w.event_date is not None and w.event_date < date.today()
-        return WishlistPublicResponse(
-            id=w.id,
-            share_token=w.share_token,
-            title=w.title,
-            description=w.description,
-            event_date=w.event_date,
-            is_public=w.is_public,
-            event_date_passed=event_passed,
-            items=items_out,
-        )
+        return WishlistPublicResponse.model_validate_json(view[1])
+
+    async def get_public_snapshot(self, wishlist_id: UUID, token: UUID) -> bytes | None:
+        """Public view JSON for the WebSocket snapshot, only if token is the share token of wishlist_id."""
+        view = await self._public_view(token, None)
+        if not view or view[0] != wishlist_id:
+            return None
+        return view[2]
+
+    async def _build_public_payload(self, token: UUID, today: date | None = None) -> dict[str, Any] | None:
+        """Public wishlist payload (no owner identity) from one aggregated query (sums and reservation flags in SQL)."""
+        rows = await self._repo.get_public_view_rows(token)
+        if not rows or not rows[0].is_public:
+            return None
+        return public_payload(rows, today or date.today())
+
+    async def get_owner_view(
+        self,
+        wishlist_id: UUID,
+        owner_id: UUID,
+        if_none_match: str | None = None,
+        items_limit: int = ITEMS_PAGE_SIZE,
+        items_cursor: str | None = None,
+    ) -> tuple[str, bytes | None] | None:
+        """
+        (etag, JSON body) for one items page of the owner view; body is None on If-None-Match match.
+        None if not found or not owner. Raises ValueError if items_cursor is malformed.
+        """
+        items_after = decode_cursor(items_cursor) if items_cursor else None  # 400 before any 304
+        version = await self._repo.get_version_for_owner(wishlist_id, owner_id)
+        if version is None:
+            return None
+        etag = make_etag("o", wishlist_id.hex, version, items_limit, items_cursor or "")
+        if etag_matches(if_none_match, etag):
+            return etag, None
+        payload = await self._build_owner_payload(wishlist_id, owner_id, items_limit, items_after)
+        if payload is None:
+            return None
+        return etag, dumps(payload)
 
     async def get_with_items_for_owner(
-        self, wishlist_id: UUID, owner_id: UUID
+        self,
+        wishlist_id: UUID,
+        owner_id: UUID,
+        items_limit: int = ITEMS_PAGE_SIZE,
+        items_cursor: str | None = None,
     ) -> WishlistWithItemsResponse | None:
-        """Build wishlist-with-items DTO for owner. Returns None if not found or not owner."""
+        """Build wishlist-with-items DTO (one items page) for owner. Returns None if not found or not owner."""
+        items_after = decode_cursor(items_cursor) if items_cursor else None
+        payload = await self._build_owner_payload(wishlist_id, owner_id, items_limit, items_after)
+        return WishlistWithItemsResponse.model_validate(payload) if payload else None
+
+    async def _build_owner_payload(
+        self, wishlist_id: UUID, owner_id: UUID, items_limit: int, items_after: tuple[datetime, UUID] | None
+    ) -> dict[str, Any] | None:
         w = await self._repo.get_by_id_and_owner(wishlist_id, owner_id)
         if not w:
             return None
-        await self._session.refresh(w, ["items"])
-        items = [
-            WishlistItemResponse(
-                id=it.id,
-                wishlist_id=it.wishlist_id,
-                title=it.title,
-                description=it.description,
-                product_url=it.product_url,
-                image_url=it.image_url,
-                target_price=str(it.target_price),
-                allow_group_contribution=it.allow_group_contribution,
-                is_deleted=it.is_deleted,
-            )
-            for it in w.items
-        ]
-        return WishlistWithItemsResponse(
-            id=w.id,
-            owner_id=w.owner_id,
-            share_token=w.share_token,
-            title=w.title,
-            description=w.description,
-            event_date=w.event_date,
-            is_public=w.is_public,
-            created_at=w.created_at,
-            items=items,
+        rows = await self._repo.list_items_page(wishlist_id, items_limit + 1, items_after)
+        items, next_cursor = split_page(rows, items_limit)
+        return owner_payload(w, items, next_cursor)
+
+
+# Payload builders: trusted DB values -> plain dicts shaped exactly like the response models
+# (same keys, order and JSON types), encoded once with app.core.serialization.dumps. The models
+# stay the OpenAPI contract; hot paths skip building and re-validating them per request.
+
+
+def public_payload(rows: Sequence[Any], today: date) -> dict[str, Any]:
+    """WishlistPublicResponse-shaped dict from get_public_view_rows rows (first row carries the header)."""
+    head = rows[0]
+    items: list[dict[str, Any]] = []
+    for row in rows:
+        if row.item_id is None:
+            continue
+        total = Decimal(str(row.contributed_total))
+        items.append(
+            {
+                "id": row.item_id,
+                "title": row.item_title,
+                "description": row.item_description,
+                "product_url": row.product_url,
+                "image_url": row.image_url,
+                "target_price": str(row.target_price),
+                "allow_group_contribution": row.allow_group_contribution,
+                "reserved": bool(row.reserved),
+                "contributed_total": str(total),
+                "contribution_progress_percent": float(progress_percent(total, row.target_price)),
+            }
         )
+    return {
+        "title": head.wishlist_title,
+        "description": head.wishlist_description,
+        "event_date": head.event_date,
+        "is_public": head.is_public,
+        "id": head.wishlist_id,
+        "share_token": head.share_token,
+        "event_date_passed": head.event_date is not None and head.event_date < today,
+        "items": items,
+    }
+
+
+def owner_payload(w: Wishlist, items: Sequence[WishItem], items_next_cursor: str | None) -> dict[str, Any]:
+    """WishlistWithItemsResponse-shaped dict for the wishlist header and one page of its items."""
+    return {
+        "title": w.title,
+        "description": w.description,
+        "event_date": w.event_date,
+        "is_public": w.is_public,
+        "id": w.id,
+        "owner_id": w.owner_id,
+        "share_token": w.share_token,
+        "created_at": w.created_at,
+        "items": [
+            {
+                "id": it.id,
+                "wishlist_id": it.wishlist_id,
+                "title": it.title,
+                "description": it.description,
+                "product_url": it.product_url,
+                "image_url": it.image_url,
+                "target_price": str(it.target_price),
+                "allow_group_contribution": it.allow_group_contribution,
+                "is_deleted": it.is_deleted,
+            }
+            for it in items
+        ],
+        "items_next_cursor": items_next_cursor,
+    }
@@ -12,6 +12,7 @@ from app.websocket.events import (
     run_emit_item_updated,
     run_emit_reservation_cancelled,
     run_emit_reservation_created,
+    run_invalidate_wishlist,
 )
 
 __all__ = [
@@ -24,4 +25,5 @@ __all__ = [
     "run_emit_reservation_cancelled",
     "run_emit_contribution_added",
     "run_emit_item_updated",
+    "run_invalidate_wishlist",
 ]
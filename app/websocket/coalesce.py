@@ -0,0 +1,103 @@
+"""
+Optional per-room coalescing of WebSocket events (ws_coalesce_window_ms > 0).
+
+The first event for a room opens a window; everything emitted for that room until it closes goes
+out as one frame. Within a window, contribution_added and item_updated for the same item are
+merged (only the latest totals/title matter: they carry absolute values, not deltas); other events
+are kept in order. A window with one event sends it as-is; several are wrapped in a "batch" event
+whose payload.events lists them (clients unpack it).
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from app.core import metrics
+from app.websocket.manager import EVENT_BATCH, EVENT_CONTRIBUTION_ADDED, EVENT_ITEM_UPDATED
+
+logger = logging.getLogger(__name__)
+
+# Events whose newest payload supersedes older ones for the same item
+_LATEST_WINS = frozenset({EVENT_CONTRIBUTION_ADDED, EVENT_ITEM_UPDATED})
+
+Flush = Callable[[UUID, dict], Awaitable[None]]
+
+
+class EventCoalescer:
+    """Buffers events per room for window_seconds, then hands one message per room to flush."""
+
+    def __init__(self, window_seconds: float, flush: Flush) -> None:
+        self._window = window_seconds
+        self._flush = flush
+        # wishlist_id -> merge key -> message (dict keeps emission order)
+        self._pending: dict[UUID, dict[Any, dict]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._seq = 0  # unique keys for events that are never merged
+        self.events_in = 0
+        self.events_merged = 0
+        self.frames_out = 0
+
+    def add(self, wishlist_id: UUID, message: dict) -> None:
+        """Queue message for the room's current window (opening one if needed)."""
+        self.events_in += 1
+        pending = self._pending.get(wishlist_id)
+        if pending is None:
+            pending = self._pending[wishlist_id] = {}
+            task = asyncio.create_task(self._flush_after_window(wishlist_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        item_id = (message.get("payload") or {}).get("item_id")
+        if message.get("event") in _LATEST_WINS and item_id:
+            key: Any = (message["event"], item_id)
+            if pending.pop(key, None) is not None:
+                self.events_merged += 1
+        else:
+            self._seq += 1
+            key = self._seq
+        pending[key] = message
+
+    async def _flush_after_window(self, wishlist_id: UUID) -> None:
+        await asyncio.sleep(self._window)
+        await self._flush_room(wishlist_id)
+
+    async def _flush_room(self, wishlist_id: UUID) -> None:
+        pending = self._pending.pop(wishlist_id, None)
+        if not pending:
+            return
+        events = list(pending.values())
+        if len(events) == 1:
+            message = events[0]
+        else:
+            message = {"event": EVENT_BATCH, "wishlist_id": str(wishlist_id), "payload": {"events": events}}
+        self.frames_out += 1
+        try:
+            await self._flush(wishlist_id, message)
+        except Exception as e:
+            logger.warning("WS coalesced flush failed: %s", e)
+
+    async def aclose(self) -> None:
+        """Flush every open window now (shutdown)."""
+        for task in list(self._tasks):
+            task.cancel()
+        for wishlist_id in list(self._pending):
+            await self._flush_room(wishlist_id)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "window_ms": round(self._window * 1000),
+            "open_windows": len(self._pending),
+            "events_in": self.events_in,
+            "events_merged": self.events_merged,
+            "frames_out": self.frames_out,
+        }
+
+
+def create_coalescer(window_ms: int, flush: Flush) -> EventCoalescer | None:
+    """Coalescer for window_ms, or None when coalescing is disabled (0)."""
+    if window_ms <= 0:
+        return None
+    coalescer = EventCoalescer(window_ms / 1000, flush)
+    metrics.register("ws_coalescer", coalescer.stats)
+    return coalescer
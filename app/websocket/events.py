@@ -2,6 +2,8 @@
 Emit WebSocket events from the service layer (reservation, contribution, item updated).
 Use run_* async functions with FastAPI BackgroundTasks so broadcast runs after DB commit.
 Emit failures are logged and never crash the request.
+Every emit also invalidates the cached public wishlist view (this worker and, via Redis, the others).
+When app.state.ws_coalescer is set (ws_coalesce_window_ms > 0), events go through its per-room window.
 """
 
 import logging
@@ -13,7 +15,7 @@ from app.websocket.manager import (
     EVENT_RESERVATION_CANCELLED,
     EVENT_RESERVATION_CREATED,
 )
-from app.websocket.redis_broadcast import publish_event
+from app.websocket.redis_broadcast import make_message, publish_event, publish_invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -28,13 +30,24 @@ def _get_state(app: object) -> tuple:
     return redis_pub, ws_manager
 
 
+async def _emit(app: object, event: str, wishlist_id: UUID, payload: dict) -> None:
+    """Invalidate the cached view, then broadcast now or through the coalescing window."""
+    redis_pub, ws_manager = _get_state(app)
+    await publish_invalidation(redis_pub, wishlist_id)
+    if not ws_manager:
+        return
+    coalescer = getattr(getattr(app, "state", None), "ws_coalescer", None)
+    if coalescer is not None:
+        coalescer.add(wishlist_id, make_message(event, wishlist_id, payload))
+        return
+    subscriber = getattr(getattr(app, "state", None), "ws_subscriber", None)
+    await publish_event(redis_pub, ws_manager, event, wishlist_id, payload, subscriber)
+
+
 async def run_emit_reservation_created(app: object, wishlist_id: UUID, payload: dict) -> None:
     """Awaitable: broadcast reservation created. Use with BackgroundTasks.add_task after commit."""
     try:
-        redis_pub, ws_manager = _get_state(app)
-        if not ws_manager:
-            return
-        await publish_event(redis_pub, ws_manager, EVENT_RESERVATION_CREATED, wishlist_id, payload)
+        await _emit(app, EVENT_RESERVATION_CREATED, wishlist_id, payload)
     except Exception as e:
         logger.warning("emit_reservation_created_failed", extra={"wishlist_id": str(wishlist_id), "error": str(e)})
 
@@ -42,10 +55,7 @@ async def run_emit_reservation_created(app: object, wishlist_id: UUID, payload:
 async def run_emit_reservation_cancelled(app: object, wishlist_id: UUID, payload: dict) -> None:
     """Awaitable: broadcast reservation cancelled. Use with BackgroundTasks.add_task after commit."""
     try:
-        redis_pub, ws_manager = _get_state(app)
-        if not ws_manager:
-            return
-        await publish_event(redis_pub, ws_manager, EVENT_RESERVATION_CANCELLED, wishlist_id, payload)
+        await _emit(app, EVENT_RESERVATION_CANCELLED, wishlist_id, payload)
     except Exception as e:
         logger.warning("emit_reservation_cancelled_failed", extra={"wishlist_id": str(wishlist_id), "error": str(e)})
 
@@ -53,10 +63,7 @@ async def run_emit_reservation_cancelled(app: object, wishlist_id: UUID, payload
 async def run_emit_contribution_added(app: object, wishlist_id: UUID, payload: dict) -> None:
     """Awaitable: broadcast contribution added. Use with BackgroundTasks.add_task after commit."""
     try:
-        redis_pub, ws_manager = _get_state(app)
-        if not ws_manager:
-            return
-        await publish_event(redis_pub, ws_manager, EVENT_CONTRIBUTION_ADDED, wishlist_id, payload)
+        await _emit(app, EVENT_CONTRIBUTION_ADDED, wishlist_id, payload)
     except Exception as e:
         logger.warning("emit_contribution_added_failed", extra={"wishlist_id": str(wishlist_id), "error": str(e)})
 
@@ -64,9 +71,15 @@ async def run_emit_contribution_added(app: object, wishlist_id: UUID, payload: d
 async def run_emit_item_updated(app: object, wishlist_id: UUID, payload: dict) -> None:
     """Awaitable: broadcast item updated. Use with BackgroundTasks.add_task after commit."""
     try:
-        redis_pub, ws_manager = _get_state(app)
-        if not ws_manager:
-            return
-        await publish_event(redis_pub, ws_manager, EVENT_ITEM_UPDATED, wishlist_id, payload)
+        await _emit(app, EVENT_ITEM_UPDATED, wishlist_id, payload)
     except Exception as e:
         logger.warning("emit_item_updated_failed", extra={"wishlist_id": str(wishlist_id), "error": str(e)})
+
+
+async def run_invalidate_wishlist(app: object, wishlist_id: UUID) -> None:
+    """Awaitable: invalidate cached public view without a WS event (item create/delete). Use after commit."""
+    try:
+        redis_pub, _ = _get_state(app)
+        await publish_invalidation(redis_pub, wishlist_id)
+    except Exception as e:
+        logger.warning("invalidate_wishlist_failed", extra={"wishlist_id": str(wishlist_id), "error": str(e)})
@@ -0,0 +1,157 @@
+"""
+Per-room sequence numbers and a short ring buffer of recent frames (WebSocket resume).
+
+Every event frame sent to a room carries "seq": 1, 2, 3, ... for that room. A reconnecting client
+presents the last seq it applied; if every later frame is still in the buffer it receives just
+those, otherwise it gets a fresh snapshot (see the ws router).
+
+With Redis, one Lua script per event increments ws:{<room>}:seq, splices the seq into the frame,
+appends it to the capped list ws:{<room>}:log and publishes it on the room channel (with "ts",
+the publish time). Numbering, buffering and publishing are atomic, so every worker (the origin
+included) receives a room's frames in seq order from its subscriber, and resume works on whichever
+worker the client lands. The script returns the frame, so the publisher can deliver it to its own
+sockets itself while its subscriber is reconnecting.
+Without Redis the counters and buffers are in process (bounded number of rooms, LRU).
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any
+from uuid import UUID
+
+from app.core import metrics
+from app.core.config import get_settings
+
+try:
+    from redis.exceptions import NoScriptError
+except ImportError:  # pragma: no cover - redis is optional for single-worker setups
+    NoScriptError = None
+
+logger = logging.getLogger(__name__)
+_settings = get_settings()
+
+# KEYS: seq, log. ARGV: frame JSON without its leading "{", channel, log length, TTL seconds,
+# publish time (epoch seconds; subscribers measure delivery latency from it).
+_PUBLISH_LUA = """
+local seq = redis.call('INCR', KEYS[1])
+local frame = '{"seq":' .. seq .. ',"ts":' .. ARGV[5] .. ',' .. ARGV[1]
+redis.call('RPUSH', KEYS[2], frame)
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[3]), -1)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+redis.call('PUBLISH', ARGV[2], frame)
+return frame
+"""
+
+# KEYS: seq, log. Returns {current seq, {frames...}} in one consistent read.
+_READ_LUA = """
+return {tonumber(redis.call('GET', KEYS[1]) or '0'), redis.call('LRANGE', KEYS[2], 0, -1)}
+"""
+
+
+def with_seq(seq: int, text: str) -> str:
+    """Prefix "seq" into an encoded JSON object."""
+    return f'{{"seq":{seq},{text[1:]}'
+
+
+def frame_seq(frame: str) -> int:
+    """seq of a frame built by with_seq (or the Lua script), without decoding the JSON."""
+    return int(frame[7 : frame.index(",")])
+
+
+def frame_ts(frame: str) -> float | None:
+    """Publish time of a frame published through Redis ("ts" right after "seq"), else None."""
+    start = frame.index(",") + 1
+    if not frame.startswith('"ts":', start):
+        return None
+    return float(frame[start + 5 : frame.index(",", start)])
+
+
+def missed_frames(current: int, frames: list[str], last_seq: int) -> list[str] | None:
+    """Frames after last_seq if the buffer still covers them all, else None (client needs a snapshot)."""
+    if last_seq > current:
+        return None  # counter was reset (expired or evicted): the client's numbering is meaningless
+    if last_seq == current:
+        return []
+    missed = [frame for frame in frames if frame_seq(frame) > last_seq]
+    if not missed or frame_seq(missed[0]) != last_seq + 1:
+        return None
+    return missed
+
+
+def _keys(wishlist_id: UUID) -> tuple[str, str]:
+    prefix = f"ws:{{{wishlist_id}}}:"  # hash tag: both keys on one cluster slot
+    return prefix + "seq", prefix + "log"
+
+
+class RoomHistory:
+    """Sequencing and resume buffers for all rooms (Redis-backed when a client is passed)."""
+
+    def __init__(self, size: int, max_rooms: int, ttl_seconds: int) -> None:
+        self._size = max(1, size)
+        self._max_rooms = max(1, max_rooms)
+        self._ttl = ttl_seconds
+        # Local mode: wishlist_id -> (last seq, recent frames), LRU order
+        self._rooms: OrderedDict[UUID, tuple[int, deque[str]]] = OrderedDict()
+        self._shas = {script: hashlib.sha1(script.encode()).hexdigest() for script in (_PUBLISH_LUA, _READ_LUA)}
+        self.resumed = 0
+        self.snapshots = 0
+
+    async def publish(self, redis_client: Any, wishlist_id: UUID, text: str, channel: str) -> str:
+        """
+        Number, buffer and publish text on channel in one round trip; returns the published frame.
+        Raises on Redis errors.
+        """
+        keys = _keys(wishlist_id)
+        args = (text[1:], channel, self._size, self._ttl, f"{time.time():.3f}")
+        frame = await self._eval(redis_client, _PUBLISH_LUA, keys, args)
+        return frame.decode() if isinstance(frame, bytes) else frame
+
+    def record(self, wishlist_id: UUID, text: str) -> str:
+        """Local mode: number and buffer text; returns the frame to deliver."""
+        seq, frames = self._rooms.pop(wishlist_id, (0, None))
+        if frames is None:
+            frames = deque(maxlen=self._size)
+            while len(self._rooms) >= self._max_rooms:
+                self._rooms.popitem(last=False)
+        seq += 1
+        frame = with_seq(seq, text)
+        frames.append(frame)
+        self._rooms[wishlist_id] = (seq, frames)
+        return frame
+
+    async def read(self, redis_client: Any, wishlist_id: UUID) -> tuple[int, list[str]]:
+        """(current seq, buffered frames oldest first) for the room."""
+        if redis_client is None:
+            seq, frames = self._rooms.get(wishlist_id, (0, ()))
+            return seq, list(frames)
+        current, frames = await self._eval(redis_client, _READ_LUA, _keys(wishlist_id), ())
+        return int(current), list(frames)
+
+    async def _eval(self, redis_client: Any, script: str, keys: tuple[str, str], args: tuple[Any, ...]) -> Any:
+        sha = self._shas[script]
+        try:
+            return await redis_client.evalsha(sha, len(keys), *keys, *args)
+        except Exception as e:
+            if NoScriptError is None or not isinstance(e, NoScriptError):
+                raise
+            await redis_client.script_load(script)
+            return await redis_client.evalsha(sha, len(keys), *keys, *args)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self._size,
+            "local_rooms": len(self._rooms),
+            "resumed": self.resumed,
+            "snapshots": self.snapshots,
+        }
+
+
+room_history = RoomHistory(
+    size=_settings.ws_history_size,
+    max_rooms=_settings.ws_history_max_rooms,
+    ttl_seconds=_settings.ws_history_ttl_seconds,
+)
+metrics.register("ws_history", room_history.stats)
@@ -1,67 +1,215 @@
 """
 WebSocket manager: room per wishlist_id, subscribe on connect, broadcast to room.
-Non-blocking; supports multiple workers via Redis pub/sub.
+Non-blocking; supports multiple workers via Redis pub/sub (one channel per room, see
+redis_broadcast): room hooks tell the subscriber when a room opens or closes on this worker.
+
+Fan-out never awaits a socket: every connection has a bounded outbound queue drained by its own
+writer task, and broadcast encodes the message once and enqueues the same text for each socket.
+
+The room registry takes no lock. Each room's socket map is copy-on-write: connect and disconnect
+build a new map and swap it in with one assignment (nothing awaits in between, so on the event loop
+the swap is atomic), and broadcast iterates whichever map was current without copying it. Joins and
+leaves cost O(room size); broadcasts, far more frequent, cost nothing extra and never wait.
+A consumer whose queue is full is handled by the slow-consumer policy: "disconnect" closes it
+(the client reconnects and catches up), "drop_oldest" discards its oldest queued frame.
 """
 
 import asyncio
-import json
 import logging
+import heapq
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
+from typing import Any, Literal
 from uuid import UUID
 
 from fastapi import WebSocket
 
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.serialization import dumps
+
 logger = logging.getLogger(__name__)
+_settings = get_settings()
 
 # Event names for broadcast payloads
 EVENT_RESERVATION_CREATED = "reservation_created"
 EVENT_RESERVATION_CANCELLED = "reservation_cancelled"
 EVENT_CONTRIBUTION_ADDED = "contribution_added"
 EVENT_ITEM_UPDATED = "item_updated"
+# Several events in one frame (coalescing window): payload = {"events": [message, ...]}
+EVENT_BATCH = "batch"
+# Sent first on connect (see ws router): full public view at "seq", or "resync" when no token was given
+EVENT_SNAPSHOT = "snapshot"
+EVENT_RESYNC = "resync"
+
+# Close code for evicted slow consumers (RFC 6455 1013: try again later)
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+RoomHook = Callable[[UUID], None]
+SlowConsumerPolicy = Literal["disconnect", "drop_oldest"]
+
+
+class Connection:
+    """One socket: bounded queue of encoded frames plus the writer task that sends them in order."""
 
-# Redis channel for cross-worker broadcast
-WS_CHANNEL = "wishlist:ws_events"
+    def __init__(self, websocket: WebSocket, queue_size: int, start: bool = True) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+        self._writer: asyncio.Task[None] | None = None
+        if start:
+            self.start()
+
+    def start(self, initial: list[str] | tuple[str, ...] = ()) -> None:
+        """Start writing: the initial frames (snapshot/replay) first, then everything queued since connect."""
+        if self._writer is None and not self.closed:
+            self._writer = asyncio.create_task(self._write(initial))
+
+    async def _write(self, initial: list[str] | tuple[str, ...]) -> None:
+        try:
+            for text in initial:
+                await self.websocket.send_text(text)
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("WS send error: %s", e)
+            self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+        if self._writer is not None:
+            self._writer.cancel()
 
 
 class ConnectionManager:
     """In-process room per wishlist_id; subscribe on connect, broadcast to room."""
 
-    def __init__(self) -> None:
-        # wishlist_id -> set of WebSockets
-        self._rooms: dict[UUID, set[WebSocket]] = {}
-        self._lock = asyncio.Lock()
+    def __init__(self, queue_size: int | None = None, slow_consumer_policy: SlowConsumerPolicy | None = None) -> None:
+        # wishlist_id -> read-only {websocket: Connection}, replaced (never mutated) on join/leave
+        self._rooms: dict[UUID, Mapping[WebSocket, Connection]] = {}
+        self._connections = 0
+        self._on_room_opened: list[RoomHook] = []
+        self._on_room_closed: list[RoomHook] = []
+        self._queue_size = queue_size or _settings.ws_send_queue_size
+        self._policy = slow_consumer_policy or _settings.ws_slow_consumer_policy
+        self.frames_dropped = 0
+        self.slow_consumers_evicted = 0
+        metrics.register("websocket", self.stats)
 
-    async def connect(self, websocket: WebSocket, wishlist_id: UUID) -> None:
-        """Accept connection and add to room for wishlist_id."""
-        await websocket.accept()
-        async with self._lock:
-            if wishlist_id not in self._rooms:
-                self._rooms[wishlist_id] = set()
-            self._rooms[wishlist_id].add(websocket)
-        logger.debug("WS connect wishlist_id=%s total=%d", wishlist_id, len(self._rooms.get(wishlist_id, [])))
+    def add_room_hooks(self, opened: RoomHook, closed: RoomHook) -> None:
+        """Called (synchronously) when the first socket joins a room and when the last one leaves."""
+        self._on_room_opened.append(opened)
+        self._on_room_closed.append(closed)
 
-    async def disconnect(self, websocket: WebSocket, wishlist_id: UUID) -> None:
-        """Remove from room."""
-        async with self._lock:
-            s = self._rooms.get(wishlist_id)
-            if s:
-                s.discard(websocket)
-                if not s:
-                    del self._rooms[wishlist_id]
-
-    async def broadcast_to_room(self, wishlist_id: UUID, message: dict) -> None:
+    def rooms(self) -> list[UUID]:
+        """Rooms with at least one socket on this worker."""
+        return list(self._rooms)
+
+    def _notify(self, hooks: list[RoomHook], wishlist_id: UUID) -> None:
+        for hook in hooks:
+            try:
+                hook(wishlist_id)
+            except Exception as e:
+                logger.warning("WS room hook error: %s", e)
+
+    async def connect(self, websocket: WebSocket, wishlist_id: UUID, start: bool = True) -> Connection:
         """
-        Send message to all clients in the room. Non-blocking: each send is not awaited
-        so we don't block the caller; errors are logged.
+        Accept connection and add to room for wishlist_id. With start=False, frames broadcast from
+        now on are queued but not sent until the caller calls connection.start(initial).
         """
-        async with self._lock:
-            sockets = set(self._rooms.get(wishlist_id) or [])
-        if not sockets:
+        await websocket.accept()
+        connection = Connection(websocket, self._queue_size, start)
+        room = self._rooms.get(wishlist_id, {})
+        previous = room.get(websocket)
+        self._rooms[wishlist_id] = MappingProxyType({**room, websocket: connection})
+        if previous is not None:
+            previous.close()
+        else:
+            self._connections += 1
+        if not room:
+            self._notify(self._on_room_opened, wishlist_id)
+        logger.debug("WS connect wishlist_id=%s total=%d", wishlist_id, len(self._rooms[wishlist_id]))
+        return connection
+
+    async def disconnect(self, websocket: WebSocket, wishlist_id: UUID) -> None:
+        """Remove from room and stop its writer."""
+        room = self._rooms.get(wishlist_id)
+        if not room or websocket not in room:
             return
-        text = json.dumps(message, default=str)
-        async def send_one(ws: WebSocket) -> None:
+        connection = room[websocket]
+        closed = len(room) == 1
+        if closed:
+            del self._rooms[wishlist_id]
+        else:
+            self._rooms[wishlist_id] = MappingProxyType({ws: c for ws, c in room.items() if ws is not websocket})
+        self._connections -= 1
+        connection.close()
+        if closed:
+            self._notify(self._on_room_closed, wishlist_id)
+
+    def connection_count(self, wishlist_id: UUID) -> int:
+        """Sockets in the room on this worker (gauge)."""
+        return len(self._rooms.get(wishlist_id, ()))
+
+    def broadcast_to_room(self, wishlist_id: UUID, message: dict) -> int:
+        """Encode message once and enqueue it for every socket in the room. Returns sockets reached."""
+        if wishlist_id not in self._rooms:
+            return 0
+        return self.broadcast_text(wishlist_id, dumps(message).decode())
+
+    def broadcast_text(self, wishlist_id: UUID, text: str) -> int:
+        """Enqueue an already-encoded frame for every socket in the room; never waits on a socket."""
+        room = self._rooms.get(wishlist_id)
+        if not room:
+            return 0
+        reached = 0
+        for connection in room.values():  # immutable snapshot: no copy, joins/leaves swap in a new map
+            if self._enqueue(connection, text):
+                reached += 1
+        return reached
+
+    def _enqueue(self, connection: Connection, text: str) -> bool:
+        if connection.closed:
+            return False
+        try:
+            connection.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            pass
+        if self._policy == "drop_oldest":
+            connection.queue.get_nowait()
+            connection.queue.put_nowait(text)
+            self.frames_dropped += 1
+            return True
+        self._evict(connection)
+        return False
+
+    def _evict(self, connection: Connection) -> None:
+        """Stop writing to a slow consumer and close it; the endpoint's receive loop then disconnects it."""
+        self.slow_consumers_evicted += 1
+        connection.close()
+
+        async def close_socket() -> None:
             try:
-                await ws.send_text(text)
-            except Exception as e:
-                logger.warning("WS send error: %s", e)
+                await connection.websocket.close(code=WS_CLOSE_SLOW_CONSUMER)
+            except Exception:
+                pass
+
+        asyncio.create_task(close_socket())
 
-        await asyncio.gather(*[send_one(ws) for ws in sockets], return_exceptions=True)
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rooms": len(self._rooms),
+            "connections": self._connections,
+            "largest_rooms": {
+                str(wishlist_id): len(room)
+                for wishlist_id, room in heapq.nlargest(10, self._rooms.items(), key=lambda kv: len(kv[1]))
+            },
+            "queue_size": self._queue_size,
+            "slow_consumer_policy": self._policy,
+            "frames_dropped": self.frames_dropped,
+            "slow_consumers_evicted": self.slow_consumers_evicted,
+        }
@@ -1,65 +1,259 @@
 """
 Redis pub/sub for WebSocket broadcast across multiple workers.
-Publish from API; subscriber task in each worker broadcasts to local connections.
+
+One channel per room (wishlist:ws:<wishlist_id>). A worker subscribes to a room's channel when its
+first local socket joins and unsubscribes when the last one leaves, so it never decodes events for
+rooms it does not host. Event frames are numbered and published by one Lua call (see history), and
+every worker, the publisher included, forwards them from its subscriber to its sockets as-is
+(encoded once, by the publisher), so all sockets of a room see the same seq order. While this
+worker's subscriber is not connected, the publisher delivers its own frames to its sockets directly
+(other workers' frames are missed and show up as a seq gap).
+Cache/principal invalidation use fixed channels every worker subscribes to.
 """
 
 import asyncio
-import json
 import logging
+import random
+import time
+from collections.abc import Callable
+from typing import Any
 from uuid import UUID
 
-from app.websocket.manager import ConnectionManager, WS_CHANNEL
+from app.core import metrics
+from app.core.serialization import dumps
+from app.lib.principal_cache import PRINCIPAL_INVALIDATE_CHANNEL, principal_cache
+from app.lib.wishlist_cache import public_wishlist_cache
+from app.websocket.history import frame_ts, room_history
+from app.websocket.manager import ConnectionManager
 
 logger = logging.getLogger(__name__)
 
+# Redis channel for public wishlist cache invalidation (payload: wishlist_id string)
+CACHE_INVALIDATE_CHANNEL = "wishlist:cache_invalidate"
+# Per-room event channels: ROOM_CHANNEL_PREFIX + wishlist_id
+ROOM_CHANNEL_PREFIX = "wishlist:ws:"
+# Subscriber reconnect delay: doubles per failed attempt up to the max (then jittered down to half)
+_BACKOFF_INITIAL_SECONDS = 0.5
+_BACKOFF_MAX_SECONDS = 30.0
+# How long a new socket waits for its room's SUBSCRIBE to be confirmed before reading the room seq
+_SUBSCRIBE_WAIT_SECONDS = 2.0
+
+
+def room_channel(wishlist_id: UUID) -> str:
+    return f"{ROOM_CHANNEL_PREFIX}{wishlist_id}"
+
 
-def _make_message(event: str, wishlist_id: UUID, payload: dict) -> dict:
+def make_message(event: str, wishlist_id: UUID, payload: dict) -> dict:
     return {"event": event, "wishlist_id": str(wishlist_id), "payload": payload}
 
 
-async def run_subscriber(manager: ConnectionManager, redis_url: str) -> asyncio.Task[None]:
+def handle_message(manager: ConnectionManager, channel: str, data: str) -> None:
+    """Dispatch one pub/sub message (subscriber loop)."""
+    if channel == CACHE_INVALIDATE_CHANNEL:
+        try:
+            public_wishlist_cache.invalidate(UUID(data))
+        except ValueError:
+            logger.warning("Cache invalidation message with bad wishlist_id: %r", data)
+        return
+    if channel == PRINCIPAL_INVALIDATE_CHANNEL:
+        try:
+            principal_cache.invalidate(UUID(data))
+        except ValueError:
+            logger.warning("Principal invalidation message with bad user_id: %r", data)
+        return
+    if not channel.startswith(ROOM_CHANNEL_PREFIX):
+        return
+    try:
+        wishlist_id = UUID(channel[len(ROOM_CHANNEL_PREFIX) :])
+    except ValueError:
+        logger.warning("WS Redis message on bad channel: %r", channel)
+        return
+    # The data is the finished frame (seq included): forward it without decoding.
+    # broadcast_text only enqueues, so the listener never waits on a socket.
+    manager.broadcast_text(wishlist_id, data)
+
+
+class RedisSubscriber:
     """
-    Start a background task that subscribes to Redis and broadcasts to local rooms.
-    Returns the task so it can be cancelled on shutdown.
+    Background task: one pub/sub connection, read with the blocking message iterator (no polling),
+    forwarding messages through handle_message. When the connection drops it reconnects with
+    jittered exponential backoff and subscribes again to the fixed channels and every room hosted
+    here. Frames published while it was down are lost to this worker; clients notice the seq gap
+    and resume from the history buffer.
+
+    A room counts as subscribed only once Redis confirms the SUBSCRIBE (the reply arrives on the
+    listen() stream); wait_subscribed lets the first socket of a room wait for that before it
+    reads the room's seq, so no frame can fall between the two.
     """
-    try:
-        from redis.asyncio import Redis
-    except ImportError:
-        logger.warning("redis not installed; WebSocket broadcast will be single-worker only")
-        return asyncio.create_task(asyncio.sleep(999999))
 
-    async def listen() -> None:
-        r = Redis.from_url(redis_url, decode_responses=True)
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        connect: Callable[[], "redis.asyncio.Redis"],
+        backoff_initial_seconds: float = _BACKOFF_INITIAL_SECONDS,
+        backoff_max_seconds: float = _BACKOFF_MAX_SECONDS,
+    ) -> None:
+        self._manager = manager
+        self._connect = connect
+        self._backoff_initial = backoff_initial_seconds
+        self._backoff_max = backoff_max_seconds
+        self._task: asyncio.Task[None] | None = None
+        # Room joins/leaves only mark the subscription set dirty; one reconcile task per connection
+        # sends SUBSCRIBE/UNSUBSCRIBE serially, so interleaved joins and leaves cannot reorder commands.
+        self._rooms_changed = asyncio.Event()
+        # Rooms whose SUBSCRIBE Redis has confirmed on the current connection, and who waits for it
+        self._acked: set[UUID] = set()
+        self._ack_waiters: dict[UUID, list[asyncio.Future[None]]] = {}
+        manager.add_room_hooks(lambda _: self._rooms_changed.set(), lambda _: self._rooms_changed.set())
+        self.connected = False
+        self.reconnects = 0
+        self.messages = 0
+        self.last_error: str | None = None
+        self.delivery_latency = metrics.Histogram()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        backoff = self._backoff_initial
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                logger.warning("WS Redis subscriber disconnected, retrying in %.1fs: %s", backoff, e)
+            if self.connected:
+                backoff = self._backoff_initial  # it was up: start the next outage from scratch
+            self.connected = False
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, self._backoff_max)
+            self.reconnects += 1
+
+    async def _listen(self) -> None:
+        client = self._connect()
+        pubsub = client.pubsub()
+        reconcile_task = None
         try:
-            pubsub = r.pubsub()
-            await pubsub.subscribe(WS_CHANNEL)
-            while True:
-                msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                if msg is None:
-                    continue
-                if msg.get("type") != "message":
-                    continue
-                data = msg.get("data")
-                if not data:
-                    continue
-                try:
-                    obj = json.loads(data)
-                    wid = obj.get("wishlist_id")
-                    if not wid:
-                        continue
-                    wishlist_id = UUID(wid)
-                    # Broadcast in background so we don't block the listener
-                    asyncio.create_task(manager.broadcast_to_room(wishlist_id, obj))
-                except (json.JSONDecodeError, ValueError, TypeError) as e:
-                    logger.warning("WS Redis message parse error: %s", e)
-        except asyncio.CancelledError:
-            pass
+            subscribed = set(self._manager.rooms())
+            await pubsub.subscribe(
+                CACHE_INVALIDATE_CHANNEL, PRINCIPAL_INVALIDATE_CHANNEL, *(room_channel(w) for w in subscribed)
+            )
+            self.connected = True
+            self.last_error = None
+            reconcile_task = asyncio.create_task(self._reconcile(pubsub, subscribed))
+            async for msg in pubsub.listen():
+                kind = msg.get("type")
+                if kind == "subscribe":
+                    self._on_subscribed(msg.get("channel") or "")
+                elif kind == "message" and msg.get("data"):
+                    self._dispatch(msg.get("channel") or "", msg["data"])
+            raise ConnectionError("pub/sub stream ended")
         finally:
-            await pubsub.unsubscribe(WS_CHANNEL)
-            await r.aclose()
+            self._acked.clear()
+            if reconcile_task is not None:
+                reconcile_task.cancel()
+            try:
+                await pubsub.aclose()
+                await client.aclose()
+            except Exception:
+                pass
+
+    def _on_subscribed(self, channel: str) -> None:
+        if not channel.startswith(ROOM_CHANNEL_PREFIX):
+            return
+        try:
+            wishlist_id = UUID(channel[len(ROOM_CHANNEL_PREFIX) :])
+        except ValueError:
+            return
+        self._acked.add(wishlist_id)
+        for waiter in self._ack_waiters.pop(wishlist_id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
 
-    task = asyncio.create_task(listen())
-    return task
+    async def wait_subscribed(self, wishlist_id: UUID, timeout: float = _SUBSCRIBE_WAIT_SECONDS) -> bool:
+        """
+        Wait until Redis has confirmed this worker's subscription to the room. False on timeout or
+        while disconnected (the caller goes on; a missed frame then shows up as a seq gap).
+        """
+        if wishlist_id in self._acked:
+            return True
+        if not self.connected:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._ack_waiters.setdefault(wishlist_id, []).append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = self._ack_waiters.get(wishlist_id)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._ack_waiters[wishlist_id]
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        self.messages += 1
+        handle_message(self._manager, channel, data)
+        if channel.startswith(ROOM_CHANNEL_PREFIX):
+            published_at = frame_ts(data)
+            if published_at is not None:
+                self.delivery_latency.observe(max(0.0, time.time() - published_at))
+
+    async def _reconcile(self, pubsub: "redis.asyncio.client.PubSub", subscribed: set[UUID]) -> None:
+        while True:
+            await self._rooms_changed.wait()
+            self._rooms_changed.clear()
+            wanted = set(self._manager.rooms())
+            try:
+                if wanted - subscribed:
+                    await pubsub.subscribe(*(room_channel(w) for w in wanted - subscribed))
+                if subscribed - wanted:
+                    self._acked.difference_update(subscribed - wanted)
+                    await pubsub.unsubscribe(*(room_channel(w) for w in subscribed - wanted))
+                subscribed = wanted
+            except Exception as e:
+                logger.warning("WS Redis room subscription error: %s", e)
+
+    def health(self) -> str:
+        return "connected" if self.connected else "reconnecting"
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "status": self.health(),
+            "reconnects": self.reconnects,
+            "messages": self.messages,
+            "last_error": self.last_error,
+            "delivery_latency_seconds": self.delivery_latency.stats(),
+        }
+
+
+def run_subscriber(manager: ConnectionManager, redis_url: str) -> RedisSubscriber | None:
+    """
+    Start the subscriber that broadcasts other workers' events to local rooms (None without redis).
+    Call aclose() on shutdown.
+    """
+    try:
+        from redis.asyncio import Redis
+    except ImportError:
+        logger.warning("redis not installed; WebSocket broadcast will be single-worker only")
+        return None
+    subscriber = RedisSubscriber(manager, lambda: Redis.from_url(redis_url, decode_responses=True))
+    metrics.register("ws_subscriber", subscriber.stats)
+    subscriber.start()
+    return subscriber
 
 
 async def publish_event(
@@ -68,23 +262,53 @@ async def publish_event(
     event: str,
     wishlist_id: UUID,
     payload: dict,
+    subscriber: RedisSubscriber | None = None,
 ) -> None:
     """
-    Publish event to Redis (so all workers broadcast) and, if no Redis, broadcast locally.
-    Failures are logged; never raise (guard when redis/pubsub unavailable or broadcast fails).
+    Number the event and deliver it to the room on every worker: via the room's Redis channel when
+    Redis is configured (this worker's sockets through subscriber), else straight to this worker's
+    sockets. Failures are logged; never raise.
     """
-    message = _make_message(event, wishlist_id, payload)
+    message = make_message(event, wishlist_id, payload)
+    await publish_message(redis_client, manager, wishlist_id, message, subscriber)
+
+
+async def publish_message(
+    redis_client: "redis.asyncio.Redis | None",
+    manager: ConnectionManager,
+    wishlist_id: UUID,
+    message: dict,
+    subscriber: RedisSubscriber | None = None,
+) -> None:
+    """publish_event for a ready message (single event or coalesced batch)."""
+    text = dumps(message).decode()
     if redis_client:
+        live = subscriber is not None and subscriber.health() == "connected"
         try:
-            await redis_client.publish(WS_CHANNEL, json.dumps(message, default=str))
+            text = await room_history.publish(redis_client, wishlist_id, text, room_channel(wishlist_id))
+            if live and subscriber.health() == "connected":
+                return  # this worker's sockets get it from the subscriber, in seq order
+            # Subscriber down (or reconnected meanwhile): deliver our own frame here. A duplicate,
+            # should the subscriber also get it, carries the same seq and is dropped by the client.
         except Exception as e:
-            logger.warning("WS Redis publish error: %s", e)
-            try:
-                await manager.broadcast_to_room(wishlist_id, message)
-            except Exception as e2:
-                logger.warning("WS local broadcast fallback failed: %s", e2)
+            # Unsequenced local delivery: clients apply it; resume after this falls back to a snapshot.
+            logger.warning("WS Redis publish error, delivering to this worker only: %s", e)
     else:
+        text = room_history.record(wishlist_id, text)
+    try:
+        manager.broadcast_text(wishlist_id, text)
+    except Exception as e:
+        logger.warning("WS local broadcast failed: %s", e)
+
+
+async def publish_invalidation(redis_client: "redis.asyncio.Redis | None", wishlist_id: UUID) -> None:
+    """
+    Invalidate the cached public view for wishlist_id in this worker, then tell other workers via Redis.
+    Call after the mutation is committed. Failures are logged; never raise.
+    """
+    public_wishlist_cache.invalidate(wishlist_id)
+    if redis_client:
         try:
-            await manager.broadcast_to_room(wishlist_id, message)
+            await redis_client.publish(CACHE_INVALIDATE_CHANNEL, str(wishlist_id))
         except Exception as e:
-            logger.warning("WS broadcast failed (no Redis): %s", e)
+            logger.warning("Cache invalidation publish error: %s", e)
@@ -0,0 +1,158 @@
+"""
+Product parser throughput, latency and memory over the benchmark corpus (benchmarks/parser_corpus.py).
+
+  python -m benchmarks.bench_product_parser [--repeat 50] [--rounds 5] [--check] [--update-baseline] [--tolerance 0.5]
+
+Per document: MB/s (size / mean time), p50/p99 seconds per parse and peak traced memory of one
+_parse_html call. Realistic documents are checked against their expected fields first, so a fast
+but wrong parser does not pass.
+
+Baselines (benchmarks/baselines/product_parser.json) store p50 as a multiple of a fixed
+pure-Python calibration loop, which keeps them comparable across machines of different speed.
+Timing runs in --rounds rounds; each round calibrates and then measures every document, and the
+ratio used is the median over rounds, so a burst of load on a shared machine skews one round
+rather than the result. --check exits 1 if any document's normalized p50 or peak memory exceeds
+its baseline by more than --tolerance (default 50%).
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from app.services.product_parser import _parse_html
+from benchmarks.parser_corpus import Document, all_documents
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "product_parser.json"
+URL = "https://shop.example/product/1"
+
+
+def calibrate(samples: int = 7) -> float:
+    """Median seconds for a fixed string/dict workload (roughly what parsing does)."""
+    times = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        d: dict[str, int] = {}
+        for i in range(200_000):
+            key = "k" + str(i % 512)
+            d[key] = d.get(key, 0) + len(key.lower())
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def check_expected(doc: Document) -> None:
+    preview = _parse_html(doc.html, URL)
+    for name, want in doc.expected.items():
+        got = getattr(preview, name)
+        if name == "price":
+            want = Decimal(want)
+        if got != want:
+            raise AssertionError(f"{doc.name}: {name} = {got!r}, expected {want!r}")
+
+
+def _time_parses(doc: Document, repeat: int) -> list[float]:
+    _parse_html(doc.html, URL)  # warm-up (regex compile caches, allocator)
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        _parse_html(doc.html, URL)
+        times.append(time.perf_counter() - t0)
+    return sorted(times)
+
+
+def measure(doc: Document, repeat: int) -> dict[str, Any]:
+    times = _time_parses(doc, repeat)
+    tracemalloc.start()
+    try:
+        _parse_html(doc.html, URL)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "bytes": doc.size_bytes,
+        "mb_per_s": doc.size_bytes / statistics.fmean(times) / 1e6,
+        "p50": times[len(times) // 2],
+        "p99": times[min(len(times) - 1, int(len(times) * 0.99))],
+        "peak_kb": peak / 1024,
+    }
+
+
+def p50_ratios(docs: list[Document], repeat: int, rounds: int) -> dict[str, float]:
+    """Per document: median over rounds of (p50 parse time / that round's calibration)."""
+    per_round: dict[str, list[float]] = {doc.name: [] for doc in docs}
+    for _ in range(rounds):
+        calibration = calibrate()
+        for doc in docs:
+            times = _time_parses(doc, repeat)
+            per_round[doc.name].append(times[len(times) // 2] / calibration)
+    return {name: statistics.median(ratios) for name, ratios in per_round.items()}
+
+
+def compare(results: dict[str, dict[str, Any]], ratios: dict[str, float], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get("documents", {}).get(name)
+        if base is None:
+            continue
+        ratio = ratios[name]
+        if ratio > base["p50_ratio"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {ratio:.3f}x calibration vs baseline {base['p50_ratio']:.3f}x")
+        if r["peak_kb"] > base["peak_kb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak {r['peak_kb']:.0f}KB vs baseline {base['peak_kb']:.0f}KB")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5, help="calibrate+measure rounds; ratios are their median")
+    parser.add_argument("--check", action="store_true", help="exit 1 if slower/bigger than the stored baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    docs = all_documents()
+    for doc in docs:
+        check_expected(doc)
+    calibration = calibrate()
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+    print(f"calibration: {calibration * 1e3:.1f} ms")
+    ratios = p50_ratios(docs, args.repeat, max(1, args.rounds))
+    print(f"{'document':<20} {'KB':>6} {'MB/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'peak KB':>8} {'vs base':>8}")
+    results: dict[str, dict[str, Any]] = {}
+    for doc in docs:
+        r = results[doc.name] = measure(doc, args.repeat)
+        base = baseline.get("documents", {}).get(doc.name)
+        delta = f"{ratios[doc.name] / base['p50_ratio']:.2f}x" if base else "-"
+        print(
+            f"{doc.name:<20} {r['bytes'] / 1024:>6.0f} {r['mb_per_s']:>7.1f} {r['p50'] * 1e3:>8.3f}"
+            f" {r['p99'] * 1e3:>8.3f} {r['peak_kb']:>8.0f} {delta:>8}"
+        )
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        data = {
+            "documents": {
+                name: {"p50_ratio": round(ratios[name], 6), "peak_kb": round(r["peak_kb"])}
+                for name, r in results.items()
+            }
+        }
+        BASELINE_PATH.write_text(json.dumps(data, indent=2) + "\n")
+        print(f"baseline written to {BASELINE_PATH}")
+    if args.check:
+        regressions = compare(results, ratios, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
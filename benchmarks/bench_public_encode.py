@@ -0,0 +1,124 @@
+"""
+Per-item encode cost of the public wishlist view: Pydantic path vs pre-encoded fast path.
+
+  python -m benchmarks.bench_public_encode [--items 10 100 1000] [--repeat 200]
+
+"before" is what the endpoint used to do per request: build WishlistItemPublic/WishlistPublicResponse,
+re-validate through response_model (FastAPI's serialize_response), then encode with stdlib json.
+"after" is the current path: rows -> dict (public_payload) -> app.core.serialization.dumps.
+No database: rows are synthetic but shaped exactly like get_public_view_rows output.
+"""
+
+import argparse
+import json
+import time
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.money import progress_percent
+from app.core.serialization import dumps, orjson
+from app.schemas.wishlist import WishlistItemPublic, WishlistPublicResponse
+from app.services.wishlist import public_payload
+
+
+def make_rows(n: int) -> list[SimpleNamespace]:
+    head = dict(
+        wishlist_id=uuid4(),
+        share_token=uuid4(),
+        wishlist_title="Birthday",
+        wishlist_description="Things I would like",
+        event_date=date(2030, 1, 1),
+        is_public=True,
+    )
+    return [
+        SimpleNamespace(
+            **head,
+            item_id=uuid4(),
+            item_title=f"Item {i} with a reasonably descriptive title",
+            item_description="A short description of the product " * 2,
+            product_url=f"https://shop.example.com/products/{i}",
+            image_url=f"https://cdn.example.com/img/{i}.jpg",
+            target_price=Decimal("129.99"),
+            allow_group_contribution=i % 2 == 0,
+            contributed_total=Decimal(i % 100),
+            reserved=i % 3 == 0,
+        )
+        for i in range(n)
+    ]
+
+
+_response_adapter = TypeAdapter(WishlistPublicResponse)
+
+
+def encode_before(rows: list[SimpleNamespace]) -> bytes:
+    head = rows[0]
+    items = []
+    for row in rows:
+        total = Decimal(str(row.contributed_total))
+        items.append(
+            WishlistItemPublic(
+                id=row.item_id,
+                title=row.item_title,
+                description=row.item_description,
+                product_url=row.product_url,
+                image_url=row.image_url,
+                target_price=str(row.target_price),
+                allow_group_contribution=row.allow_group_contribution,
+                reserved=bool(row.reserved),
+                contributed_total=str(total),
+                contribution_progress_percent=float(progress_percent(total, row.target_price)),
+            )
+        )
+    dto = WishlistPublicResponse(
+        id=head.wishlist_id,
+        share_token=head.share_token,
+        title=head.wishlist_title,
+        description=head.wishlist_description,
+        event_date=head.event_date,
+        is_public=head.is_public,
+        event_date_passed=False,
+        items=items,
+    )
+    # response_model: validate the returned object again, then jsonable_encoder + JSONResponse.render
+    validated = _response_adapter.validate_python(dto, from_attributes=True)
+    content = jsonable_encoder(_response_adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_after(rows: list[SimpleNamespace]) -> bytes:
+    return dumps(public_payload(rows, date.today()))
+
+
+def bench(fn, rows, repeat: int) -> float:
+    """Best-of-repeat seconds per call (min filters scheduler noise)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson is not None else 'stdlib json'}")
+    print(f"{'items':>6} {'before us/item':>15} {'after us/item':>14} {'speedup':>8}")
+    for n in args.items:
+        rows = make_rows(n)
+        assert json.loads(encode_before(rows)) == json.loads(encode_after(rows))
+        before = bench(encode_before, rows, args.repeat)
+        after = bench(encode_after, rows, args.repeat)
+        print(f"{n:>6} {before / n * 1e6:>15.2f} {after / n * 1e6:>14.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Documents for product parser benchmarks and regression tests.
+
+Realistic pages are checked in under benchmarks/corpus/ (anonymized marketplace cards at ~2KB,
+~55KB and ~220KB) with the fields the parser must extract in manifest.json. Pathological inputs
+are generated (deterministic, up to the 512KB fetch cap) rather than stored: they are what a
+hostile or broken page can make the regex/tokenizer do, not what marketplaces serve.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+MAX_DOC_CHARS = 512 * 1024
+
+
+@dataclass(frozen=True)
+class Document:
+    name: str
+    html: str
+    expected: dict[str, Any] = field(default_factory=dict)  # empty for pathological inputs
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.html.encode("utf-8"))
+
+
+def realistic() -> list[Document]:
+    manifest = json.loads((CORPUS_DIR / "manifest.json").read_text(encoding="utf-8"))
+    return [
+        Document(name.removesuffix(".html"), (CORPUS_DIR / name).read_text(encoding="utf-8"), entry["expected"])
+        for name, entry in manifest.items()
+    ]
+
+
+def _fill(unit: str, prefix: str = "") -> str:
+    return prefix + unit * ((MAX_DOC_CHARS - len(prefix)) // len(unit))
+
+
+def pathological() -> list[Document]:
+    return [
+        # A tag that never closes: attribute scanning must not retry from every position.
+        Document("no_gt_512k", _fill("a", "<html><head><meta content=x ")),
+        # Thousands of real metas before the interesting ones (tracking/experiment tags).
+        Document(
+            "meta_flood",
+            _fill('<meta name="x-exp" content="variant-1">\n', "<html><head>")[: MAX_DOC_CHARS - 200]
+            + '<meta property="og:title" content="Last"></head>',
+        ),
+        # Quote opened and never closed: everything after it is one attribute value.
+        Document("unclosed_quotes", _fill("a b c ", '<html><head><meta property="og:title" content="')),
+        # Almost-tags everywhere.
+        Document("lt_soup", _fill("<a <meta <title ", "<html><head>")),
+    ]
+
+
+def all_documents() -> list[Document]:
+    return realistic() + pathological()
@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect } from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { useRouter } from "next/navigation";
 import Link from "next/link";
 import { api } from "@/lib/api";
@@ -17,11 +17,15 @@ export default function DashboardPage() {
   useEffect(() => {
     fetchUser();
   }, [fetchUser]);
-  const { data: wishlists = [], isLoading, isError, error, refetch } = useQuery({
+  const { data, isLoading, isError, error, refetch, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ["wishlists"],
-    queryFn: () => api.get<Wishlist[]>("/wishlists/"),
+    queryFn: ({ pageParam }) =>
+      api.getPage<Wishlist[]>(pageParam ? `/wishlists/?cursor=${encodeURIComponent(pageParam)}` : "/wishlists/"),
+    initialPageParam: null as string | null,
+    getNextPageParam: (last) => last.nextCursor,
     retry: 1,
   });
+  const wishlists = data?.pages.flatMap((p) => p.data) ?? [];
 
   if (isError) {
     const is401 = error instanceof Error && (error.message.includes("401") || error.message.includes("Unauthorized"));
@@ -109,6 +113,13 @@ export default function DashboardPage() {
               </li>
             ))}
           </ul>
+          {hasNextPage && (
+            <div className="mt-4 text-center">
+              <Button variant="secondary" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+                {isFetchingNextPage ? "Loading…" : "Load more"}
+              </Button>
+            </div>
+          )}
         </>
       )}
     </div>
@@ -50,6 +50,14 @@ export default function PublicWishlistPage() {
   );
 
   useWishlistWebSocket(wishlist?.id ?? null, useCallback((msg) => {
+    if (msg.event === "snapshot" && msg.payload) {
+      queryClient.setQueryData(["public-wishlist", token], msg.payload as WishlistPublic);
+      return;
+    }
+    if (msg.event === "resync") {
+      queryClient.invalidateQueries({ queryKey: ["public-wishlist", token] });
+      return;
+    }
     const pl = msg.payload as Record<string, unknown>;
     if (msg.event === "contribution_added" && pl?.item_id) {
       updateCacheFromWs({
@@ -65,7 +73,7 @@ export default function PublicWishlistPage() {
     if (msg.event === "item_updated") {
       queryClient.invalidateQueries({ queryKey: ["public-wishlist", token] });
     }
-  }, [queryClient, token, updateCacheFromWs]));
+  }, [queryClient, token, updateCacheFromWs]), token);
 
   async function handleReserve(itemId: string) {
     if (reservingItemId) return;
@@ -1,7 +1,7 @@
 "use client";
 
 import { useState } from "react";
-import { useQuery, useQueryClient } from "@tanstack/react-query";
+import { useInfiniteQuery, useQueryClient } from "@tanstack/react-query";
 import { useParams, useRouter, useSearchParams } from "next/navigation";
 import Link from "next/link";
 import { api } from "@/lib/api";
@@ -21,14 +21,20 @@ export default function EditWishlistPage() {
   const showAdd = searchParams.get("add") === "1";
   const [selectedItem, setSelectedItem] = useState<WishItem | null>(null);
 
-  const { data: wishlist, isLoading, isError, error, refetch } = useQuery({
+  const { data, isLoading, isError, error, refetch, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ["wishlist", id],
-    queryFn: () => api.get<WishlistWithItems>(`/wishlists/${id}`),
+    queryFn: ({ pageParam }) =>
+      api.get<WishlistWithItems>(
+        pageParam ? `/wishlists/${id}?items_cursor=${encodeURIComponent(pageParam)}` : `/wishlists/${id}`
+      ),
+    initialPageParam: null as string | null,
+    getNextPageParam: (last) => last.items_next_cursor,
     enabled: !!id && id !== "new",
   });
+  const wishlist = data?.pages[0];
 
   // Owner view: API returns items without contributor identities (reserved/contributed_total not exposed to owner).
-  const items = wishlist?.items?.filter((i) => !i.is_deleted) ?? [];
+  const items = data?.pages.flatMap((p) => p.items).filter((i) => !i.is_deleted) ?? [];
 
   async function handleDeleteItem(itemId: string) {
     try {
@@ -150,6 +156,13 @@ export default function EditWishlistPage() {
             ))}
           </ul>
         ) : null}
+        {!showAdd && hasNextPage && (
+          <div className="mt-4 text-center">
+            <Button variant="secondary" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+              {isFetchingNextPage ? "Loading…" : "Load more items"}
+            </Button>
+          </div>
+        )}
         {selectedItem && (
           <ItemDetailModal
             item={selectedItem}
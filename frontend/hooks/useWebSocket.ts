@@ -17,12 +17,21 @@ function getWsBase(): string {
   return "";
 }
 
+type WsMessage = { event: string; wishlist_id: string; payload: unknown; seq?: number };
+
+/**
+ * Room updates for a wishlist. Frames carry a per-room seq: the first one is a "snapshot" (when
+ * shareToken is given) or "resync" (refetch), or, on reconnect, just the frames missed since the
+ * last applied seq. Duplicates are skipped; a gap in seq reconnects to fetch what was missed.
+ */
 export function useWishlistWebSocket(
   wishlistId: string | null,
-  onMessage: (data: { event: string; wishlist_id: string; payload: unknown }) => void
+  onMessage: (data: WsMessage) => void,
+  shareToken?: string
 ) {
   const wsRef = useRef<WebSocket | null>(null);
   const onMessageRef = useRef(onMessage);
+  const lastSeqRef = useRef<number | null>(null);
   const reconnectAttemptRef = useRef(0);
   const reconnectTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   onMessageRef.current = onMessage;
@@ -30,13 +39,34 @@ export function useWishlistWebSocket(
   const connect = useCallback(() => {
     const base = getWsBase();
     if (!wishlistId || !base) return;
-    const url = `${base}/api/ws/${wishlistId}`;
+    const params = new URLSearchParams();
+    if (shareToken) params.set("token", shareToken);
+    if (lastSeqRef.current != null) params.set("last_seq", String(lastSeqRef.current));
+    const query = params.toString();
+    const url = `${base}/api/ws/${wishlistId}${query ? `?${query}` : ""}`;
     const ws = new WebSocket(url);
 
     ws.onmessage = (e) => {
       try {
         const data = JSON.parse(e.data);
-        onMessageRef.current(data);
+        if (typeof data.seq === "number") {
+          const last = lastSeqRef.current;
+          const isState = data.event === "snapshot" || data.event === "resync";
+          if (!isState && last != null) {
+            if (data.seq <= last) return; // already applied (snapshot overlap)
+            if (data.seq > last + 1) {
+              ws.close(); // missed frames: reconnect with last_seq to get them
+              return;
+            }
+          }
+          lastSeqRef.current = data.seq;
+        }
+        // Coalesced frame (server ws_coalesce_window_ms): deliver the events it carries in order
+        if (data.event === "batch" && Array.isArray(data.payload?.events)) {
+          for (const event of data.payload.events) onMessageRef.current(event);
+        } else {
+          onMessageRef.current(data);
+        }
       } catch {
         // ignore parse errors
       }
@@ -66,7 +96,7 @@ export function useWishlistWebSocket(
     };
 
     wsRef.current = ws;
-  }, [wishlistId]);
+  }, [wishlistId, shareToken]);
 
   useEffect(() => {
     connect();
@@ -76,6 +106,7 @@ export function useWishlistWebSocket(
         reconnectTimerRef.current = null;
       }
       reconnectAttemptRef.current = MAX_RECONNECT_ATTEMPTS;
+      lastSeqRef.current = null;
       if (wsRef.current) {
         wsRef.current.close();
         wsRef.current = null;
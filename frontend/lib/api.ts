@@ -28,10 +28,10 @@ function parseApiError(detail: unknown): string {
   return "Request failed";
 }
 
-async function request<T>(
+async function send(
   path: string,
   options: RequestInitWithCredentials = {}
-): Promise<T> {
+): Promise<Response> {
   const url = path.startsWith("http") ? path : `${API_BASE}${path}`;
   const token = getStoredToken();
   const headers: Record<string, string> = {
@@ -59,12 +59,32 @@ async function request<T>(
     const detail = (body as { detail?: unknown }).detail ?? res.statusText;
     throw new Error(parseApiError(detail));
   }
+  return res;
+}
+
+async function request<T>(
+  path: string,
+  options: RequestInitWithCredentials = {}
+): Promise<T> {
+  const res = await send(path, options);
   if (res.status === 204) return undefined as T;
   return res.json();
 }
 
+/** One page of a keyset-paginated list; nextCursor comes from the X-Next-Cursor header (null on the last page). */
+export interface Page<T> {
+  data: T;
+  nextCursor: string | null;
+}
+
+async function requestPage<T>(path: string): Promise<Page<T>> {
+  const res = await send(path);
+  return { data: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
 export const api = {
   get: <T>(path: string) => request<T>(path),
+  getPage: <T>(path: string) => requestPage<T>(path),
   post: <T>(path: string, body?: unknown) =>
     request<T>(path, { method: "POST", body: body ? JSON.stringify(body) : undefined }),
   patch: <T>(path: string, body: unknown) =>
@@ -18,6 +18,8 @@ export interface Wishlist {
 
 export interface WishlistWithItems extends Wishlist {
   items: WishItem[];
+  /** Pass as items_cursor to load the next page of items; null on the last page. */
+  items_next_cursor: string | null;
 }
 
 export interface WishItem {
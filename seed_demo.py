@@ -110,6 +110,7 @@ async def main() -> None:
                         amount=amount,
                     )
                     session.add(c)
+                    contrib_item.contributed_total += amount
                 await session.flush()
                 print(f"Added sample contributions to item: {contrib_item.title}")
 
@@ -1,8 +1,41 @@
 """Pytest configuration and fixtures."""
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
 
+@pytest.fixture
+def mock_http_client():
+    """
+    Factory: an httpx.AsyncClient stand-in whose stream() serves body in chunks.
+    Returned client has .chunks_served so tests can check early stop.
+    """
+
+    def make(body: bytes, charset: str | None = "utf-8", chunk_size: int = 64, error: Exception | None = None):
+        client = MagicMock()
+        client.chunks_served = 0
+
+        async def aiter_bytes():
+            for i in range(0, len(body), chunk_size):
+                client.chunks_served += 1
+                yield body[i : i + chunk_size]
+
+        response = MagicMock()
+        response.charset_encoding = charset
+        response.raise_for_status = MagicMock()
+        response.aiter_bytes = aiter_bytes
+        stream_cm = MagicMock()
+        stream_cm.__aenter__ = AsyncMock(side_effect=error, return_value=response)
+        stream_cm.__aexit__ = AsyncMock(return_value=None)
+        client.stream = MagicMock(return_value=stream_cm)
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=None)
+        return client
+
+    return make
+
+
 @pytest.fixture
 def sample_html_with_og():
     """HTML with og:title, og:image, and title tag."""
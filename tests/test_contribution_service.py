@@ -21,13 +21,13 @@ async def test_contribute_over_target_returns_none() -> None:
         wishlist_id=wishlist_id,
         title="Item",
         target_price=Decimal("100"),
+        contributed_total=Decimal("95"),
         allow_group_contribution=True,
         is_deleted=False,
     )
     mock_item_repo = MagicMock()
     mock_item_repo.get_by_id_for_update = AsyncMock(return_value=item)
     mock_contribution_repo = MagicMock()
-    mock_contribution_repo.get_sum_by_item = AsyncMock(return_value=Decimal("95"))
 
     class MockSession:
         pass
@@ -44,3 +44,91 @@ async def test_contribute_over_target_returns_none() -> None:
     assert target == Decimal("100")
     assert wid is None
     assert reject_reason is None
+
+
+@pytest.mark.asyncio
+async def test_contribute_updates_running_total_without_sum_query() -> None:
+    """Cap check reads item.contributed_total; the insert is paired with an increment of that column."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    item_id = uuid4()
+    wishlist_id = uuid4()
+    item = WishItem(
+        id=item_id,
+        wishlist_id=wishlist_id,
+        title="Item",
+        target_price=Decimal("100"),
+        contributed_total=Decimal("40"),
+        allow_group_contribution=True,
+        is_deleted=False,
+    )
+    mock_item_repo = MagicMock()
+    mock_item_repo.get_by_id_for_update = AsyncMock(return_value=item)
+    mock_item_repo.add_contributed = AsyncMock()
+    mock_contribution_repo = MagicMock()
+    mock_contribution_repo.get_sum_by_item = AsyncMock()
+    mock_contribution_repo.create = AsyncMock(return_value=MagicMock())
+
+    class MockSession:
+        pass
+
+    svc = ContributionService(MockSession())
+    svc._item_repo = mock_item_repo
+    svc._contribution_repo = mock_contribution_repo
+    svc._wishlist_repo = MagicMock(bump_version=AsyncMock())
+
+    contribution, total, target, progress, wid, reject_reason = await svc.contribute(
+        item_id, "session-1", Decimal("10")
+    )
+    assert contribution is not None
+    assert total == Decimal("50")
+    assert progress == 50.0
+    assert wid == wishlist_id
+    mock_item_repo.add_contributed.assert_awaited_once_with(item_id, Decimal("10"))
+    mock_contribution_repo.get_sum_by_item.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_check_contribution_totals_reports_drift(monkeypatch: pytest.MonkeyPatch) -> None:
+    from unittest.mock import AsyncMock, MagicMock
+
+    import app.services.contribution_audit as audit
+
+    item_id, wishlist_id = uuid4(), uuid4()
+    fake_repo = MagicMock()
+    fake_repo.get_total_drift = AsyncMock(return_value=[(item_id, wishlist_id, Decimal("10"), Decimal("25"))])
+    monkeypatch.setattr(audit, "ContributionRepository", lambda session: fake_repo)
+
+    drift = await audit.check_contribution_totals(MagicMock(), fix=False)
+    assert drift == [audit.TotalDrift(item_id, wishlist_id, Decimal("10"), Decimal("25"))]
+
+
+@pytest.mark.asyncio
+async def test_check_contribution_totals_fix_bumps_each_affected_wishlist_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    from unittest.mock import AsyncMock, MagicMock
+
+    import app.services.contribution_audit as audit
+
+    wishlist_a, wishlist_b = uuid4(), uuid4()
+    rows = [
+        (uuid4(), wishlist_a, Decimal("10"), Decimal("25")),
+        (uuid4(), wishlist_a, Decimal("0"), Decimal("5")),
+        (uuid4(), wishlist_b, Decimal("7"), Decimal("0")),
+    ]
+    contribution_repo = MagicMock()
+    contribution_repo.get_total_drift = AsyncMock(return_value=rows)
+    contribution_repo.get_sum_by_item = AsyncMock(return_value=Decimal("25"))
+    item_repo = MagicMock()
+    item_repo.get_by_id_for_update = AsyncMock()
+    wishlist_repo = MagicMock()
+    wishlist_repo.bump_version = AsyncMock()
+    monkeypatch.setattr(audit, "ContributionRepository", lambda session: contribution_repo)
+    monkeypatch.setattr(audit, "WishItemRepository", lambda session: item_repo)
+    monkeypatch.setattr(audit, "WishlistRepository", lambda session: wishlist_repo)
+    session = MagicMock()
+    session.execute = AsyncMock()
+
+    drift = await audit.check_contribution_totals(session, fix=True)
+
+    assert len(drift) == 3 and session.execute.await_count == 3
+    assert sorted(c.args[0] for c in wishlist_repo.bump_version.await_args_list) == sorted([wishlist_a, wishlist_b])
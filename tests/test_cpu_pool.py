@@ -0,0 +1,63 @@
+"""Unit tests for the CPU pool that parses preview pages off the event loop."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.lib.cpu_pool import CpuPool
+from app.services import product_parser
+from app.services.product_parser import _parse_html
+
+
+def _thread_name(_: int) -> str:
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_inline_below_threshold_and_when_disabled() -> None:
+    pool = CpuPool("t", "thread", workers=2)
+    assert await pool.run(_thread_name, 1, inline=True) == threading.current_thread().name
+    disabled = CpuPool("t", "thread", workers=0)
+    assert await disabled.run(_thread_name, 1) == threading.current_thread().name
+    assert pool.stats()["inline_runs"] == 1 and disabled.stats()["kind"] == "inline"
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_runs_off_loop_and_records_wait_and_work() -> None:
+    pool = CpuPool("parse-test", "thread", workers=2)
+    try:
+        names = await asyncio.gather(*(pool.run(_thread_name, i) for i in range(6)))
+    finally:
+        pool.shutdown()
+    assert all(n.startswith("parse-test") for n in names)
+    stats = pool.stats()
+    assert stats["pool_runs"] == 6 and stats["pending"] == 0
+    assert stats["wait_seconds"]["count"] == stats["work_seconds"]["count"] == 6
+
+
+@pytest.mark.asyncio
+async def test_process_pool_parses_page() -> None:
+    pool = CpuPool("parse-test", "process", workers=1)
+    html = '<html><head><meta property="og:title" content="Bike"></head><body>' + "x" * 50_000 + "</body></html>"
+    try:
+        preview = await pool.run(_parse_html, html, "https://example.com/bike")
+    finally:
+        pool.shutdown()
+    assert preview.title == "Bike" and preview.product_url == "https://example.com/bike"
+    assert pool.stats()["work_seconds"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_uses_pool_only_for_large_pages(mock_http_client, monkeypatch) -> None:
+    pool = CpuPool("parse-test", "thread", workers=1)
+    monkeypatch.setattr(product_parser, "parse_pool", pool)
+    monkeypatch.setattr(product_parser, "PARSE_INLINE_MAX_CHARS", 1000)
+    small = b"<html><head><title>Small</title></head></html>"
+    large = b"<html><head><title>Large</title></head><body>" + b"x" * 5000 + b"</body></html>"
+    try:
+        assert (await product_parser.fetch_product_preview("https://a.example/", mock_http_client(small))).title == "Small"
+        assert (await product_parser.fetch_product_preview("https://b.example/", mock_http_client(large))).title == "Large"
+    finally:
+        pool.shutdown()
+    assert (pool.inline_runs, pool.pool_runs) == (1, 1)
@@ -0,0 +1,52 @@
+"""Unit tests for the shared preview HTTP client and per-host limiter."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.lib.http_client import HostLimiter
+from app.services.product_parser import fetch_product_preview
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_used_without_creating_a_new_one(sample_html_with_og: str, mock_http_client) -> None:
+    shared = mock_http_client(sample_html_with_og.encode("utf-8"))
+
+    with patch("app.services.product_parser.httpx.AsyncClient") as client_cls:
+        result = await fetch_product_preview("https://example.com/product", shared)
+
+    client_cls.assert_not_called()
+    shared.stream.assert_called_once()
+    assert result.title == "Cool Product Name"
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_caps_concurrency_per_host_and_forgets_idle_hosts() -> None:
+    limiter = HostLimiter(per_host=2)
+    running = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+
+    async def fetch(host: str) -> None:
+        async with limiter.slot(host):
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+            await asyncio.sleep(0.01)
+            running[host] -= 1
+
+    await asyncio.gather(*(fetch("a") for _ in range(5)), *(fetch("b") for _ in range(2)))
+    assert peak == {"a": 2, "b": 2}
+    assert limiter.stats()["active_hosts"] == 0
+    assert limiter.waits == 3
+
+
+def test_lifespan_creates_and_closes_shared_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    import app.main as main_module
+    from app.main import app
+
+    monkeypatch.setattr(main_module.settings, "redis_url", "")  # single-worker mode, no Redis needed
+    with TestClient(app):
+        client = app.state.http_client
+        assert not client.is_closed
+    assert client.is_closed
@@ -0,0 +1,110 @@
+"""Idempotency store: O(1) bounded cache, single execution per key, cross-worker replay via Redis."""
+
+import asyncio
+
+import pytest
+
+from app.lib.idempotency import IdempotencyInProgress, IdempotencyStore, contribution_key
+
+KEY = contribution_key("key-1", "session-1", "item-1")
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+async def _run_once(store: IdempotencyStore, calls: list[int], release: asyncio.Event, redis_client=None):
+    async with await store.claim(KEY, redis_client) as claim:
+        if claim.cached is not None:
+            return claim.cached
+        calls.append(1)
+        await release.wait()
+        body = {"amount_added": "5"}
+        await claim.complete(body)
+        return body
+
+
+def test_cache_is_bounded() -> None:
+    store = IdempotencyStore(max_entries=100, ttl_seconds=60, wait_seconds=1)
+
+    async def fill() -> None:
+        for i in range(1000):
+            claim = await store.claim(contribution_key(f"k{i}", "s", "i"))
+            await claim.complete({"n": i})
+
+    asyncio.run(fill())
+    stats = store.stats()
+    assert stats["entries"] == 100 and stats["evictions"] == 900 and stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_run_once() -> None:
+    store = IdempotencyStore(max_entries=10, ttl_seconds=60, wait_seconds=1)
+    calls: list[int] = []
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(_run_once(store, calls, release)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+    assert calls == [1]
+    assert all(r == {"amount_added": "5"} for r in results)
+    assert store.stats()["waited_local"] == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_owner_releases_key() -> None:
+    store = IdempotencyStore(max_entries=10, ttl_seconds=60, wait_seconds=1)
+    redis = FakeRedis()
+    with pytest.raises(ValueError):
+        async with await store.claim(KEY, redis):
+            raise ValueError("400 from the service")
+    assert redis.data == {}
+    claim = await store.claim(KEY, redis)
+    assert claim.cached is None  # the retry runs the operation itself
+    await claim.complete({"ok": True})
+
+
+@pytest.mark.asyncio
+async def test_other_worker_waits_for_result_via_redis() -> None:
+    redis = FakeRedis()
+    worker_a = IdempotencyStore(max_entries=10, ttl_seconds=60, wait_seconds=2)
+    worker_b = IdempotencyStore(max_entries=10, ttl_seconds=60, wait_seconds=2)
+    calls: list[int] = []
+    release = asyncio.Event()
+    first = asyncio.create_task(_run_once(worker_a, calls, release, redis))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(_run_once(worker_b, calls, release, redis))
+    await asyncio.sleep(0.1)
+    release.set()
+    assert await first == await second == {"amount_added": "5"}
+    assert calls == [1]
+    assert worker_b.stats()["waited_remote_polls"] > 0
+    # A later retry on worker B is served from its own cache
+    assert (await worker_b.claim(KEY, redis)).cached == {"amount_added": "5"}
+
+
+@pytest.mark.asyncio
+async def test_stuck_owner_on_other_worker_gives_in_progress() -> None:
+    redis = FakeRedis()
+    owner = IdempotencyStore(max_entries=10, ttl_seconds=60, wait_seconds=0.1)
+    other = IdempotencyStore(max_entries=10, ttl_seconds=60, wait_seconds=0.1)
+    await owner.claim(KEY, redis)  # never completes
+    with pytest.raises(IdempotencyInProgress):
+        await other.claim(KEY, redis)
+    assert other.stats()["in_flight"] == 0
@@ -0,0 +1,56 @@
+"""Batch link preview: NDJSON stream in completion order under a batch concurrency limit."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routers import link_preview
+from app.main import app
+from app.schemas.wish_item import LINK_PREVIEW_BATCH_MAX_URLS, ProductPreview
+
+
+def test_batch_streams_lines_in_completion_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    delays = {"https://slow.example/a": 0.2, "https://fast.example/b": 0.0, "https://mid.example/c": 0.05}
+
+    async def fake_preview(url: str, client) -> ProductPreview:
+        await asyncio.sleep(delays.get(url, 0))
+        return ProductPreview(title=url.rsplit("/", 1)[-1], product_url=url, preview_quality="partial")
+
+    monkeypatch.setattr(link_preview, "get_product_preview", fake_preview)
+    with TestClient(app).stream("POST", "/api/link-preview/batch", json={"urls": list(delays)}) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in r.iter_lines() if line]
+    assert [line["index"] for line in lines] == [1, 2, 0]
+    assert lines[0]["url"] == "https://fast.example/b" and lines[0]["preview"]["title"] == "b"
+
+
+def test_batch_respects_the_batch_concurrency_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Per-host limits are fetch_product_preview's (process-wide host_limiter), not the batch's."""
+    monkeypatch.setattr(link_preview._settings, "link_preview_batch_concurrency", 3)
+    active = 0
+    peak = 0
+
+    async def fake_preview(url: str, client) -> ProductPreview:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return ProductPreview(product_url=url, preview_quality="minimal")
+
+    monkeypatch.setattr(link_preview, "get_product_preview", fake_preview)
+    urls = [f"https://wb.example/{i}" for i in range(6)] + [f"https://ozon.example/{i}" for i in range(6)]
+    r = TestClient(app).post("/api/link-preview/batch", json={"urls": urls})
+    assert r.status_code == 200
+    assert sorted(json.loads(line)["index"] for line in r.text.splitlines()) == list(range(12))
+    assert peak == 3
+
+
+def test_batch_rejects_empty_and_oversized() -> None:
+    client = TestClient(app)
+    assert client.post("/api/link-preview/batch", json={"urls": []}).status_code == 422
+    too_many = [f"https://x.example/{i}" for i in range(LINK_PREVIEW_BATCH_MAX_URLS + 1)]
+    assert client.post("/api/link-preview/batch", json={"urls": too_many}).status_code == 422
@@ -0,0 +1,60 @@
+"""Unit tests for keyset cursors and owner list paging."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.lib.pagination import decode_cursor, encode_cursor, split_page
+from app.services.wishlist import WishlistService
+
+
+def test_cursor_round_trip() -> None:
+    key = (datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC), uuid4())
+    cursor = encode_cursor(*key)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor) == key
+
+
+_TRUNCATED = encode_cursor(datetime(2026, 1, 1, tzinfo=UTC), uuid4())[:-4]
+
+
+@pytest.mark.parametrize("bad", ["", "not-base64!", _TRUNCATED, "Zm9vfGJhcg"])
+def test_malformed_cursor_raises_value_error(bad: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(bad)
+
+
+def test_split_page_sets_cursor_only_when_more_rows() -> None:
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+    rows = [SimpleNamespace(id=uuid4(), created_at=t0 + timedelta(seconds=i)) for i in range(3)]
+    page, cursor = split_page(rows, 2)
+    assert page == rows[:2]
+    assert decode_cursor(cursor) == (rows[1].created_at, rows[1].id)
+    assert split_page(rows[:2], 2) == (rows[:2], None)
+
+
+@pytest.mark.asyncio
+async def test_list_by_owner_fetches_one_extra_row_and_passes_key() -> None:
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+    rows = [SimpleNamespace(id=uuid4(), created_at=t0 - timedelta(days=i)) for i in range(3)]
+    mock_repo = MagicMock()
+    mock_repo.list_by_owner = AsyncMock(return_value=rows)
+
+    class MockSession:
+        pass
+
+    svc = WishlistService(MockSession())
+    svc._repo = mock_repo
+    owner_id = uuid4()
+
+    page, cursor = await svc.list_by_owner(owner_id, limit=2)
+    assert page == rows[:2]
+    mock_repo.list_by_owner.assert_awaited_once_with(owner_id, 3, None)
+
+    mock_repo.list_by_owner = AsyncMock(return_value=rows[2:])
+    page, next_cursor = await svc.list_by_owner(owner_id, limit=2, cursor=cursor)
+    assert page == rows[2:] and next_cursor is None
+    mock_repo.list_by_owner.assert_awaited_once_with(owner_id, 3, (rows[1].created_at, rows[1].id))
@@ -0,0 +1,81 @@
+"""Unit tests for the bounded password hash pool and latency histogram."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.metrics import Histogram
+from app.core.security import PasswordHashPool, PasswordHasherBusy, hash_password_async, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip_off_loop() -> None:
+    hashed = await hash_password_async("correct horse")
+    assert await verify_password_async("correct horse", hashed)
+    assert not await verify_password_async("wrong", hashed)
+
+
+@pytest.mark.asyncio
+async def test_full_pool_sheds_immediately_and_records_histograms() -> None:
+    pool = PasswordHashPool(workers=1, max_pending=2)
+    gate = threading.Event()
+
+    def slow() -> str:
+        gate.wait(5)
+        return "ok"
+
+    running = [asyncio.create_task(pool.run(slow)) for _ in range(2)]
+    await asyncio.sleep(0)  # both admitted: one running, one queued
+    with pytest.raises(PasswordHasherBusy):
+        await pool.run(slow)
+    gate.set()
+    assert await asyncio.gather(*running) == ["ok", "ok"]
+    stats = pool.stats()
+    assert stats["rejected"] == 1 and stats["pending"] == 0
+    assert stats["hash_time_seconds"]["count"] == 2
+    assert stats["queue_wait_seconds"]["count"] == 2
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_keep_their_slot_until_the_hash_finishes() -> None:
+    pool = PasswordHashPool(workers=2, max_pending=2)
+    gate = threading.Event()
+    started = threading.Semaphore(0)
+
+    def slow() -> str:
+        started.release()
+        gate.wait(5)
+        return "ok"
+
+    callers = [asyncio.create_task(pool.run(slow)) for _ in range(2)]
+    for _ in range(2):
+        await asyncio.to_thread(started.acquire, timeout=5)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    assert pool.pending == 2  # clients gone, bcrypt still running
+    with pytest.raises(PasswordHasherBusy):
+        await pool.run(slow)
+
+    gate.set()
+    for _ in range(100):
+        if pool.pending == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert pool.pending == 0
+    assert await pool.run(lambda: "ok") == "ok"
+    pool.shutdown()
+
+
+def test_histogram_quantiles_use_bucket_bounds() -> None:
+    h = Histogram(buckets=(0.01, 0.1, 1.0))
+    for v in (0.005, 0.005, 0.05, 0.5):
+        h.observe(v)
+    h.observe(3.0)  # above all buckets
+    assert h.quantile(0.5) == 0.1
+    assert h.quantile(0.99) == 3.0
+    stats = h.stats()
+    assert stats["buckets"] == {"le_0.01": 2, "le_0.1": 3, "le_1": 4, "le_inf": 5}
+    assert stats["count"] == 5
@@ -0,0 +1,101 @@
+"""Unit tests for the product/link preview cache."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.lib.preview_cache import PreviewCache, normalize_url
+from app.schemas.wish_item import ProductPreview
+
+
+def _preview(quality: str = "full") -> ProductPreview:
+    return ProductPreview(title="Bike", product_url="https://www.wildberries.ru/catalog/1/detail.aspx", preview_quality=quality)
+
+
+def test_normalize_strips_tracking_and_case() -> None:
+    a = normalize_url("HTTPS://WWW.Wildberries.ru:443/catalog/1/detail.aspx?utm_source=tg&size=2&from=share#reviews")
+    b = normalize_url("https://www.wildberries.ru/catalog/1/detail.aspx?size=2")
+    assert a == b == "https://www.wildberries.ru/catalog/1/detail.aspx?size=2"
+    assert normalize_url("https://ozon.ru?b=2&a=1") == "https://ozon.ru/?a=1&b=2"
+    assert normalize_url("https://ozon.ru/p?id=1") != normalize_url("https://ozon.ru/p?id=2")
+    assert normalize_url("  not a url ") == "not a url"
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_fetch_across_tracking_variants() -> None:
+    cache = PreviewCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5)
+    fetch = AsyncMock(return_value=_preview())
+    await cache.get_or_fetch("https://ozon.ru/p/1?utm_campaign=x", fetch)
+    await cache.get_or_fetch("https://OZON.ru/p/1", fetch)
+    assert fetch.await_count == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch() -> None:
+    cache = PreviewCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5)
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> ProductPreview:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _preview()
+
+    waiters = [asyncio.create_task(cache.get_or_fetch("https://ozon.ru/p/1", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+    assert calls == 1
+    assert all(r.title == "Bike" for r in results)
+    assert cache.stats()["coalesced"] == 4 and cache.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_fetch() -> None:
+    cache = PreviewCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5)
+    release = asyncio.Event()
+
+    async def fetch() -> ProductPreview:
+        await release.wait()
+        return _preview()
+
+    first = asyncio.create_task(cache.get_or_fetch("https://ozon.ru/p/1", fetch))
+    second = asyncio.create_task(cache.get_or_fetch("https://ozon.ru/p/1", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert (await second).title == "Bike"
+
+
+@pytest.mark.asyncio
+async def test_failures_use_negative_ttl(monkeypatch) -> None:
+    cache = PreviewCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=5)
+    fetch = AsyncMock(return_value=ProductPreview(preview_quality="minimal", missing_fields=["title"]))
+    now = [1000.0]
+    monkeypatch.setattr("app.lib.ttl_cache.time.monotonic", lambda: now[0])
+
+    await cache.get_or_fetch("https://dead.example/x", fetch)
+    await cache.get_or_fetch("https://dead.example/x", fetch)
+    assert fetch.await_count == 1
+    now[0] += 6
+    await cache.get_or_fetch("https://dead.example/x", fetch)
+    assert fetch.await_count == 2
+    assert cache.stats()["negative_stores"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_product_preview_keeps_callers_url(monkeypatch) -> None:
+    from app.lib import preview_cache as module
+    from app.services import product_parser
+
+    monkeypatch.setattr(module.preview_cache, "_entries", PreviewCache(10, 60, 5)._entries)
+    fetch = AsyncMock(side_effect=lambda url, client: _preview().model_copy(update={"product_url": url}))
+    monkeypatch.setattr(product_parser, "fetch_product_preview", fetch)
+
+    first = await product_parser.get_product_preview("https://shop.example/p?utm_source=a")
+    second = await product_parser.get_product_preview("https://shop.example/p?utm_source=b")
+    assert fetch.await_count == 1
+    assert first.product_url.endswith("utm_source=a") and second.product_url.endswith("utm_source=b")
@@ -0,0 +1,118 @@
+"""Unit tests for the principal cache behind get_current_user."""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.lib.principal_cache import PrincipalCache
+from app.models.user import User
+
+
+def _user(active: bool = True) -> User:
+    return User(id=uuid4(), email="a@example.com", is_active=active, created_at=datetime(2026, 1, 1, tzinfo=UTC))
+
+
+@pytest.mark.asyncio
+async def test_second_lookup_skips_loader() -> None:
+    cache = PrincipalCache(max_entries=10, ttl_seconds=30)
+    user = _user()
+    load = AsyncMock(return_value=user)
+
+    first = await cache.get_or_load(user.id, load)
+    second = await cache.get_or_load(user.id, load)
+    assert first is user
+    assert (second.id, second.email, second.is_active, second.created_at) == (
+        user.id,
+        user.email,
+        True,
+        user.created_at,
+    )
+    load.assert_awaited_once_with(user.id)
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+    assert stats["staleness_window_seconds"] == 30
+
+
+@pytest.mark.asyncio
+async def test_inactive_user_is_never_cached() -> None:
+    cache = PrincipalCache(max_entries=10, ttl_seconds=30)
+    user = _user(active=False)
+    load = AsyncMock(return_value=user)
+    await cache.get_or_load(user.id, load)
+    await cache.get_or_load(user.id, load)
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_reload() -> None:
+    cache = PrincipalCache(max_entries=10, ttl_seconds=30)
+    user = _user()
+    load = AsyncMock(return_value=user)
+    await cache.get_or_load(user.id, load)
+    cache.invalidate(user.id)
+    load.return_value = None  # deleted
+    assert await cache.get_or_load(user.id, load) is None
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_load_racing_invalidation_is_not_cached() -> None:
+    """A row read before a deactivation commits must not be cached after the invalidation."""
+    cache = PrincipalCache(max_entries=10, ttl_seconds=30)
+    user = _user()
+
+    async def load(_user_id):
+        cache.invalidate(user.id)  # deactivation commits while our SELECT is in flight
+        return user
+
+    await cache.get_or_load(user.id, load)
+    assert cache.get(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_serves_other_workers_and_errors_fall_through() -> None:
+    user = _user()
+    store: dict[str, str] = {}
+    redis = AsyncMock()
+    redis.get = AsyncMock(side_effect=lambda k: store.get(k))
+    redis.set = AsyncMock(side_effect=lambda k, v, ex: store.__setitem__(k, v))
+
+    worker_a = PrincipalCache(max_entries=10, ttl_seconds=30)
+    await worker_a.get_or_load(user.id, AsyncMock(return_value=user), redis)
+
+    worker_b = PrincipalCache(max_entries=10, ttl_seconds=30)
+    load_b = AsyncMock()
+    shared = await worker_b.get_or_load(user.id, load_b, redis)
+    assert shared.email == user.email and shared.created_at == user.created_at
+    load_b.assert_not_called()
+    assert worker_b.stats()["shared_hits"] == 1
+
+    redis.get = AsyncMock(side_effect=ConnectionError("down"))
+    worker_c = PrincipalCache(max_entries=10, ttl_seconds=30)
+    load_c = AsyncMock(return_value=user)
+    assert await worker_c.get_or_load(user.id, load_c, redis) is user
+
+
+@pytest.mark.asyncio
+async def test_hanging_redis_times_out_to_the_db_then_is_skipped() -> None:
+    user = _user()
+    redis = AsyncMock()
+
+    async def hang(*args, **kwargs):
+        await asyncio.Event().wait()
+
+    redis.get = AsyncMock(side_effect=hang)
+    redis.set = AsyncMock(side_effect=hang)
+    cache = PrincipalCache(max_entries=10, ttl_seconds=30, redis_timeout_seconds=0.02)
+    load = AsyncMock(return_value=user)
+
+    assert await asyncio.wait_for(cache.get_or_load(user.id, load, redis), 1) is user
+    assert redis.get.await_count == 1 and redis.set.await_count == 0  # paused after the timeout
+    cache.clear()
+    assert await asyncio.wait_for(cache.get_or_load(user.id, load, redis), 0.01) is user  # straight to the DB
+    assert redis.get.await_count == 1 and load.await_count == 2
+    stats = cache.stats()
+    assert stats["redis_failures"] == 1 and stats["redis_degraded"]
@@ -1,7 +1,7 @@
 """Unit tests for product URL parser with mocked HTML."""
 
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -10,17 +10,9 @@ from app.services.product_parser import fetch_product_preview
 
 
 @pytest.mark.asyncio
-async def test_parse_og_title_image_price(sample_html_with_og: str) -> None:
+async def test_parse_og_title_image_price(sample_html_with_og: str, mock_http_client) -> None:
     """Parse og:title, og:image, og:price:amount from mocked response."""
-    mock_response = MagicMock()
-    mock_response.content = sample_html_with_og.encode("utf-8")
-    mock_response.raise_for_status = MagicMock()
-
-    mock_get = AsyncMock(return_value=mock_response)
-    mock_client = MagicMock()
-    mock_client.get = mock_get
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
+    mock_client = mock_http_client(sample_html_with_og.encode("utf-8"))
 
     with patch("app.services.product_parser.httpx.AsyncClient", return_value=mock_client):
         result = await fetch_product_preview("https://example.com/product")
@@ -32,16 +24,9 @@ async def test_parse_og_title_image_price(sample_html_with_og: str) -> None:
 
 
 @pytest.mark.asyncio
-async def test_parse_fallback_title(sample_html_title_only: str) -> None:
+async def test_parse_fallback_title(sample_html_title_only: str, mock_http_client) -> None:
     """When no og:title, fallback to <title> tag."""
-    mock_response = MagicMock()
-    mock_response.content = sample_html_title_only.encode("utf-8")
-    mock_response.raise_for_status = MagicMock()
-
-    mock_client = MagicMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
+    mock_client = mock_http_client(sample_html_title_only.encode("utf-8"))
 
     with patch("app.services.product_parser.httpx.AsyncClient", return_value=mock_client):
         result = await fetch_product_preview("https://example.com/page")
@@ -53,16 +38,9 @@ async def test_parse_fallback_title(sample_html_title_only: str) -> None:
 
 
 @pytest.mark.asyncio
-async def test_parse_itemprop_price(sample_html_price_variants: str) -> None:
+async def test_parse_itemprop_price(sample_html_price_variants: str, mock_http_client) -> None:
     """Parse itemprop='price' meta."""
-    mock_response = MagicMock()
-    mock_response.content = sample_html_price_variants.encode("utf-8")
-    mock_response.raise_for_status = MagicMock()
-
-    mock_client = MagicMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
+    mock_client = mock_http_client(sample_html_price_variants.encode("utf-8"))
 
     with patch("app.services.product_parser.httpx.AsyncClient", return_value=mock_client):
         result = await fetch_product_preview("https://example.com/item")
@@ -72,16 +50,9 @@ async def test_parse_itemprop_price(sample_html_price_variants: str) -> None:
 
 
 @pytest.mark.asyncio
-async def test_empty_html_returns_empty_preview(sample_html_empty: str) -> None:
+async def test_empty_html_returns_empty_preview(sample_html_empty: str, mock_http_client) -> None:
     """HTML with no product data returns empty preview fields."""
-    mock_response = MagicMock()
-    mock_response.content = sample_html_empty.encode("utf-8")
-    mock_response.raise_for_status = MagicMock()
-
-    mock_client = MagicMock()
-    mock_client.get = AsyncMock(return_value=mock_response)
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
+    mock_client = mock_http_client(sample_html_empty.encode("utf-8"))
 
     with patch("app.services.product_parser.httpx.AsyncClient", return_value=mock_client):
         result = await fetch_product_preview("https://example.com/empty")
@@ -93,12 +64,9 @@ async def test_empty_html_returns_empty_preview(sample_html_empty: str) -> None:
 
 
 @pytest.mark.asyncio
-async def test_fetch_error_returns_empty_preview() -> None:
+async def test_fetch_error_returns_empty_preview(mock_http_client) -> None:
     """On network/HTTP error, return minimal preview with missing_fields set (no exception)."""
-    mock_client = MagicMock()
-    mock_client.get = AsyncMock(side_effect=Exception("Connection error"))
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
+    mock_client = mock_http_client(b"", error=Exception("Connection error"))
 
     with patch("app.services.product_parser.httpx.AsyncClient", return_value=mock_client):
         result = await fetch_product_preview("https://example.com/bad")
@@ -125,3 +93,111 @@ async def test_invalid_url_returns_empty_preview() -> None:
     assert set(result.missing_fields) == {"title", "image_url", "price"}
 
 
+@pytest.mark.asyncio
+async def test_stream_stops_after_head(mock_http_client) -> None:
+    """Once </head> (with a price) is read, the rest of the body is not downloaded."""
+    head = '<html><head><meta property="og:title" content="Bike"><meta property="og:price:amount" content="10"></head>'
+    body = (head + "<body>" + "x" * 100_000 + "</body></html>").encode("utf-8")
+    mock_client = mock_http_client(body, chunk_size=256)
+
+    result = await fetch_product_preview("https://example.com/bike", mock_client)
+
+    assert result.title == "Bike"
+    assert result.price == Decimal("10")
+    assert mock_client.chunks_served * 256 < 2048
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_only_the_top_of_the_body_when_the_head_has_no_price(mock_http_client) -> None:
+    """Body microdata near the top still gives the price; the rest of a large page is not downloaded."""
+    head = '<html><head><meta property="og:title" content="Bike"></head>'
+    card = '<body><div itemprop="price" content="25"></div>'
+    body = (head + card + "x" * 500_000 + "</body></html>").encode("utf-8")
+    mock_client = mock_http_client(body, chunk_size=4096)
+
+    result = await fetch_product_preview("https://example.com/bike", mock_client)
+
+    assert result.price == Decimal("25")
+    assert mock_client.chunks_served * 4096 < 100_000
+
+
+@pytest.mark.asyncio
+async def test_price_word_in_head_text_does_not_stop_before_body_microdata(mock_http_client) -> None:
+    """Only an actual head price ends the stream at </head>; "price" in text is not one."""
+    head = (
+        '<html><head><title>Best price guaranteed</title>'
+        '<meta name="description" content="Compare the price of this bike"></head>'
+    )
+    body = (head + "<body>" + "y" * 8192 + '<span itemprop="price" content="1 299,50"></span></body></html>').encode()
+
+    result = await fetch_product_preview("https://example.com/bike", mock_http_client(body, chunk_size=1024))
+
+    assert result.title == "Best price guaranteed"
+    assert result.price == Decimal("1299.50")
+
+
+@pytest.mark.asyncio
+async def test_stream_sniffs_meta_charset_and_handles_split_multibyte(mock_http_client) -> None:
+    """No charset header: <meta charset> decides; a character split across chunks still decodes."""
+    cp1251 = '<html><head><meta charset="windows-1251"><title>Велосипед</title></head></html>'.encode("cp1251")
+    result = await fetch_product_preview("https://example.com/a", mock_http_client(cp1251, charset=None, chunk_size=7))
+    assert result.title == "Велосипед"
+
+    utf8 = '<html><head><title>Велосипед</title></head></html>'.encode("utf-8")
+    result = await fetch_product_preview("https://example.com/b", mock_http_client(utf8, charset=None, chunk_size=3))
+    assert result.title == "Велосипед"
+
+
+@pytest.mark.asyncio
+async def test_tags_in_script_and_comments_are_ignored(mock_http_client) -> None:
+    """Only real tags count; attribute values are unescaped; og:image:width is not an image."""
+    html = (
+        '<html><head><!-- <meta property="og:title" content="Commented"> -->'
+        '<script>var s = \'<meta property="og:title" content="Scripted">\';</script>'
+        '<meta property="og:image:width" content="1200">'
+        '<meta content="Tom &amp; Jerry" property="og:title">'
+        '<meta property="product:price:amount" content="1 299,50"></head></html>'
+    )
+    result = await fetch_product_preview("https://example.com/tj", mock_http_client(html.encode()))
+    assert result.title == "Tom & Jerry"
+    assert result.image_url is None
+    assert result.price == Decimal("1299.50")
+
+
+def test_non_ascii_text_does_not_shift_tag_boundaries() -> None:
+    """Characters that grow when lowercased ("İ") before or inside <title> must not move end-tag offsets."""
+    from app.services.product_parser import _parse_html
+
+    assert _parse_html("<title>İİİİ Bisiklet</title>", "https://example.com/x").title == "İİİİ Bisiklet"
+    html = (
+        '<meta name="keywords" content="İİİİ İİİİ"><title>Bike</title>'
+        '<meta name="description" content="Road bike"><script>var t = "İ";</script>'
+        '<span itemprop="price" content="10"></span>'
+    )
+    result = _parse_html(html, "https://example.com/x")
+    assert result.title == "Bike"
+    assert result.description == "Road bike"
+    assert result.price == Decimal("10")
+
+
+def test_pathological_markup_parses_in_linear_time() -> None:
+    """Unclosed quotes and tag soup must not trigger regex backtracking."""
+    import time
+
+    from app.services.product_parser import _parse_html
+
+    for html in ('<meta content="' + "a" * 200_000, "<meta og:image " * 20_000, "<" * 200_000):
+        started = time.perf_counter()
+        _parse_html(html, "https://example.com/x")
+        assert time.perf_counter() - started < 2.0
+
+
+def test_benchmark_corpus_fields() -> None:
+    """The checked-in benchmark pages double as parser regression fixtures."""
+    from benchmarks.bench_product_parser import check_expected
+    from benchmarks.parser_corpus import realistic
+
+    docs = realistic()
+    assert docs
+    for doc in docs:
+        check_expected(doc)
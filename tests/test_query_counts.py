@@ -0,0 +1,116 @@
+"""SQL statements per endpoint: guards the explicit load profiles against N+1 and eager cascades."""
+
+import os
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.lib.principal_cache import principal_cache
+from app.lib.wishlist_cache import public_wishlist_cache
+from app.main import app
+
+needs_db = pytest.mark.skipif(
+    not os.environ.get("DATABASE_URL", "").strip().startswith("postgresql+asyncpg"),
+    reason="DATABASE_URL not set or not asyncpg (API test needs real DB)",
+)
+
+
+@contextmanager
+def count_statements():
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def owner_client():
+    with TestClient(app) as client:
+        email = f"counts-{uuid4().hex[:12]}@example.com"
+        r = client.post("/api/auth/register", json={"email": email, "password": "password123"})
+        assert r.status_code == 201
+        client.headers["Authorization"] = f"Bearer {r.json()['access_token']}"
+        w = client.post("/api/wishlists/", json={"title": "Counts"}).json()
+        for i in range(5):
+            r = client.post(
+                "/api/items/",
+                json={"wishlist_id": w["id"], "title": f"Item {i}", "target_price": "100", "allow_group_contribution": True},
+            )
+            assert r.status_code == 201
+            item_id = r.json()["id"]
+            for _ in range(3):
+                client.post(f"/api/items/{item_id}/contribute", json={"amount": "1"})
+        yield client, w
+
+
+@needs_db
+def test_auth_me_is_one_statement_then_cached(owner_client) -> None:
+    client, _ = owner_client
+    principal_cache.clear()
+    with count_statements() as statements:
+        assert client.get("/api/auth/me").status_code == 200
+    assert len(statements) == 1, statements
+    with count_statements() as statements:
+        assert client.get("/api/auth/me").status_code == 200
+    assert statements == []  # principal served from cache
+
+
+@needs_db
+def test_list_wishlists_does_not_load_items(owner_client) -> None:
+    client, _ = owner_client
+    with count_statements() as statements:
+        assert client.get("/api/wishlists/").status_code == 200
+    assert len(statements) == 1, statements  # wishlists (principal cached)
+
+
+@needs_db
+def test_owner_view_statement_count(owner_client) -> None:
+    client, w = owner_client
+    with count_statements() as statements:
+        assert client.get(f"/api/wishlists/{w['id']}").status_code == 200
+    # version (ETag) + wishlist + items page; principal cached; no reservations/contributions
+    assert len(statements) == 3, statements
+
+
+@needs_db
+def test_public_view_statement_count_independent_of_contributions(owner_client) -> None:
+    client, w = owner_client
+    public_wishlist_cache.clear()
+    with count_statements() as statements:
+        r = client.get(f"/api/wishlists/public/{w['share_token']}")
+        assert r.status_code == 200
+    assert len(statements) == 2, statements  # version (ETag) + aggregated view
+    with count_statements() as statements:
+        assert client.get(f"/api/wishlists/public/{w['share_token']}").status_code == 200
+    assert statements == []  # served from cache
+
+
+@needs_db
+def test_list_pages_follow_cursor(owner_client) -> None:
+    client, w = owner_client
+    for i in range(2):
+        client.post("/api/wishlists/", json={"title": f"More {i}"})
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        with count_statements() as statements:
+            r = client.get("/api/wishlists/", params=params)
+        assert r.status_code == 200
+        assert len(statements) == 1, statements  # one keyset page at any depth (principal cached)
+        seen += [x["id"] for x in r.json()]
+        cursor = r.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 3 and seen[-1] == w["id"]
+    assert client.get("/api/wishlists/", params={"cursor": "bogus"}).status_code == 400
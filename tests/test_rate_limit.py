@@ -0,0 +1,179 @@
+"""Per-route sliding-window rate limiting (pure ASGI middleware)."""
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.serialization import dumps
+from app.middleware.rate_limit import (
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    SlidingWindowLimiter,
+    link_preview_batch_cost,
+)
+
+
+def test_window_counts_and_retry_after() -> None:
+    limiter = SlidingWindowLimiter(window_seconds=60, max_keys=10)
+    assert all(limiter.hit("ip", 3, now=0.0) == 0 for _ in range(3))
+    assert limiter.hit("ip", 3, now=10.0) == pytest.approx(50.0)  # current window is full
+    # Next window: previous count (3) still weighs 3 * (1 - 30/60) = 1.5, so one more fits.
+    assert limiter.hit("ip", 3, now=90.0) == 0
+    retry = limiter.hit("ip", 3, now=90.0)
+    assert 0 < retry <= 30
+    assert limiter.hit("ip", 3, now=90.0 + retry) == 0
+    assert limiter.rejected == 2
+
+
+def test_state_is_constant_per_key_and_idle_keys_are_swept() -> None:
+    limiter = SlidingWindowLimiter(window_seconds=60, max_keys=1000)
+    for _ in range(500):
+        limiter.hit("busy", 1000, now=1.0)
+    assert len(limiter) == 1 and len(limiter._entries["busy"]) == 3
+    for i in range(50):
+        limiter.hit(f"idle-{i}", 10, now=2.0)
+    limiter.hit("late", 10, now=200.0)  # two windows later: everything else is idle
+    assert len(limiter) == 1 and limiter.swept == 51
+
+
+def test_tracked_keys_are_capped() -> None:
+    limiter = SlidingWindowLimiter(window_seconds=60, max_keys=100)
+    for i in range(1000):
+        limiter.hit(f"10.0.{i // 256}.{i % 256}", 5, now=1.0)
+    assert len(limiter) == 100 and limiter.evictions == 900
+
+
+def _client(*policies: RateLimitPolicy) -> TestClient:
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    async def echo(request):
+        return PlainTextResponse(str(len((await request.json())["urls"])))
+
+    app = Starlette(
+        routes=[
+            Route("/api/wishlists/public/{token}", ok),
+            Route("/api/link-preview", ok),
+            Route("/api/link-preview/batch", echo, methods=["POST"]),
+            Route("/other", ok),
+        ]
+    )
+    app.add_middleware(RateLimitMiddleware, policies=list(policies), max_keys=100)
+    return TestClient(app)
+
+
+def test_each_route_has_its_own_budget() -> None:
+    client = _client(
+        RateLimitPolicy("public_wishlist", ("/api/wishlists/public/",), 5),
+        RateLimitPolicy("link_preview", ("/api/link-preview",), 2),
+    )
+    assert [client.get("/api/link-preview").status_code for _ in range(3)] == [200, 200, 429]
+    r = client.get("/api/link-preview")
+    assert r.json() == {"detail": "Too many requests", "error_code": "rate_limited"}
+    assert int(r.headers["retry-after"]) >= 1
+    assert all(client.get("/api/wishlists/public/t").status_code == 200 for _ in range(5))
+    assert client.get("/api/wishlists/public/t").status_code == 429
+    assert all(client.get("/other").status_code == 200 for _ in range(20))
+    # Budgets are per client IP
+    assert client.get("/api/link-preview", headers={"X-Forwarded-For": "203.0.113.7"}).status_code == 200
+
+
+def test_disabled_policy_is_skipped() -> None:
+    client = _client(RateLimitPolicy("public_wishlist", ("/api/wishlists/public/",), 0))
+    assert all(client.get("/api/wishlists/public/t").status_code == 200 for _ in range(10))
+
+
+def _preview_policies(limit: int) -> list[RateLimitPolicy]:
+    return [
+        RateLimitPolicy(
+            "link_preview", ("/api/link-preview/batch",), limit, methods=frozenset({"POST"}), cost=link_preview_batch_cost
+        ),
+        RateLimitPolicy("link_preview", ("/api/link-preview",), limit),
+    ]
+
+
+def test_batch_is_charged_once_per_url_from_the_shared_budget() -> None:
+    client = _client(*_preview_policies(60))
+    r = client.post("/api/link-preview/batch", json={"urls": [f"https://shop.example/{i}" for i in range(50)]})
+    assert r.status_code == 200 and r.text == "50"  # body replayed to the endpoint intact
+    assert [client.get("/api/link-preview").status_code for _ in range(11)] == [200] * 10 + [429]
+    r = client.post("/api/link-preview/batch", json={"urls": ["https://shop.example/x"]})
+    assert r.status_code == 429
+    assert client.app.middleware_stack.app.stats()["link_preview"]["rejected"] == 2
+
+
+def test_batch_cost_counts_only_urls_the_endpoint_would_fetch() -> None:
+    assert link_preview_batch_cost(b'{"urls": ["a", "b", "c"]}') == 3
+    assert link_preview_batch_cost(b'{"urls": []}') == 1
+    assert link_preview_batch_cost(dumps({"urls": ["a"] * 51})) == 1  # over the cap: rejected with 422
+    assert link_preview_batch_cost(b"not json") == 1
+
+
+class FakeRedis:
+    """Runs the sliding-window Lua script's logic in Python; counts round trips."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, int] = {}
+        self.scripts: set[str] = set()
+        self.round_trips = 0
+        self.fail = False
+
+    async def script_load(self, script: str) -> str:
+        import hashlib
+
+        self.round_trips += 1
+        sha = hashlib.sha1(script.encode()).hexdigest()
+        self.scripts.add(sha)
+        return sha
+
+    async def evalsha(self, sha: str, numkeys: int, current_key: str, previous_key: str, limit, weight, ttl_ms, cost):
+        from redis.exceptions import NoScriptError
+
+        self.round_trips += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+        if sha not in self.scripts:
+            raise NoScriptError("No matching script. Please use EVAL.")
+        current, previous = self.data.get(current_key, 0), self.data.get(previous_key, 0)
+        if previous * weight + current + cost > limit:
+            return [0, current, previous]
+        self.data[current_key] = current + cost
+        return [1, current + cost, previous]
+
+
+def _redis_client(fake: FakeRedis, limit: int) -> TestClient:
+    client = _client(RateLimitPolicy("link_preview", ("/api/link-preview",), limit))
+    client.app.state.redis_pub = fake
+    return client
+
+
+def test_redis_backend_shares_budget_across_workers() -> None:
+    fake = FakeRedis()
+    workers = [_redis_client(fake, 4), _redis_client(fake, 4)]
+    codes = [workers[i % 2].get("/api/link-preview").status_code for i in range(6)]
+    assert codes == [200, 200, 200, 200, 429, 429]
+    # One script load (NOSCRIPT on first use), then exactly one round trip per request.
+    assert fake.round_trips == 6 + 2
+
+
+def test_redis_backend_charges_a_batch_per_url() -> None:
+    fake = FakeRedis()
+    client = _client(*_preview_policies(60))
+    client.app.state.redis_pub = fake
+    r = client.post("/api/link-preview/batch", json={"urls": [f"https://shop.example/{i}" for i in range(50)]})
+    assert r.status_code == 200 and sorted(fake.data.values()) == [50]
+    assert [client.get("/api/link-preview").status_code for _ in range(11)] == [200] * 10 + [429]
+
+
+def test_redis_failure_falls_back_to_local_limiter() -> None:
+    fake = FakeRedis()
+    fake.fail = True
+    client = _redis_client(fake, 2)
+    assert [client.get("/api/link-preview").status_code for _ in range(3)] == [200, 200, 429]
+    assert fake.round_trips == 1  # after a failure Redis is skipped for a while
+    middleware = client.app.middleware_stack.app
+    stats = middleware.stats()["redis"]
+    assert stats["failures"] == 1 and stats["degraded"]
+    assert stats["latency_seconds"]["count"] == 1
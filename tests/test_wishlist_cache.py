@@ -0,0 +1,123 @@
+"""Unit tests for the versioned public wishlist cache and TTL cache."""
+
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from app.lib.ttl_cache import TTLCache
+from app.lib.wishlist_cache import PublicWishlistCache
+from app.schemas.wishlist import WishlistPublicResponse
+from app.services.wishlist import WishlistService
+
+
+def _dto(wishlist_id=None) -> WishlistPublicResponse:
+    return WishlistPublicResponse(
+        id=wishlist_id or uuid4(),
+        share_token=uuid4(),
+        title="List",
+        description=None,
+        event_date=None,
+        items=[],
+    )
+
+
+def _body(dto: WishlistPublicResponse) -> bytes:
+    return dto.model_dump_json().encode()
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_expired_entry_is_a_miss(monkeypatch: pytest.MonkeyPatch) -> None:
+    import app.lib.ttl_cache as mod
+
+    now = [100.0]
+    monkeypatch.setattr(mod.time, "monotonic", lambda: now[0])
+    cache: TTLCache[str, int] = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", 1)
+    now[0] += 6
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_hit_after_put_and_miss_after_invalidate() -> None:
+    cache = PublicWishlistCache(max_entries=10, ttl_seconds=0)
+    token, dto = uuid4(), _dto()
+    cache.put(token, dto.id, _body(dto), '"e"', cache.stamp())
+    assert cache.get(token) == (_body(dto), '"e"')
+    cache.invalidate(dto.id)
+    assert cache.get(token) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["invalidations"] == 1
+
+
+def test_put_is_dropped_when_invalidated_during_read() -> None:
+    """A body read before a concurrent mutation must not be cached."""
+    cache = PublicWishlistCache(max_entries=10, ttl_seconds=0)
+    token, dto = uuid4(), _dto()
+    read_stamp = cache.stamp()
+    cache.invalidate(dto.id)
+    cache.put(token, dto.id, _body(dto), '"e"', read_stamp)
+    assert cache.get(token) is None
+
+
+def test_invalidating_other_wishlist_keeps_entry() -> None:
+    cache = PublicWishlistCache(max_entries=10, ttl_seconds=0)
+    token, dto = uuid4(), _dto()
+    cache.put(token, dto.id, _body(dto), '"e"', cache.stamp())
+    cache.invalidate(uuid4())
+    assert cache.get(token) == (_body(dto), '"e"')
+
+
+def test_evicted_versions_never_serve_stale() -> None:
+    cache = PublicWishlistCache(max_entries=1, ttl_seconds=0)
+    token, dto = uuid4(), _dto()
+    read_stamp = cache.stamp()
+    cache.invalidate(dto.id)
+    for _ in range(10):  # push dto.id out of the bounded version map
+        cache.invalidate(uuid4())
+    cache.put(token, dto.id, _body(dto), '"e"', read_stamp)
+    assert cache.get(token) is None
+
+
+def test_entry_from_another_day_is_a_miss() -> None:
+    """Bodies and ETags are date-dependent (event_date_passed): no TTL must not serve yesterday's."""
+    cache = PublicWishlistCache(max_entries=10, ttl_seconds=0)
+    token, dto = uuid4(), _dto()
+    cache.put(token, dto.id, _body(dto), '"e"', cache.stamp(), day=100)
+    assert cache.get(token, day=100) == (_body(dto), '"e"')
+    assert cache.get(token, day=101) is None
+
+
+@pytest.mark.asyncio
+async def test_get_public_dto_served_from_cache_without_db(monkeypatch: pytest.MonkeyPatch) -> None:
+    from unittest.mock import AsyncMock, MagicMock
+
+    import app.services.wishlist as wishlist_module
+
+    cache = PublicWishlistCache(max_entries=10, ttl_seconds=0)
+    monkeypatch.setattr(wishlist_module, "public_wishlist_cache", cache)
+    token, dto = uuid4(), _dto()
+    cache.put(token, dto.id, _body(dto), '"e"', cache.stamp(), date.today().toordinal())
+
+    class MockSession:
+        pass
+
+    svc = WishlistService(MockSession())
+    svc._repo = MagicMock()
+    svc._repo.get_public_view_rows = AsyncMock()
+
+    assert await svc.get_public_dto(token) == dto
+    svc._repo.get_public_view_rows.assert_not_called()
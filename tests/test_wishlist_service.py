@@ -4,7 +4,8 @@ from uuid import uuid4
 
 import pytest
 
-from app.services.wishlist import WishlistService
+from app.schemas.wishlist import WishlistPublicResponse, WishlistWithItemsResponse
+from app.services.wishlist import WishlistService, owner_payload, public_payload
 
 
 @pytest.mark.asyncio
@@ -14,17 +15,17 @@ async def test_get_with_items_for_owner_returns_none_when_not_owner() -> None:
 
     mock_repo = MagicMock()
     mock_repo.get_by_id_and_owner = AsyncMock(return_value=None)
+    mock_repo.list_items_page = AsyncMock()
 
     class MockSession:
         pass
 
     svc = WishlistService(MockSession())
     svc._repo = mock_repo
-    svc._reservation_repo = MagicMock()
-    svc._contribution_repo = MagicMock()
 
     result = await svc.get_with_items_for_owner(uuid4(), uuid4())
     assert result is None
+    mock_repo.list_items_page.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -33,15 +34,220 @@ async def test_get_public_dto_returns_none_for_invalid_token() -> None:
     from unittest.mock import AsyncMock, MagicMock
 
     mock_repo = MagicMock()
-    mock_repo.get_by_share_token_with_items = AsyncMock(return_value=None)
+    mock_repo.get_public_version = AsyncMock(return_value=None)
+    mock_repo.get_public_view_rows = AsyncMock(return_value=[])
 
     class MockSession:
         pass
 
     svc = WishlistService(MockSession())
     svc._repo = mock_repo
-    svc._reservation_repo = MagicMock()
-    svc._contribution_repo = MagicMock()
 
     result = await svc.get_public_dto(uuid4())
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_public_view_not_modified_skips_item_queries() -> None:
+    """Matching If-None-Match returns (etag, None) after the version lookup only."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    wishlist_id = uuid4()
+    mock_repo = MagicMock()
+    mock_repo.get_public_version = AsyncMock(return_value=(wishlist_id, 7, True))
+    mock_repo.get_public_view_rows = AsyncMock()
+
+    class MockSession:
+        pass
+
+    svc = WishlistService(MockSession())
+    svc._repo = mock_repo
+
+    from datetime import date
+
+    from app.lib.etag import make_etag
+
+    etag = make_etag("p", wishlist_id.hex, 7, date.today().toordinal())
+    view = await svc.get_public_view(uuid4(), etag)
+    assert view == (etag, None)
+    mock_repo.get_public_view_rows.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_owner_view_etag_changes_with_version() -> None:
+    from unittest.mock import AsyncMock, MagicMock
+
+    mock_repo = MagicMock()
+    mock_repo.get_version_for_owner = AsyncMock(return_value=3)
+    mock_repo.get_by_id_and_owner = AsyncMock(return_value=None)
+
+    class MockSession:
+        pass
+
+    svc = WishlistService(MockSession())
+    svc._repo = mock_repo
+    wishlist_id = uuid4()
+
+    view = await svc.get_owner_view(wishlist_id, uuid4(), '"stale"')
+    assert view is None  # version found but wishlist vanished -> not found
+    mock_repo.get_by_id_and_owner.assert_awaited_once()
+
+    mock_repo.get_version_for_owner = AsyncMock(return_value=4)
+    mock_repo.get_by_id_and_owner.reset_mock()
+    from app.lib.etag import make_etag
+
+    etag = make_etag("o", wishlist_id.hex, 4, 100, "")
+    assert await svc.get_owner_view(wishlist_id, uuid4(), etag) == (etag, None)
+    mock_repo.get_by_id_and_owner.assert_not_called()
+    # Each items page is its own representation
+    view = await svc.get_owner_view(wishlist_id, uuid4(), etag, items_limit=10)
+    assert view is None and mock_repo.get_by_id_and_owner.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_owner_view_rejects_malformed_cursor_before_etag_match() -> None:
+    """A bad items_cursor is a 400 (ValueError) even when If-None-Match matches its ETag."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from app.lib.etag import make_etag
+
+    svc = WishlistService(None)
+    svc._repo = MagicMock()
+    svc._repo.get_version_for_owner = AsyncMock(return_value=1)
+    wishlist_id = uuid4()
+    etag = make_etag("o", wishlist_id.hex, 1, 100, "garbage")
+    with pytest.raises(ValueError):
+        await svc.get_owner_view(wishlist_id, uuid4(), etag, items_cursor="garbage")
+
+
+def test_etag_matches_list_and_weak_forms() -> None:
+    from app.lib.etag import etag_matches
+
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches(None, '"b"')
+    assert not etag_matches('"a"', '"b"')
+
+
+@pytest.mark.asyncio
+async def test_public_dto_built_from_aggregated_rows() -> None:
+    """Sums and reservation flags come precomputed per row; empty-list row has NULL item columns."""
+    from decimal import Decimal
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    wishlist_id, token, item_id = uuid4(), uuid4(), uuid4()
+    head = dict(
+        wishlist_id=wishlist_id,
+        share_token=token,
+        wishlist_title="Birthday",
+        wishlist_description=None,
+        event_date=None,
+        is_public=True,
+    )
+    row = SimpleNamespace(
+        **head,
+        item_id=item_id,
+        item_title="Bike",
+        item_description=None,
+        product_url=None,
+        image_url=None,
+        target_price=Decimal("200.00"),
+        allow_group_contribution=True,
+        contributed_total=Decimal("50.00"),
+        reserved=True,
+    )
+    mock_repo = MagicMock()
+    mock_repo.get_public_view_rows = AsyncMock(return_value=[row])
+
+    class MockSession:
+        pass
+
+    svc = WishlistService(MockSession())
+    svc._repo = mock_repo
+    payload = await svc._build_public_payload(token)
+    assert payload is not None
+    dto = WishlistPublicResponse.model_validate(payload)
+    assert dto.id == wishlist_id
+    [item] = dto.items
+    assert item.reserved is True
+    assert item.contributed_total == "50.00"
+    assert item.contribution_progress_percent == 25.0
+
+    empty = SimpleNamespace(**head, item_id=None)
+    mock_repo.get_public_view_rows = AsyncMock(return_value=[empty])
+    payload = await svc._build_public_payload(token)
+    assert payload is not None and payload["items"] == []
+
+
+def test_fast_path_bytes_match_response_models() -> None:
+    """Pre-encoded bodies are byte-for-byte what response_model + Pydantic serialization would send."""
+    import json
+    from datetime import date, datetime, timezone
+    from decimal import Decimal
+    from types import SimpleNamespace
+
+    from app.core.serialization import dumps
+
+    row = SimpleNamespace(
+        wishlist_id=uuid4(),
+        share_token=uuid4(),
+        wishlist_title="Día de cumpleaños",
+        wishlist_description="quotes \" and emoji 🎁",
+        event_date=date(2020, 1, 2),
+        is_public=True,
+        item_id=uuid4(),
+        item_title="Bike",
+        item_description=None,
+        product_url="https://example.com/bike",
+        image_url=None,
+        target_price=Decimal("199.99"),
+        allow_group_contribution=True,
+        contributed_total=Decimal("33.33"),
+        reserved=False,
+    )
+    payload = public_payload([row], date.today())
+    model = WishlistPublicResponse.model_validate(payload)
+    assert dumps(payload) == model.model_dump_json().encode()
+    assert json.loads(dumps(payload)) == model.model_dump(mode="json")
+
+    item = SimpleNamespace(
+        id=uuid4(),
+        wishlist_id=row.wishlist_id,
+        title="Bike",
+        description=None,
+        product_url=None,
+        image_url=None,
+        target_price=Decimal("10.00"),
+        allow_group_contribution=False,
+        is_deleted=False,
+    )
+    w = SimpleNamespace(
+        id=row.wishlist_id,
+        owner_id=uuid4(),
+        share_token=row.share_token,
+        title="List",
+        description=None,
+        event_date=None,
+        is_public=False,
+        created_at=datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    )
+    payload = owner_payload(w, [item], "next")
+    model = WishlistWithItemsResponse.model_validate(payload)
+    assert dumps(payload) == model.model_dump_json().encode()
+
+
+@pytest.mark.asyncio
+async def test_get_public_snapshot_requires_the_token_of_that_wishlist() -> None:
+    """The WebSocket snapshot is only served when the share token opens the requested wishlist."""
+    from unittest.mock import AsyncMock
+
+    wishlist_id = uuid4()
+    body = ('{"id":"%s","title":"T","items":[]}' % wishlist_id).encode()
+    svc = WishlistService(None)
+    svc._public_view = AsyncMock(return_value=(wishlist_id, '"etag"', body))
+    assert await svc.get_public_snapshot(wishlist_id, uuid4()) == body
+    assert await svc.get_public_snapshot(uuid4(), uuid4()) is None
+    svc._public_view = AsyncMock(return_value=None)
+    assert await svc.get_public_snapshot(wishlist_id, uuid4()) is None
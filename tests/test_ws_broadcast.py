@@ -0,0 +1,352 @@
+"""WebSocket rooms, sequenced cross-worker fan-out (per-room Redis channels) and resume."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.websocket.history import room_history
+from app.websocket.manager import WS_CLOSE_SLOW_CONSUMER, ConnectionManager
+from app.websocket.redis_broadcast import (
+    CACHE_INVALIDATE_CHANNEL,
+    RedisSubscriber,
+    handle_message,
+    publish_event,
+    room_channel,
+)
+
+
+class FakeWebSocket:
+    def __init__(self, stalled: bool = False) -> None:
+        self.sent: list[str] = []
+        self.close_code: int | None = None
+        self.unblock = asyncio.Event()
+        if not stalled:
+            self.unblock.set()
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        await self.unblock.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+
+async def _drain() -> None:
+    """Let writer tasks run."""
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_room_hooks_fire_on_first_join_and_last_leave() -> None:
+    manager = ConnectionManager()
+    opened: list = []
+    closed: list = []
+    manager.add_room_hooks(opened.append, closed.append)
+    room = uuid4()
+    a, b = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(a, room)
+    await manager.connect(b, room)
+    await manager.disconnect(a, room)
+    assert opened == [room] and closed == [] and manager.rooms() == [room]
+    await manager.disconnect(b, room)
+    assert closed == [room] and manager.rooms() == []
+
+
+class FakeRedis:
+    """Runs the history Lua scripts' logic in Python."""
+
+    def __init__(self) -> None:
+        self.seq: dict[str, int] = {}
+        self.logs: dict[str, list[str]] = {}
+        self.published: list[tuple[str, str]] = []
+        self.scripts: set[str] = set()
+
+    async def script_load(self, script: str) -> str:
+        import hashlib
+
+        sha = hashlib.sha1(script.encode()).hexdigest()
+        self.scripts.add(sha)
+        return sha
+
+    async def evalsha(self, sha: str, numkeys: int, seq_key: str, log_key: str, *args):
+        from redis.exceptions import NoScriptError
+
+        if sha not in self.scripts:
+            raise NoScriptError("No matching script. Please use EVAL.")
+        if not args:  # read script
+            return [self.seq.get(seq_key, 0), list(self.logs.get(log_key, []))]
+        body, channel, size, _ttl, ts = args
+        self.seq[seq_key] = self.seq.get(seq_key, 0) + 1
+        frame = '{"seq":%d,"ts":%s,%s' % (self.seq[seq_key], ts, body)
+        self.logs[log_key] = (self.logs.get(log_key, []) + [frame])[-size:]
+        self.published.append((channel, frame))
+        return frame
+
+
+class StubSubscriber:
+    def __init__(self, status: str) -> None:
+        self.status = status
+
+    def health(self) -> str:
+        return self.status
+
+
+@pytest.mark.asyncio
+async def test_publish_with_redis_numbers_frames_and_delivers_through_subscriber() -> None:
+    manager = ConnectionManager()
+    room = uuid4()
+    ws = FakeWebSocket()
+    await manager.connect(ws, room)
+    redis = FakeRedis()
+
+    subscriber = StubSubscriber("connected")
+    await publish_event(redis, manager, "item_updated", room, {"item_id": "x"}, subscriber)
+    await publish_event(redis, manager, "item_updated", room, {"item_id": "y"}, subscriber)
+    await _drain()
+    assert ws.sent == []  # not delivered around Redis: the subscriber delivers in seq order
+
+    for channel, frame in redis.published:
+        assert channel == room_channel(room)
+        handle_message(manager, channel, frame)
+    await _drain()
+    assert [json.loads(t)["seq"] for t in ws.sent] == [1, 2]
+    assert ws.sent == [frame for _, frame in redis.published]  # forwarded byte-for-byte
+    assert json.loads(ws.sent[1])["payload"] == {"item_id": "y"}
+    assert await room_history.read(redis, room) == (2, ws.sent)
+
+
+@pytest.mark.asyncio
+async def test_publish_delivers_locally_while_the_subscriber_is_reconnecting() -> None:
+    manager = ConnectionManager()
+    room = uuid4()
+    ws = FakeWebSocket()
+    await manager.connect(ws, room)
+    redis = FakeRedis()
+    await publish_event(redis, manager, "item_updated", room, {"item_id": "x"}, StubSubscriber("reconnecting"))
+    await _drain()
+    assert ws.sent == [frame for _, frame in redis.published]  # sequenced, and still published for other workers
+    assert json.loads(ws.sent[0])["seq"] == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_falls_back_to_local_unsequenced_delivery_when_redis_fails() -> None:
+    manager = ConnectionManager()
+    room = uuid4()
+    ws = FakeWebSocket()
+    await manager.connect(ws, room)
+    redis = AsyncMock()
+    redis.evalsha.side_effect = ConnectionError("redis down")
+    await publish_event(redis, manager, "item_updated", room, {"item_id": "x"})
+    await _drain()
+    assert len(ws.sent) == 1 and "seq" not in json.loads(ws.sent[0])
+
+
+@pytest.mark.asyncio
+async def test_publish_without_redis_still_delivers() -> None:
+    manager = ConnectionManager()
+    room = uuid4()
+    ws = FakeWebSocket()
+    await manager.connect(ws, room)
+    await publish_event(None, manager, "contribution_added", room, {})
+    await publish_event(None, manager, "contribution_added", room, {})
+    await _drain()
+    assert [json.loads(t)["seq"] for t in ws.sent] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_unstarted_connection_sends_initial_frames_before_queued_ones() -> None:
+    manager = ConnectionManager()
+    room = uuid4()
+    ws = FakeWebSocket()
+    connection = await manager.connect(ws, room, start=False)
+    manager.broadcast_text(room, "live")
+    await _drain()
+    assert ws.sent == []
+    connection.start(["snapshot"])
+    await _drain()
+    assert ws.sent == ["snapshot", "live"]
+
+
+@pytest.mark.asyncio
+async def test_stalled_socket_does_not_hold_the_room_and_is_evicted() -> None:
+    manager = ConnectionManager(queue_size=4, slow_consumer_policy="disconnect")
+    room = uuid4()
+    fast, stalled = FakeWebSocket(), FakeWebSocket(stalled=True)
+    await manager.connect(fast, room)
+    await manager.connect(stalled, room)
+    for i in range(10):
+        manager.broadcast_to_room(room, {"n": i})
+        await _drain()
+    assert len(fast.sent) == 10
+    assert stalled.close_code == WS_CLOSE_SLOW_CONSUMER
+    assert manager.stats()["slow_consumers_evicted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_newest_frames() -> None:
+    manager = ConnectionManager(queue_size=3, slow_consumer_policy="drop_oldest")
+    room = uuid4()
+    ws = FakeWebSocket(stalled=True)
+    await manager.connect(ws, room)
+    for i in range(8):
+        manager.broadcast_to_room(room, {"n": i})
+    ws.unblock.set()
+    await _drain()
+    assert [json.loads(t)["n"] for t in ws.sent] == [5, 6, 7]
+    assert ws.close_code is None and manager.stats()["frames_dropped"] == 5
+
+
+@pytest.mark.asyncio
+async def test_joins_and_leaves_during_broadcast_do_not_disturb_it() -> None:
+    manager = ConnectionManager()
+    room, other = uuid4(), uuid4()
+    sockets = [FakeWebSocket() for _ in range(3)]
+    for ws in sockets:
+        await manager.connect(ws, room)
+    snapshot = manager._rooms[room]
+    late = FakeWebSocket()
+    await manager.connect(late, room)
+    await manager.disconnect(sockets[0], room)
+    await manager.connect(FakeWebSocket(), other)
+    assert len(snapshot) == 3  # maps are swapped, never mutated: an in-flight broadcast keeps its view
+    assert manager.broadcast_text(room, "x") == 3
+    await _drain()
+    assert sockets[0].sent == [] and late.sent == ["x"]
+
+
+@pytest.mark.asyncio
+async def test_connection_gauges() -> None:
+    manager = ConnectionManager()
+    small, big = uuid4(), uuid4()
+    a = FakeWebSocket()
+    await manager.connect(a, small)
+    for _ in range(3):
+        await manager.connect(FakeWebSocket(), big)
+    stats = manager.stats()
+    assert stats["rooms"] == 2 and stats["connections"] == 4
+    assert stats["largest_rooms"] == {str(big): 3, str(small): 1}
+    await manager.disconnect(a, small)
+    await manager.disconnect(a, small)  # idempotent
+    assert manager.connection_count(small) == 0 and manager.stats()["connections"] == 3
+
+
+class FakePubSub:
+    """
+    Yields SUBSCRIBE confirmations and the scripted messages from listen(), then drops the
+    connection (or keeps confirming later SUBSCRIBEs if last).
+    """
+
+    def __init__(self, messages: list[dict], drop: bool, ack: bool = True) -> None:
+        self.messages = messages
+        self.drop = drop
+        self.ack = ack
+        self.channels: set[str] = set()
+        self.acks: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def subscribe(self, *channels: str) -> None:
+        self.channels.update(channels)
+        if self.ack:
+            for channel in channels:
+                self.acks.put_nowait({"type": "subscribe", "channel": channel, "data": len(self.channels)})
+
+    async def unsubscribe(self, *channels: str) -> None:
+        self.channels.difference_update(channels)
+
+    async def listen(self):
+        while not self.acks.empty():
+            yield self.acks.get_nowait()
+        for msg in self.messages:
+            yield msg
+        if self.drop:
+            raise ConnectionError("connection reset")
+        while True:
+            yield await self.acks.get()
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakePubSubClient:
+    def __init__(self, pubsub: FakePubSub) -> None:
+        self._pubsub = pubsub
+
+    def pubsub(self) -> FakePubSub:
+        return self._pubsub
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_subscriber_reconnects_resubscribes_rooms_and_measures_latency() -> None:
+    manager = ConnectionManager()
+    room = uuid4()
+    ws = FakeWebSocket()
+    await manager.connect(ws, room)
+    frame = '{"seq":1,"ts":%.3f,"event":"item_updated","payload":{}}' % (time.time() - 0.05)
+    first = FakePubSub([{"type": "message", "channel": room_channel(room), "data": frame}], drop=True)
+    second = FakePubSub([], drop=False)
+    clients = iter([FakePubSubClient(first), FakePubSubClient(second)])
+    subscriber = RedisSubscriber(manager, lambda: next(clients), backoff_initial_seconds=0.01)
+
+    subscriber.start()
+    await asyncio.sleep(0.1)
+
+    assert ws.sent == [frame]
+    assert subscriber.reconnects == 1 and subscriber.health() == "connected"
+    assert {CACHE_INVALIDATE_CHANNEL, room_channel(room)} <= second.channels
+    latency = subscriber.stats()["delivery_latency_seconds"]
+    assert latency["count"] == 1 and latency["max"] >= 0.04
+    await subscriber.aclose()
+
+
+@pytest.mark.asyncio
+async def test_subscriber_backs_off_while_redis_is_down() -> None:
+    attempts = 0
+
+    def connect():
+        nonlocal attempts
+        attempts += 1
+        raise ConnectionError("refused")
+
+    subscriber = RedisSubscriber(ConnectionManager(), connect, backoff_initial_seconds=0.02, backoff_max_seconds=0.04)
+    subscriber.start()
+    await asyncio.sleep(0.15)
+    await subscriber.aclose()
+    assert subscriber.health() == "reconnecting" and subscriber.last_error == "refused"
+    assert 2 <= attempts <= 8  # waits between attempts (0.01-0.04s each), never spins
+
+
+@pytest.mark.asyncio
+async def test_wait_subscribed_resolves_once_redis_confirms_the_room_subscribe() -> None:
+    manager = ConnectionManager()
+    pubsub = FakePubSub([], drop=False)
+    subscriber = RedisSubscriber(manager, lambda: FakePubSubClient(pubsub))
+    room = uuid4()
+    assert await subscriber.wait_subscribed(room) is False  # not connected yet: don't block the socket
+
+    subscriber.start()
+    await asyncio.sleep(0.01)
+    await manager.connect(FakeWebSocket(), room)
+    assert await asyncio.wait_for(subscriber.wait_subscribed(room), 1) is True
+    assert room_channel(room) in pubsub.channels
+    await subscriber.aclose()
+
+
+@pytest.mark.asyncio
+async def test_wait_subscribed_gives_up_when_the_subscribe_is_never_confirmed() -> None:
+    manager = ConnectionManager()
+    subscriber = RedisSubscriber(manager, lambda: FakePubSubClient(FakePubSub([], drop=False, ack=False)))
+    subscriber.start()
+    await asyncio.sleep(0.01)
+    room = uuid4()
+    await manager.connect(FakeWebSocket(), room)
+    assert await subscriber.wait_subscribed(room, timeout=0.05) is False
+    await subscriber.aclose()
@@ -0,0 +1,81 @@
+"""Per-room coalescing of WebSocket events."""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.websocket.coalesce import EventCoalescer, create_coalescer
+from app.websocket.events import run_emit_contribution_added
+from app.websocket.manager import EVENT_BATCH, EVENT_CONTRIBUTION_ADDED, EVENT_RESERVATION_CREATED
+from app.websocket.redis_broadcast import make_message
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.frames: list[tuple] = []
+
+    async def __call__(self, wishlist_id, message) -> None:
+        self.frames.append((wishlist_id, message))
+
+
+def _contribution(room, item_id: str, total: float) -> dict:
+    return make_message(EVENT_CONTRIBUTION_ADDED, room, {"item_id": item_id, "contributed_total": total})
+
+
+@pytest.mark.asyncio
+async def test_burst_for_one_item_sends_only_the_latest_totals() -> None:
+    flush = Recorder()
+    coalescer = EventCoalescer(0.01, flush)
+    room = uuid4()
+    for total in (10, 20, 30):
+        coalescer.add(room, _contribution(room, "a", total))
+    assert flush.frames == []
+    await asyncio.sleep(0.03)
+    assert flush.frames == [(room, _contribution(room, "a", 30))]
+    assert coalescer.stats()["events_merged"] == 2 and coalescer.stats()["frames_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mixed_events_go_out_as_one_batch_in_order() -> None:
+    flush = Recorder()
+    coalescer = EventCoalescer(0.01, flush)
+    room, other = uuid4(), uuid4()
+    reservation = make_message(EVENT_RESERVATION_CREATED, room, {"item_id": "b"})
+    coalescer.add(room, _contribution(room, "a", 10))
+    coalescer.add(room, reservation)
+    coalescer.add(room, _contribution(room, "a", 15))
+    coalescer.add(other, _contribution(other, "c", 5))
+    await asyncio.sleep(0.03)
+    frames = dict(flush.frames)
+    assert frames[other] == _contribution(other, "c", 5)
+    assert frames[room]["event"] == EVENT_BATCH
+    assert frames[room]["payload"]["events"] == [reservation, _contribution(room, "a", 15)]
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_open_windows() -> None:
+    flush = Recorder()
+    coalescer = EventCoalescer(60, flush)
+    room = uuid4()
+    coalescer.add(room, _contribution(room, "a", 10))
+    await coalescer.aclose()
+    assert flush.frames == [(room, _contribution(room, "a", 10))]
+
+
+def test_zero_window_disables_coalescing() -> None:
+    assert create_coalescer(0, Recorder()) is None
+
+
+@pytest.mark.asyncio
+async def test_emit_uses_coalescer_when_configured() -> None:
+    flush = Recorder()
+    room = uuid4()
+    app = SimpleNamespace(
+        state=SimpleNamespace(redis_pub=None, ws_manager=object(), ws_coalescer=EventCoalescer(0.01, flush))
+    )
+    await run_emit_contribution_added(app, room, {"item_id": "a", "contributed_total": 1})
+    await run_emit_contribution_added(app, room, {"item_id": "a", "contributed_total": 2})
+    await asyncio.sleep(0.03)
+    assert flush.frames == [(room, _contribution(room, "a", 2))]
@@ -0,0 +1,57 @@
+"""Per-room sequence numbers, resume buffer and the WebSocket connect protocol."""
+
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.websocket.history import RoomHistory, frame_seq, missed_frames, room_history, with_seq
+
+
+def _frames(*seqs: int) -> list[str]:
+    return [with_seq(seq, '{"event":"item_updated"}') for seq in seqs]
+
+
+def test_with_seq_prefixes_and_frame_seq_reads_it_back() -> None:
+    frame = with_seq(42, '{"event":"x","payload":{}}')
+    assert json.loads(frame) == {"seq": 42, "event": "x", "payload": {}}
+    assert frame_seq(frame) == 42
+
+
+def test_missed_frames_resumes_only_when_the_buffer_covers_the_gap() -> None:
+    frames = _frames(3, 4, 5)
+    assert missed_frames(5, frames, 5) == []
+    assert missed_frames(5, frames, 3) == frames[1:]
+    assert missed_frames(5, frames, 2) == frames
+    assert missed_frames(5, frames, 1) is None  # seq 2 fell out of the buffer
+    assert missed_frames(5, frames, 9) is None  # counter reset since
+
+
+@pytest.mark.asyncio
+async def test_local_history_is_bounded_per_room_and_in_rooms() -> None:
+    history = RoomHistory(size=2, max_rooms=2, ttl_seconds=60)
+    a, b, c = uuid4(), uuid4(), uuid4()
+    for _ in range(3):
+        history.record(a, '{"event":"x"}')
+    assert [frame_seq(f) for f in (await history.read(None, a))[1]] == [2, 3]
+    history.record(b, '{"event":"x"}')
+    history.record(c, '{"event":"x"}')  # evicts a (least recently used)
+    assert await history.read(None, a) == (0, [])
+
+
+def test_connect_replays_missed_frames_or_asks_for_resync(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(main.settings, "redis_url", "")
+    room = uuid4()
+    sent = [room_history.record(room, '{"event":"item_updated","payload":{"n":%d}}' % n) for n in range(3)]
+    with TestClient(main.app) as client:
+        with client.websocket_connect(f"/api/ws/{room}?last_seq=1") as ws:
+            assert [ws.receive_text(), ws.receive_text()] == sent[1:]
+        with client.websocket_connect(f"/api/ws/{room}") as ws:
+            assert json.loads(ws.receive_text()) == {
+                "seq": 3,
+                "event": "resync",
+                "wishlist_id": str(room),
+                "payload": None,
+            }